@@ -0,0 +1,100 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compares the restore of models from storage rows with the trusted one.
+
+The rows are built in memory the same way the storage returns them, so
+the benchmark doesn't need a database:
+
+    python examples/restore_benchmark.py --rows 10000 --repeat 5
+"""
+
+import argparse
+import datetime
+import timeit
+import uuid
+
+from restalchemy.dm import models
+from restalchemy.dm import properties
+from restalchemy.dm import types
+from restalchemy.storage.sql import orm
+
+
+class FooModel(models.ModelWithUUID, orm.SQLStorableMixin):
+    __tablename__ = "foos"
+
+    name = properties.property(types.String(max_length=255), required=True)
+    description = properties.property(types.String(), default="")
+    count = properties.property(types.Integer(), default=0)
+    enabled = properties.property(types.Boolean(), default=True)
+    labels = properties.property(types.Dict(), default=dict, mutable=True)
+    created_at = properties.property(
+        types.UTCDateTimeZ(),
+        default=lambda: datetime.datetime.now(datetime.timezone.utc),
+    )
+
+
+def build_rows(count):
+    created_at = datetime.datetime.now(datetime.timezone.utc)
+    return [
+        {
+            "uuid": str(uuid.uuid4()),
+            "name": "foo-%d" % i,
+            "description": "The foo number %d" % i,
+            "count": i,
+            "enabled": bool(i % 2),
+            "labels": {"index": str(i)},
+            "created_at": created_at,
+        }
+        for i in range(count)
+    ]
+
+
+def restore_all(restore, rows):
+    return [restore(**row) for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    results = {}
+    for name, restore in (
+        ("restore_from_storage", FooModel.restore_from_storage),
+        ("restore_from_storage_trusted", FooModel.restore_from_storage_trusted),
+    ):
+        results[name] = min(
+            timeit.repeat(
+                lambda: restore_all(restore, rows),
+                repeat=args.repeat,
+                number=1,
+            )
+        )
+        print(
+            "%-30s %8.3f sec, %6.2f usec per row"
+            % (name, results[name], results[name] * 1e6 / args.rows)
+        )
+    print(
+        "Speedup: %.2fx"
+        % (results["restore_from_storage"] / results["restore_from_storage_trusted"])
+    )
+
+
+if __name__ == "__main__":
+    main()
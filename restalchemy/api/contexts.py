@@ -54,6 +54,11 @@ class RequestContext(object):
         ]
         return multidict.MultiDict(result_multi_dict_items)
 
+    @property
+    def fields_to_show(self):
+        """The resource fields requested by the `fields` param, if any."""
+        return list(self._fields_to_show)
+
     def can_be_shown_field(self, resource_field_name):
         if self._fields_to_show:
             return resource_field_name in self._fields_to_show
@@ -23,6 +23,7 @@ import tempfile
 import webob
 
 from restalchemy.api import constants
+from restalchemy.api import contexts
 from restalchemy.api import packers
 from restalchemy.api import resources
 from restalchemy.common import exceptions as exc
@@ -359,7 +360,43 @@ class BaseResourceController(Controller):
         filters = kwargs.copy()
         filters[self.model.get_id_property_name()] = dm_filters.EQ(uuid)
         filters = self._apply_autofilters(filters)
-        return self.model.objects.get_one(filters=filters)
+        return self.model.objects.get_one(
+            filters=filters, fields=self._get_storage_fields()
+        )
+
+    def _get_storage_fields(self):
+        """Return model fields requested by the `fields` param.
+
+        Only GET and FILTER requests select a subset of columns, models
+        returned for updates are always complete. None means all columns:
+        there is no `fields` param, a requested field isn't a model
+        property or the model has custom properties, which may be computed
+        from any field.
+        """
+        api_context = getattr(self._req, "api_context", None)
+        if api_context is None:
+            return None
+        try:
+            method = api_context.get_active_method()
+        except contexts.CanNotGetActiveMethod:
+            return None
+        fields_to_show = api_context.fields_to_show
+        if method not in (constants.GET, constants.FILTER) or not fields_to_show:
+            return None
+        if hasattr(self.model, "get_custom_properties") and dict(
+            self.model.get_custom_properties()
+        ):
+            return None
+
+        resource = self.get_resource()
+        model_properties = self.model.properties.properties
+        fields = set()
+        for field_name in fields_to_show:
+            name = resource.get_model_field_name(field_name)
+            if name not in model_properties:
+                return None
+            fields.add(name)
+        return fields
 
     def _split_filters(self, filters):
         if hasattr(self.model, "get_custom_properties"):
@@ -398,7 +435,9 @@ class BaseResourceController(Controller):
         return result
 
     def _process_storage_filters(self, filters, order_by=None):
-        return self.model.objects.get_all(filters=filters, order_by=order_by)
+        return self.model.objects.get_all(
+            filters=filters, order_by=order_by, fields=self._get_storage_fields()
+        )
 
     @staticmethod
     def _convert_raw_filters_to_dm_filters(filters):
@@ -532,21 +571,12 @@ class PaginationFilterBuilder:
 
     def build_filter(self):
         """Build the compound pagination filter."""
-        if not self.sort_col:
-            return {self.id_name: dm_filters.GT(self.marker_id)}
-
-        # Check if sorting by ID directly
-        id_op = dm_filters.GT if self.sort_dir == "asc" else dm_filters.LT
-        if self.sort_col == self.id_name:
-            return {self.id_name: id_op(self.marker_id)}
-
-        # Standard compound cursor for non-ID primary sort
-        return dm_filters.OR(
-            {self.sort_col: id_op(self.sort_value)},
-            dm_filters.AND(
-                {self.sort_col: dm_filters.EQ(self.sort_value)},
-                {self.id_name: dm_filters.GT(self.marker_id)},
-            ),
+        return dm_filters.build_keyset_filter(
+            id_name=self.id_name,
+            marker_id=self.marker_id,
+            sort_column=self.sort_col,
+            sort_value=self.sort_value,
+            sort_direction=self.sort_dir,
         )
 
 
@@ -579,11 +609,22 @@ class BasePaginationMixin(object):
     HTTP/1.1 200 OK
     X-Pagination-Limit: 5
     (Last page won't have Marker)
+
+    With `_with_total_count` enabled, pages also have X-Total-Count, the
+    number of all records matching the filters. The first page selects it
+    with the records in one statement, pages with a marker count it
+    separately. It isn't sent if there are custom filters, they are applied
+    out of the storage.
     """
 
     _pagination_limit = 0
     _header_page_limit = "X-Pagination-Limit"
     _header_page_marker = "X-Pagination-Marker"
+    _header_total_count = "X-Total-Count"
+
+    _with_total_count = False
+    _count_total = False
+    _total_count = None
 
     _param_page_limit = "page_limit"
     _param_page_marker = "page_marker"
@@ -595,6 +636,8 @@ class BasePaginationMixin(object):
                 headers[self._header_page_marker] = str(
                     getattr(body[-1], self.model.get_id_property_name())
                 )
+            if self._total_count is not None:
+                headers[self._header_total_count] = str(self._total_count)
 
         return super(BasePaginationMixin, self)._create_response(body, status, headers)
 
@@ -631,11 +674,24 @@ class BasePaginationMixin(object):
 
     def _process_storage_filters(self, filters, order_by=None):
         self._validate_params(filters, order_by)
+        count_total = self._count_total and self._total_count is None
+        if count_total and self._pagination_marker:
+            self._total_count = self.model.objects.count(filters=filters)
+            count_total = False
         filters, order_by = self._build_pagination_with_cursor(filters, order_by)
+        if count_total:
+            result, self._total_count = self.model.objects.get_all_with_count(
+                filters=filters,
+                limit=self._pagination_limit,
+                order_by=order_by,
+                fields=self._get_storage_fields(),
+            )
+            return result
         return self.model.objects.get_all(
             filters=filters,
             limit=self._pagination_limit,
             order_by=order_by,
+            fields=self._get_storage_fields(),
         )
 
     def _validate_params(self, filters, order_by):
@@ -672,6 +728,7 @@ class BasePaginationMixin(object):
     def paginated_filter(self, filters, order_by=None):
         filters = self._apply_autofilters(filters)
         custom_filters, storage_filters = self._split_filters(filters)
+        self._count_total = self._with_total_count and not custom_filters
 
         cleaned_results = []
 
@@ -47,6 +47,34 @@ def register_common_db_opts(
             default=True,
             help="Cache queries to the database within the transaction",
         ),
+        cfg.IntOpt(
+            "connection_statement_cache_size",
+            default=engines.DEFAULT_STATEMENT_CACHE_SIZE,
+            min=0,
+            help=(
+                "The maximum number of compiled select statements kept by"
+                " the engine. Queries with the same shape reuse SQL text"
+                " and result parser. 0 disables the cache."
+            ),
+        ),
+        cfg.BoolOpt(
+            "connection_prepared_statements",
+            default=False,
+            help=(
+                "Execute statements as server-side prepared statements, so"
+                " the server parses and plans a statement once per"
+                " connection (PostgreSQL) or per session (MySQL)."
+            ),
+        ),
+        cfg.BoolOpt(
+            "connection_tuple_rows",
+            default=False,
+            help=(
+                "Fetch rows of ORM selects as tuples and decode them by"
+                " the column positions instead of building a dictionary"
+                " per row."
+            ),
+        ),
         cfg.StrOpt(
             "migrations_path",
             default="migrations",
@@ -266,6 +294,16 @@ def register_postgresql_db_opts(
                 " is closed. Unset or 0 uses the operating system default."
             ),
         ),
+        cfg.IntOpt(
+            "connection_prepare_threshold",
+            default=None,
+            min=0,
+            help=(
+                "Number of executions of a statement after which psycopg"
+                " prepares it on the connection. Unset uses the psycopg"
+                " default; 0 prepares every statement on the first run."
+            ),
+        ),
     ]
 
     conf.register_cli_opts(db_opt, config_section)
@@ -290,6 +328,12 @@ def register_mysql_db_opts(
     These are as follows:
 
     - connection_pool_size: The number of connection the pool will hold.
+    - connection_pool_blocking: Whether to use the blocking pool which waits
+      for a connection and is configured by the options below.
+    - connection_pool_max_size, connection_pool_client_timeout,
+      connection_pool_max_waiting, connection_max_lifetime,
+      connection_max_idle and connection_pool_check: The options of the
+      blocking pool.
 
     :param conf: The configuration object to register the options with.
     :param username: The username to use for the connection.
@@ -319,6 +363,70 @@ def register_mysql_db_opts(
                 " size"
             ),
         ),
+        cfg.BoolOpt(
+            "connection_pool_blocking",
+            default=False,
+            help=(
+                "Use the pool which waits for a free connection instead of"
+                " failing when all connections are in use. The pool holds"
+                " connection_pool_size connections and can grow up to"
+                " connection_pool_max_size."
+            ),
+        ),
+        cfg.IntOpt(
+            name="connection_pool_max_size",
+            default=None,
+            help=(
+                "The maximum number of connections the blocking pool will"
+                " hold. If None, or equal to connection_pool_size, the pool"
+                " will not grow or shrink."
+            ),
+        ),
+        cfg.FloatOpt(
+            "connection_pool_client_timeout",
+            default=30.0,
+            help=(
+                "The maximum time in seconds that a client can wait to"
+                " receive a connection from the blocking pool."
+            ),
+        ),
+        cfg.IntOpt(
+            "connection_pool_max_waiting",
+            default=10,
+            help=(
+                "Maximum number of requests that can be queued to the"
+                " blocking pool, after which new requests will fail."
+                " 0 means no queue limit."
+            ),
+        ),
+        cfg.FloatOpt(
+            "connection_max_lifetime",
+            default=3600.0,
+            help=(
+                "The maximum lifetime of a connection in the blocking pool,"
+                " in seconds. Connections used for longer get closed and"
+                " replaced by a new one. The amount is reduced by a"
+                " random 10%% to avoid mass eviction."
+            ),
+        ),
+        cfg.FloatOpt(
+            "connection_max_idle",
+            default=600.0,
+            help=(
+                "Maximum time, in seconds, that a connection can stay"
+                " unused in the blocking pool before being closed. This"
+                " only happens to connections more than"
+                " connection_pool_size."
+            ),
+        ),
+        cfg.BoolOpt(
+            "connection_pool_check",
+            default=True,
+            help=(
+                "Check idle connections of the blocking pool with a ping"
+                " before returning them to clients."
+            ),
+        ),
     ]
 
     conf.register_cli_opts(db_opt, config_section)
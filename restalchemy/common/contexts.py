@@ -44,6 +44,7 @@ class Context(object):
         self._engine_name = engine_name
         self._readonly_engine_name = readonly_engine_name
         self._is_readonly = False
+        self._checked_out_engine = None
 
     def start_new_session(self):
         """
@@ -84,14 +85,22 @@ class Context(object):
 
         The engine instance is retrieved from the engine factory based on the
         engine name provided during object initialization. If the context is
-        in read-only mode and a read-only engine name is configured, the
-        read-only engine is returned instead.
+        in read-only mode and an engine group with the engine name is
+        configured, a replica of the group is returned. Otherwise, if a
+        read-only engine name is configured, the read-only engine is
+        returned instead. Within `session_manager` the engine checked out
+        for the session is returned.
 
         :returns: The current engine instance.
         :rtype: AbstractEngine
         :raises ValueError: If the engine instance does not exist.
         """
+        if self._checked_out_engine is not None:
+            return self._checked_out_engine
         if self._is_readonly:
+            if engines.engine_factory.has_engine_group(name=self._engine_name):
+                group = engines.engine_factory.get_engine_group(name=self._engine_name)
+                return group.get_read_engine()
             return engines.engine_factory.get_engine(name=self._readonly_engine_name)
         return engines.engine_factory.get_engine(name=self._engine_name)
 
@@ -121,6 +130,29 @@ class Context(object):
         """
         return engines.engine_factory.get_engine(name=self._engine_name)
 
+    @contextlib.contextmanager
+    def _checkout_engine(self):
+        """
+        Checks out a replica of the engine group for a read-only session.
+
+        The replica is used for the whole session, so its latency and
+        failures are reported to the group.
+        """
+        if not (
+            self._is_readonly
+            and self._checked_out_engine is None
+            and engines.engine_factory.has_engine_group(name=self._engine_name)
+        ):
+            yield
+            return
+        group = engines.engine_factory.get_engine_group(name=self._engine_name)
+        with group.checkout() as engine:
+            self._checked_out_engine = engine
+            try:
+                yield
+            finally:
+                self._checked_out_engine = None
+
     @contextlib.contextmanager
     def session_manager(self):
         """
@@ -136,23 +168,26 @@ class Context(object):
         :raises Exception: Any exceptions raised during the session's execution
             will result in a rollback of the session.
         """
-        session = self.start_new_session()
-        try:
-            yield session
-            if self._is_readonly:
+        with self._checkout_engine():
+            session = self.start_new_session()
+            try:
+                yield session
+                if self._is_readonly:
+                    session.rollback()
+                    LOG.debug("Session %r has been rolled back (readonly)", session)
+                else:
+                    session.commit()
+                    LOG.debug("Session %r has been committed", session)
+            except Exception:
                 session.rollback()
-                LOG.debug("Session %r has been rolled back (readonly)", session)
-            else:
-                session.commit()
-                LOG.debug("Session %r has been committed", session)
-        except Exception:
-            session.rollback()
-            LOG.debug(
-                "Session %r has been rolled back by reason:", session, exc_info=True
-            )
-            raise
-        finally:
-            self.session_close()
+                LOG.debug(
+                    "Session %r has been rolled back by reason:",
+                    session,
+                    exc_info=True,
+                )
+                raise
+            finally:
+                self.session_close()
 
     def _get_storage(self):
         """
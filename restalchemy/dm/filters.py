@@ -150,3 +150,37 @@ class AND(ClauseList):
 
 class OR(ClauseList):
     pass
+
+
+def build_keyset_filter(
+    id_name, marker_id, sort_column=None, sort_value=None, sort_direction="asc"
+):
+    """Build compound keyset (cursor) filter to get rows after the marker.
+
+    Rows are expected to be ordered by `sort_column` in `sort_direction`
+    and by `id_name` ascending as a tiebreaker, so sorting by a non-unique
+    column doesn't return rows from the previous page again:
+
+        sort_column > sort_value
+        OR (sort_column = sort_value AND id_name > marker_id)
+
+    :param id_name: Name of the unique (id) property.
+    :param marker_id: Id of the last row of the previous page.
+    :param sort_column: Name of the property to sort by, None to sort by id.
+    :param sort_value: Value of `sort_column` of the last row.
+    :param sort_direction: "asc" or "desc".
+    """
+    if not sort_column:
+        return {id_name: GT(marker_id)}
+
+    op = GT if sort_direction == "asc" else LT
+    if sort_column == id_name:
+        return {id_name: op(marker_id)}
+
+    return OR(
+        {sort_column: op(sort_value)},
+        AND(
+            {sort_column: EQ(sort_value)},
+            {id_name: GT(marker_id)},
+        ),
+    )
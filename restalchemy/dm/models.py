@@ -137,6 +137,24 @@ class Model(collections_abc.Mapping, metaclass=MetaModel):
         obj.pour(**kwargs)
         return obj
 
+    @classmethod
+    def restore_trusted(cls, **kwargs):
+        """
+        Restores a model from values which are known to be valid, e.g.
+        the ones just read from the storage.
+
+        Unlike `restore`, the values aren't validated, the defaults of the
+        given properties aren't evaluated and `validate` isn't called. The
+        properties are clean.
+        """
+        obj = cls.__new__(cls)
+        try:
+            obj.properties = properties.PropertyManager.restore(cls.properties, kwargs)
+        except exc.PropertyRequired as e:
+            raise exc.PropertyRequired(name=e.name, model=cls)
+        obj.id_properties = {name: obj.properties[name] for name in cls.id_properties}
+        return obj
+
     def validate(self):
         pass
 
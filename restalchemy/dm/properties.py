@@ -25,6 +25,10 @@ from restalchemy.common import exceptions as exc
 from restalchemy.common import utils
 from restalchemy.dm import types
 
+# NOTE(efrolov): The old value of a property set before its stored value was
+#                loaded, see `DeferredProperty`.
+UNKNOWN_VALUE = object()
+
 
 class AbstractProperty(metaclass=abc.ABCMeta):
     @property
@@ -44,6 +48,16 @@ class AbstractProperty(metaclass=abc.ABCMeta):
     def is_prefetch(cls):
         return False
 
+    @classmethod
+    def restore(cls, property_type, value, *args, **kwargs):
+        """
+        Creates the property with a value which is known to be valid.
+
+        The property is created as usual by default, subclasses can skip
+        the checks which the value has passed already.
+        """
+        return cls(value=value, property_type=property_type, *args, **kwargs)
+
 
 class BaseProperty(AbstractProperty):
     pass
@@ -74,6 +88,46 @@ class Property(BaseProperty):
         self.__first_value = copy.deepcopy(self.value) if mutable else self.value
         self._example = example
 
+    @classmethod
+    def restore(
+        cls,
+        property_type,
+        value,
+        *args,
+        required=False,
+        read_only=False,
+        mutable=False,
+        example=None,
+        **kwargs,
+    ):
+        """
+        Creates a clean property with a value which is known to be valid.
+
+        The value isn't validated and the default isn't evaluated. None
+        values and subclasses with their own `__init__` go the usual way.
+        """
+        if value is None or args or cls.__init__ is not Property.__init__:
+            return super(Property, cls).restore(
+                property_type,
+                value,
+                *args,
+                required=required,
+                read_only=read_only,
+                mutable=mutable,
+                example=example,
+                **kwargs,
+            )
+        prop = cls.__new__(cls)
+        prop._type = property_type
+        prop._required = bool(required)
+        prop._read_only = bool(read_only)
+        prop._value = value
+        # NOTE(efrolov): The copy of a mutable value is kept anyway, the
+        #                changes in place wouldn't be detected without it.
+        prop.__first_value = copy.deepcopy(value) if mutable else value
+        prop._example = example
+        return prop
+
     def is_dirty(self):
         return not self.__first_value == self.value
 
@@ -99,6 +153,13 @@ class Property(BaseProperty):
     def old_value(self):
         return self.__first_value
 
+    def forget_old_value(self):
+        """
+        Makes the property dirty whatever its value is, the stored value is
+        unknown. `old_value` is `UNKNOWN_VALUE` then.
+        """
+        self.__first_value = UNKNOWN_VALUE
+
     @builtins.property
     def value(self):
         return self._value
@@ -137,12 +198,22 @@ class PropertyCreator(object):
         self._args = args
         self._kwargs = kwargs
         self._prefetch = kwargs.pop("prefetch", False)
+        self._deferred = kwargs.pop("deferred", False)
 
     def __call__(self, value):
         return self._property(
             value=value, property_type=self._property_type, *self._args, **self._kwargs
         )
 
+    def restore(self, value):
+        """
+        Creates the property with a value which is known to be valid, see
+        `AbstractProperty.restore`.
+        """
+        return self._property.restore(
+            self._property_type, value, *self._args, **self._kwargs
+        )
+
     def get_property_class(self):
         return self._property
 
@@ -155,6 +226,100 @@ class PropertyCreator(object):
     def is_prefetch(self):
         return self._prefetch
 
+    def is_deferred(self):
+        return self._deferred
+
+
+class DeferredValue(object):
+    """The value of a property which is loaded on first access."""
+
+    def __init__(self, loader):
+        """
+        :param loader: A callable without arguments which returns the value.
+        """
+        super(DeferredValue, self).__init__()
+        self._loader = loader
+
+    def load(self):
+        return self._loader()
+
+
+class DeferredProperty(AbstractProperty):
+    """A placeholder of a property whose value isn't loaded yet.
+
+    The first access loads the value and replaces the placeholder with the
+    real property in the property manager. A deferred property is never
+    dirty. Setting a value doesn't load the stored one, the new value goes
+    to a dirty real property unless the property is read only.
+    """
+
+    def __init__(self, manager, name, property_creator, deferred_value):
+        super(DeferredProperty, self).__init__()
+        self._manager = manager
+        self._name = name
+        self._property_creator = property_creator
+        self._deferred_value = deferred_value
+
+    def load(self):
+        """
+        Loads the value and returns the real property.
+        """
+        prop = self._property_creator(self._deferred_value.load())
+        self._manager._properties[self._name] = prop
+        return prop
+
+    @builtins.property
+    def value(self):
+        return self.load().value
+
+    @value.setter
+    def value(self, value):
+        if (
+            self.is_read_only()
+            or self.is_id_property()
+            or not issubclass(self._property_creator.get_property_class(), Property)
+        ):
+            # NOTE(efrolov): The new value of a read only property is
+            #                checked against the stored one.
+            self.load().value = value
+            return
+        self._replace(value)
+
+    def set_value_force(self, value):
+        if not issubclass(self._property_creator.get_property_class(), Property):
+            self.load().set_value_force(value)
+            return
+        self._replace(value)
+
+    def _replace(self, value):
+        prop = self._property_creator(value)
+        # NOTE(efrolov): The default is evaluated for None, set it again.
+        prop.set_value_force(value)
+        prop.forget_old_value()
+        self._manager._properties[self._name] = prop
+
+    def is_dirty(self):
+        return False
+
+    def is_id_property(self):
+        return self._property_creator.get_property_class().is_id_property()
+
+    def is_prefetch(self):
+        return self._property_creator.is_prefetch()
+
+    def is_read_only(self):
+        return bool(self._property_creator.get_kwargs().get("read_only"))
+
+    def is_required(self):
+        return bool(self._property_creator.get_kwargs().get("required"))
+
+    @builtins.property
+    def property_type(self):
+        return self._property_creator.get_property_type()
+
+    def get_property_type(self):
+        return self._property_creator.get_property_type()
+
 
 class PropertyMapping(collections_abc.Mapping, metaclass=abc.ABCMeta):
     @property
@@ -230,6 +395,8 @@ class PropertyManager(PropertyMapping):
         for name, item in property_collection.properties.items():
             if isinstance(item, PropertyCollection):
                 prop = PropertyManager(item, **kwargs.pop(name, {}))
+            elif isinstance(kwargs.get(name), DeferredValue):
+                prop = DeferredProperty(self, name, item, kwargs.pop(name))
             else:
                 try:
                     prop = property_collection.instantiate_property(
@@ -244,6 +411,34 @@ class PropertyManager(PropertyMapping):
         #            raise TypeError("Unknown parameters: %s" % str(kwargs))
         super(PropertyManager, self).__init__()
 
+    @classmethod
+    def restore(cls, property_collection, values):
+        """
+        Creates the properties with values which are known to be valid.
+
+        Properties without a value are created as usual, so their defaults
+        are evaluated.
+
+        :param property_collection: The properties of the model.
+        :param values: A dictionary of the values by property name.
+        """
+        manager = cls.__new__(cls)
+        manager._properties = {}
+        for name, item in property_collection.properties.items():
+            if isinstance(item, PropertyCollection):
+                prop = cls.restore(item, values.get(name) or {})
+            elif name not in values:
+                try:
+                    prop = property_collection.instantiate_property(name)
+                except exc.PropertyRequired:
+                    raise exc.PropertyRequired(name=name)
+            elif isinstance(values[name], DeferredValue):
+                prop = DeferredProperty(manager, name, item, values[name])
+            else:
+                prop = item.restore(values[name])
+            manager._properties[name] = prop
+        return manager
+
     @builtins.property
     def properties(self):
         return utils.ReadOnlyDictProxy(self._properties)
@@ -262,7 +457,14 @@ class PropertyManager(PropertyMapping):
 
 
 def property(property_type, *args, **kwargs):
+    """Creates a property of a model.
+
+    :param deferred: The storage doesn't select the property by default,
+        it's loaded on first access. Id properties can't be deferred.
+    """
     id_property = kwargs.pop("id_property", False)
+    if id_property and kwargs.get("deferred"):
+        raise ValueError("Id properties can't be deferred")
     property_class = kwargs.pop(
         "property_class", IDProperty if id_property else Property
     )
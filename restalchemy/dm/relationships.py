@@ -21,13 +21,19 @@ from restalchemy.dm import properties
 
 def relationship(property_type, *args, **kwargs):
     prefetch = kwargs.get("prefetch", False)
+    lazy = kwargs.pop("lazy", False)
+    if prefetch and lazy:
+        raise ValueError("A relationship can't be both prefetched and lazy")
     for arg in args:
         if not issubclass(arg, models.Model):
             raise exc.RelationshipModelError(model=arg)
-    kwargs["property_class"] = kwargs.get(
-        "property_class",
-        PrefetchRelationship if prefetch else Relationship,
-    )
+    if prefetch:
+        property_class = PrefetchRelationship
+    elif lazy:
+        property_class = LazyRelationship
+    else:
+        property_class = Relationship
+    kwargs["property_class"] = kwargs.get("property_class", property_class)
     return properties.property(property_type=property_type, *args, **kwargs)
 
 
@@ -121,3 +127,85 @@ class PrefetchRelationship(Relationship):
     @classmethod
     def is_prefetch(cls):
         return True
+
+
+class LazyValue(object):
+    """The id of a related model which is loaded on first access."""
+
+    def __init__(self, value_id, loader):
+        """
+        :param value_id: The id of the related model.
+        :param loader: A callable which accepts the id and returns the
+            related model.
+        """
+        super(LazyValue, self).__init__()
+        self.value_id = value_id
+        self._loader = loader
+
+    def load(self):
+        return self._loader(self.value_id)
+
+
+class LazyRelationship(Relationship):
+    """A relationship which loads the related model on first access.
+
+    The storage restores the property with a `LazyValue`, so models whose
+    related model is never read don't query it.
+    """
+
+    def __init__(
+        self,
+        property_type,
+        default=None,
+        required=False,
+        read_only=False,
+        value=None,
+    ):
+        lazy_value = value if isinstance(value, LazyValue) else None
+        self._lazy_value = None
+        super(LazyRelationship, self).__init__(
+            property_type,
+            default=default,
+            required=required and lazy_value is None,
+            read_only=read_only,
+            value=None if lazy_value else value,
+        )
+        self._required = bool(required)
+        self._first_lazy_value = lazy_value
+        self._lazy_value = lazy_value
+
+    @property
+    def lazy_value(self):
+        return self._lazy_value
+
+    def is_loaded(self):
+        return self._lazy_value is None
+
+    def _load(self):
+        if self._lazy_value is not None:
+            self._value = self._safe_value(self._lazy_value.load())
+            self._lazy_value = None
+
+    def is_dirty(self):
+        if self._first_lazy_value is None:
+            return super(LazyRelationship, self).is_dirty()
+        if self._lazy_value is not None:
+            return False
+        return (
+            self._value is None
+            or self._value.get_id() != self._first_lazy_value.value_id
+        )
+
+    @property
+    def value(self):
+        self._load()
+        return Relationship.value.fget(self)
+
+    @value.setter
+    def value(self, value):
+        Relationship.value.fset(self, value)
+        self._lazy_value = None
+
+    def set_value_force(self, value):
+        super(LazyRelationship, self).set_value_force(value)
+        self._lazy_value = None
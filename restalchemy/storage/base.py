@@ -19,6 +19,7 @@ import functools
 
 from restalchemy.common import exceptions as common_exc
 from restalchemy.common import utils
+from restalchemy.dm import relationships
 from restalchemy.storage import exceptions
 from restalchemy.storage.sql.dialect import exceptions as dialect_exc
 
@@ -54,9 +55,18 @@ class AbstractStorableMixin(metaclass=abc.ABCMeta):
 
     def _get_prepared_data(self, properties=None):
         result = {}
-        props = properties or self.properties
+        props = self.properties if properties is None else properties
         for name, prop in props.items():
-            result[name] = prop.property_type.to_simple_type(prop.value)
+            if (
+                isinstance(prop, relationships.LazyRelationship)
+                and not prop.is_loaded()
+            ):
+                # NOTE(efrolov): The id is enough to store the relationship,
+                #                don't load the related model for it.
+                value = prop.lazy_value.value_id
+            else:
+                value = prop.value
+            result[name] = prop.property_type.to_simple_type(value)
         return result
 
     @utils.classproperty
@@ -96,6 +106,36 @@ def error_catcher(func):
     return wrapper
 
 
+def generator_error_catcher(func):
+    """The same as `error_catcher` but for generator functions."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            yield from func(*args, **kwargs)
+        except common_exc.RestAlchemyException:
+            raise
+        except Exception as e:
+            raise exceptions.UnknownStorageException(caused=e)
+
+    return wrapper
+
+
+def async_error_catcher(func):
+    """The same as `error_catcher` but for coroutine functions."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except common_exc.RestAlchemyException:
+            raise
+        except Exception as e:
+            raise exceptions.UnknownStorageException(caused=e)
+
+    return wrapper
+
+
 def dead_lock_catcher(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
@@ -107,5 +147,18 @@ def dead_lock_catcher(func):
     return wrapper
 
 
+def async_dead_lock_catcher(func):
+    """The same as `dead_lock_catcher` but for coroutine functions."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except dialect_exc.DeadLock as e:
+            raise exceptions.DeadLock(msg=str(e))
+
+    return wrapper
+
+
 class PrefetchResult(dict):
     pass
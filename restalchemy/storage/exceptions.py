@@ -36,6 +36,13 @@ class HasManyRecords(exceptions.RestAlchemyException):
     )
 
 
+class SyncLoadNotSupported(exceptions.RestAlchemyException):
+    message = (
+        "Can't select %(model)s synchronously with the asyncio engine, "
+        "select it with the asynchronous API instead."
+    )
+
+
 class DeadLock(exceptions.RestAlchemyException):
     message = "Deadlock found when trying to get lock. Original message: %(msg)s"
 
@@ -149,6 +149,36 @@ class BaseOrmProcessResult(BaseProcessResult):
         return self._rows
 
 
+class TupleOrmProcessResult(BaseOrmProcessResult):
+    """The result of an ORM query which has fetched tuple rows.
+
+    Rows are parsed by the decoder compiled for the query, the parsed rows
+    are the same as the ones of `BaseOrmProcessResult`.
+    """
+
+    def fetchall(self):
+        """
+        Retrieves all rows from the executed ORM query.
+
+        :return: All rows from the executed ORM query, decoded into objects.
+        """
+        for row in self._result:
+            yield self._query.decode_row(row)
+
+    def get_rows(self):
+        """
+        Retrieves all rows from the executed ORM query, decoding them and
+        caching the result for future access.
+
+        :return: All rows from the executed ORM query, decoded into objects.
+        :rtype: list
+        """
+
+        if self._rows is None:
+            self._rows = self._query.decode_results(self._result.fetchall())
+        return self._rows
+
+
 class AbstractDialectCommand(metaclass=abc.ABCMeta):
     def __init__(self, table, data, session):
         """
@@ -194,6 +224,15 @@ class AbstractDialectCommand(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
+    def get_table_names(self):
+        """
+        Retrieves the names of the tables the SQL command reads.
+
+        :return: A tuple of the table names.
+        :rtype: tuple
+        """
+        return (self._table.name,)
+
     def execute(self):
         """
         Executes the SQL command using the values and statement provided by
@@ -205,7 +244,24 @@ class AbstractDialectCommand(metaclass=abc.ABCMeta):
         values = self.get_values()
         statement = self.get_statement()
         return BaseProcessResult(
-            result=self._session.execute(statement, values),
+            result=self._session.execute(statement, values, prepare=True),
+            session=self._session,
+        )
+
+    async def aexecute(self):
+        """
+        Executes the SQL command within an asynchronous session.
+
+        The statement and values are compiled the same way as for `execute`.
+        Database errors are converted by the session itself.
+
+        :return: A ProcessResult object containing the result of the SQL
+            command.
+        """
+        values = self.get_values()
+        statement = self.get_statement()
+        return BaseProcessResult(
+            result=await self._session.execute(statement, values, prepare=True),
             session=self._session,
         )
 
@@ -252,6 +308,119 @@ class BaseInsertCommand(AbstractDialectCommand):
         )
 
 
+class BaseBatchInsertCommand(AbstractDialectCommand):
+    EXPRESSION = "INSERT INTO `%s` (%s) VALUES %s"
+
+    def __init__(self, table, rows, session):
+        """
+        Initializes the BaseBatchInsertCommand with the given table, rows,
+        and session.
+
+        :param table: The table associated with the command.
+        :param rows: The value tuples to be inserted, ordered as the sorted
+            column names of the table.
+        :param session: The session to be used for executing the command.
+        """
+        super().__init__(table=table, data={}, session=session)
+        self._rows = rows
+
+    def get_values(self):
+        """
+        Retrieves the values to be inserted into the SQL command.
+
+        :return: A flat tuple with the values of all rows.
+        :rtype: tuple
+        """
+        values = []
+        for row in self._rows:
+            values.extend(row)
+        return tuple(values)
+
+    def get_statement(self):
+        """
+        Retrieves the SQL statement to be used in the command execution.
+
+        The statement inserts all rows at once, one group of placeholders
+        is generated for each row.
+
+        :return: The SQL statement to be used in the command execution.
+        :rtype: str
+        """
+        column_names = self._table.get_escaped_column_names(self._session)
+        placeholders = "(%s)" % ", ".join(["%s"] * len(column_names))
+        return self.EXPRESSION % (
+            self._table.name,
+            ", ".join(column_names),
+            ", ".join([placeholders] * len(self._rows)),
+        )
+
+
+class BaseUpsertCommand(BaseBatchInsertCommand):
+    CONFLICT_EXPRESSION = " ON DUPLICATE KEY UPDATE %s"
+
+    def __init__(
+        self,
+        table,
+        rows,
+        session,
+        conflict_columns=None,
+        update_columns=None,
+    ):
+        """
+        Initializes the BaseUpsertCommand with the given table, rows,
+        session, conflict columns, and update columns.
+
+        :param table: The table associated with the command.
+        :param rows: The value tuples to be inserted, ordered as the sorted
+            column names of the table.
+        :param session: The session to be used for executing the command.
+        :param conflict_columns: The columns of the unique key which detects
+            existing rows. Defaults to the primary key.
+        :param update_columns: The columns to be updated for existing rows.
+            Defaults to all columns except the conflict ones.
+        """
+        super().__init__(table=table, rows=rows, session=session)
+        self._conflict_columns = list(
+            conflict_columns or table.get_pk_names(session=session)
+        )
+        if update_columns is None:
+            update_columns = [
+                name
+                for name in table.get_column_names(session=session, with_pk=False)
+                if name not in self._conflict_columns
+            ]
+        self._update_columns = list(update_columns)
+
+    def get_conflict_clause(self):
+        """
+        Retrieves the clause which updates existing rows.
+
+        MySQL detects existing rows by any unique key of the table, so the
+        conflict columns are only used to build a no-op update when there
+        are no columns to update.
+
+        :return: The conflict clause of the SQL statement.
+        :rtype: str
+        """
+        escape = self._session.engine.escape
+        if self._update_columns:
+            names = [escape(name) for name in self._update_columns]
+            return self.CONFLICT_EXPRESSION % ", ".join(
+                f"{name} = VALUES({name})" for name in names
+            )
+        name = escape(self._conflict_columns[0])
+        return self.CONFLICT_EXPRESSION % f"{name} = {name}"
+
+    def get_statement(self):
+        """
+        Retrieves the SQL statement to be used in the command execution.
+
+        :return: The SQL statement to be used in the command execution.
+        :rtype: str
+        """
+        return super().get_statement() + self.get_conflict_clause()
+
+
 class BaseUpdateCommand(AbstractDialectCommand):
     EXPRESSION = "UPDATE `%s` SET %s WHERE %s"
 
@@ -273,7 +442,8 @@ class BaseUpdateCommand(AbstractDialectCommand):
         Retrieves the values to be updated in the SQL command.
 
         This method iterates over the column names of the table (excluding the
-        primary key) and collects the corresponding data values into a tuple.
+        primary key) which are in the data and collects the corresponding data
+        values into a tuple.
         Additionally, it collects the primary key values from the `_ids` attr
         into the same tuple. These values are then used as the data to be
         updated in the SQL statement.
@@ -283,17 +453,22 @@ class BaseUpdateCommand(AbstractDialectCommand):
         :rtype: tuple
         """
         values = tuple()
-        column_names = self._table.get_column_names(
-            self._session,
-            with_pk=False,
-        )
         pk_names = self._table.get_pk_names(session=self._session)
-        for column_name in column_names:
+        for column_name in self._get_column_names():
             values += (self._data[column_name],)
         for column_name in pk_names:
             values += (self._ids[column_name],)
         return values
 
+    def _get_column_names(self):
+        # NOTE(efrolov): The deferred properties which aren't loaded aren't
+        #                in the data, their columns are kept as they are.
+        return [
+            name
+            for name in self._table.get_column_names(self._session, with_pk=False)
+            if name in self._data
+        ]
+
     def get_statement(self):
         """
         Retrieves the SQL statement to be used in the command execution.
@@ -307,10 +482,8 @@ class BaseUpdateCommand(AbstractDialectCommand):
         :return: The SQL statement to be used in the command execution.
         :rtype: str
         """
-        column_names = self._table.get_escaped_column_names(
-            session=self._session,
-            with_pk=False,
-        )
+        escape = self._session.engine.escape
+        column_names = [escape(name) for name in self._get_column_names()]
         pk_names = self._table.get_escaped_pk_names(session=self._session)
         return self.EXPRESSION % (
             self._table.name,
@@ -319,6 +492,70 @@ class BaseUpdateCommand(AbstractDialectCommand):
         )
 
 
+class BaseBatchUpdateCommand(AbstractDialectCommand):
+    EXPRESSION = "UPDATE `%s` JOIN (%s) AS `v` ON %s SET %s"
+    ROW_EXPRESSION = "SELECT %s"
+
+    def __init__(self, table, columns, rows, session):
+        """
+        Initializes the BaseBatchUpdateCommand with the given table, columns,
+        rows, and session.
+
+        :param table: The table associated with the command.
+        :param columns: The names of the columns to be updated.
+        :param rows: The value tuples of the rows to be updated. Each tuple
+            contains the primary key values ordered as the sorted primary key
+            names of the table followed by the values of `columns`.
+        :param session: The session to be used for executing the command.
+        """
+        super().__init__(table=table, data={}, session=session)
+        self._columns = list(columns)
+        self._rows = rows
+
+    def _get_escaped_names(self):
+        escape = self._session.engine.escape
+        pk_names = self._table.get_escaped_pk_names(session=self._session)
+        return pk_names, [escape(name) for name in self._columns]
+
+    def get_values(self):
+        """
+        Retrieves the values to be used in the SQL command execution.
+
+        :return: A flat tuple with the values of all rows.
+        :rtype: tuple
+        """
+        values = []
+        for row in self._rows:
+            values.extend(row)
+        return tuple(values)
+
+    def _get_rows_statement(self, pk_names, column_names):
+        names = pk_names + column_names
+        first = self.ROW_EXPRESSION % ", ".join(f"%s AS {name}" for name in names)
+        other = self.ROW_EXPRESSION % ", ".join(["%s"] * len(names))
+        return " UNION ALL ".join([first] + [other] * (len(self._rows) - 1))
+
+    def get_statement(self):
+        """
+        Retrieves the SQL statement to be used in the command execution.
+
+        The rows are passed as a derived table which is joined with the
+        target table by the primary key, so every row gets its own values
+        in a single statement.
+
+        :return: The SQL statement to be used in the command execution.
+        :rtype: str
+        """
+        pk_names, column_names = self._get_escaped_names()
+        table = self._session.engine.escape(self._table.name)
+        return self.EXPRESSION % (
+            self._table.name,
+            self._get_rows_statement(pk_names, column_names),
+            " AND ".join(f"{table}.{name} = `v`.{name}" for name in pk_names),
+            ", ".join(f"{table}.{name} = `v`.{name}" for name in column_names),
+        )
+
+
 class BaseDeleteCommand(AbstractDialectCommand):
     EXPRESSION = "DELETE FROM `%s` WHERE %s"
 
@@ -656,7 +893,9 @@ class BaseSelectCommand(BaseBasicSelectCommand):
 
     def get_statement(self):
         sql = self.EXPRESSION % (
-            ", ".join(self._table.get_escaped_column_names(self._session)),
+            ", ".join(
+                self._table.get_escaped_column_names(self._session, with_deferred=False)
+            ),
             self._table.name,
         )
         filt = self.construct_where()
@@ -741,6 +980,7 @@ class BaseCustomSelectCommand(BaseBasicSelectCommand):
             ", ".join(
                 self._table.get_escaped_column_names(
                     self._session,
+                    with_deferred=False,
                 )
             ),
             self._table.name,
@@ -784,6 +1024,69 @@ class BaseCountCommand(BaseSelectCommand):
         return f"{sql} WHERE {filt}" if filt else sql
 
 
+class BaseEstimateCountCommand(BaseSelectCommand):
+    """Estimates the number of records instead of counting them.
+
+    Without filters the estimate is taken from the table statistics, with
+    filters it's the number of rows the planner expects, see EXPLAIN.
+    Estimates are cheap on huge tables but may be far from exact.
+    """
+
+    EXPLAIN_EXPRESSION = "EXPLAIN SELECT 1 FROM `%s`"
+
+    def __init__(self, table, session, filters=None):
+        super().__init__(table=table, session=session, filters=filters)
+
+    @property
+    @abc.abstractmethod
+    def TABLE_EXPRESSION(self):
+        """
+        The statement which selects the estimated number of records of the
+        table as `count`, the name of the table is its only value.
+
+        :rtype: str
+        """
+        raise NotImplementedError()
+
+    def get_values(self):
+        """
+        Retrieves the values to be used in the SQL command execution.
+
+        :return: The values of the WHERE clause or the name of the table if
+            there are no filters.
+        :rtype: tuple
+        """
+        if self.construct_where():
+            return super().get_values()
+        return (self._table.name,)
+
+    def get_statement(self):
+        """
+        Retrieves the full SQL statement for the query.
+
+        :return: The statement selecting the table statistics or the
+            EXPLAIN statement if there are filters.
+        :rtype: str
+        """
+        filt = self.construct_where()
+        if not filt:
+            return self.TABLE_EXPRESSION
+        return f"{self.EXPLAIN_EXPRESSION % self._table.name} WHERE {filt}"
+
+    @abc.abstractmethod
+    def parse_estimate(self, rows):
+        """
+        Extracts the estimate from the rows returned by the statement.
+
+        :param rows: The rows returned by the statement.
+        :return: The estimated number of records or None if the database
+            has no estimate, for example for a table which was never
+            analyzed.
+        :rtype: int
+        """
+        raise NotImplementedError()
+
+
 class BaseOrmDialectCommand(AbstractDialectCommand):
     def __init__(self, table, query, session):
         """
@@ -812,6 +1115,16 @@ class BaseOrmDialectCommand(AbstractDialectCommand):
 
         return self._query.compile()
 
+    def get_table_names(self):
+        """
+        Retrieves the names of the tables the query reads, the tables of the
+        prefetched relationships are joined.
+
+        :return: A tuple of the table names.
+        :rtype: tuple
+        """
+        return self._query.table_names
+
     def get_values(self):
         """
         Retrieves the values to be used in the SQL command execution.
@@ -837,28 +1150,110 @@ class BaseOrmDialectCommand(AbstractDialectCommand):
         values to it. The result of the execution is then wrapped in a
         `BaseOrmProcessResult` object and returned.
 
+        If the engine fetches tuple rows, the result is wrapped in a
+        `TupleOrmProcessResult` object instead.
+
         :return: The result of the query execution, wrapped in a
             `BaseOrmProcessResult` object.
         :rtype: BaseOrmProcessResult
         """
+        if self.use_tuple_rows():
+            return TupleOrmProcessResult(
+                result=self._session.execute(
+                    self.get_statement(),
+                    self.get_values(),
+                    tuple_rows=True,
+                    prepare=True,
+                ),
+                query=self._query,
+                session=self._session,
+            )
         return BaseOrmProcessResult(
             result=super().execute(),
             query=self._query,
             session=self._session,
         )
 
+    def use_tuple_rows(self):
+        """
+        Checks whether the rows are fetched as tuples.
+
+        :return: True if the engine of the session fetches tuple rows.
+        :rtype: bool
+        """
+        return self._session.engine.tuple_rows
+
+    async def aexecute(self):
+        """
+        Executes the SQL command associated with the query within an
+        asynchronous session.
+
+        :return: The result of the query execution, wrapped in a
+            `BaseOrmProcessResult` object.
+        :rtype: BaseOrmProcessResult
+        """
+        if self.use_tuple_rows():
+            return TupleOrmProcessResult(
+                result=await self._session.execute(
+                    self.get_statement(),
+                    self.get_values(),
+                    tuple_rows=True,
+                    prepare=True,
+                ),
+                query=self._query,
+                session=self._session,
+            )
+        return BaseOrmProcessResult(
+            result=await super().aexecute(),
+            query=self._query,
+            session=self._session,
+        )
+
+    def execute_stream(self, batch_size=None):
+        """
+        Executes the SQL command and yields parsed rows one by one.
+
+        Unlike `execute`, the result set is not materialized: rows are
+        fetched from the server by batches using the session's streaming
+        cursor and parsed lazily.
+
+        :param batch_size: The number of rows fetched from the server at
+            once.
+        :type batch_size: int, optional
+        :return: A generator of rows parsed by the query's result parser.
+        """
+        if self.use_tuple_rows():
+            rows = self._session.execute_stream(
+                self.get_statement(),
+                self.get_values(),
+                batch_size=batch_size,
+                tuple_rows=True,
+            )
+            for row in rows:
+                yield self._query.decode_row(row)
+            return
+        rows = self._session.execute_stream(
+            self.get_statement(),
+            self.get_values(),
+            batch_size=batch_size,
+        )
+        for row in rows:
+            yield self._query.parse_row(row)
+
 
 class BaseSqlOrm(object):
     @staticmethod
-    def select(model, session):
+    def select(model, session, fields=None):
         """
         Creates a new Q object for the given model and session.
 
         :param model: The model class for which the Q object is to be created.
         :param session: The session to be used for executing the query.
+        :param fields: Names of the model properties to select, all of them
+            by default.
         :return: A new Q object instance.
         """
-        return q.Q.select(model, session)
+        return q.Q.select(model, session, fields=fields)
 
 
 class AbstractDialect(metaclass=abc.ABCMeta):
@@ -934,6 +1329,30 @@ class AbstractDialect(metaclass=abc.ABCMeta):
 
         raise NotImplementedError()
 
+    def upsert(
+        self,
+        table,
+        rows,
+        session,
+        conflict_columns=None,
+        update_columns=None,
+    ):
+        """
+        Inserts rows into the specified table or updates the existing ones
+        within the session context.
+
+        :param table: The table into which rows are to be upserted.
+        :param rows: The value tuples ordered as the sorted column names of
+            the table.
+        :param session: The session to be used for executing the command.
+        :param conflict_columns: The columns of the unique key which detects
+            existing rows.
+        :param update_columns: The columns to be updated for existing rows.
+        :raises NotImplementedError: If the method is not implemented by a
+            subclass.
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def update(self, table, ids, data, session):
         """
@@ -1031,6 +1450,21 @@ class AbstractDialect(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
+    @abc.abstractmethod
+    def estimate_count(self, table, filters, session):
+        """
+        Creates a command estimating the number of records in the specified
+        table that match the given filters.
+
+        :param table: The table from which records are to be counted.
+        :param filters: The filters to be used for counting the records.
+        :param session: The session to be used for executing the command.
+        :return: An instance of `BaseEstimateCountCommand`.
+        :raises NotImplementedError: If the method is not implemented by a
+            subclass.
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def orm_command(self, table, query, session):
         """
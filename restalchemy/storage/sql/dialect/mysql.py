@@ -75,6 +75,38 @@ class MySQLInsert(base.BaseInsertCommand):
         return super().execute()
 
 
+class MySQLBatchInsert(base.BaseBatchInsertCommand):
+    @handle_database_errors
+    def execute(self):
+        """
+        Executes the MySQL batch insert command.
+
+        This method utilizes the base class's execute method to perform the
+        multi-row insert. It is decorated with `handle_database_errors` to
+        handle any MySQL database errors that may occur during execution,
+        such as deadlocks or conflicts, and raise appropriate exceptions.
+
+        :return: The result of the command execution.
+        """
+        return super().execute()
+
+
+class MySQLUpsert(base.BaseUpsertCommand):
+    @handle_database_errors
+    def execute(self):
+        """
+        Executes the MySQL upsert command.
+
+        This method utilizes the base class's execute method to perform the
+        command execution. It is decorated with `handle_database_errors` to
+        handle any MySQL database errors that may occur during execution,
+        such as deadlocks or conflicts, and raise appropriate exceptions.
+
+        :return: The result of the command execution.
+        """
+        return super().execute()
+
+
 class MySQLUpdate(base.BaseUpdateCommand):
     @handle_database_errors
     def execute(self):
@@ -92,6 +124,22 @@ class MySQLUpdate(base.BaseUpdateCommand):
         return super().execute()
 
 
+class MySQLBatchUpdate(base.BaseBatchUpdateCommand):
+    @handle_database_errors
+    def execute(self):
+        """
+        Executes the MySQL batch update command.
+
+        This method utilizes the base class's execute method to perform the
+        multi-row update. It is decorated with `handle_database_errors` to
+        handle any MySQL database errors that may occur during execution,
+        such as deadlocks or conflicts, and raise appropriate exceptions.
+
+        :return: The result of the command execution.
+        """
+        return super().execute()
+
+
 class MySQLDelete(base.BaseDeleteCommand):
     @handle_database_errors
     def execute(self):
@@ -177,6 +225,35 @@ class MySQLCount(base.BaseCountCommand):
         return super().execute()
 
 
+class MySQLEstimateCount(base.BaseEstimateCountCommand):
+    TABLE_EXPRESSION = (
+        "SELECT TABLE_ROWS AS count FROM information_schema.TABLES"
+        " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+    )
+
+    @handle_database_errors
+    def execute(self):
+        """
+        Executes the MySQL estimate count command.
+
+        :return: The result of the command execution.
+        """
+        return super().execute()
+
+    def parse_estimate(self, rows):
+        if not rows:
+            return None
+        row = rows[0]
+        if not self.construct_where():
+            return row["count"]
+        # NOTE(efrolov): EXPLAIN returns the rows to examine and the
+        #                percentage of them left by the conditions. There
+        #                are no rows if the conditions are impossible.
+        if row["rows"] is None:
+            return None
+        return int(row["rows"] * float(row.get("filtered") or 100) / 100)
+
+
 class MySqlOrmDialectCommand(base.BaseOrmDialectCommand):
     @handle_database_errors
     def execute(self):
@@ -244,6 +321,37 @@ class MySQLDialect(base.AbstractDialect):
             session=session,
         )
 
+    def upsert(
+        self,
+        table,
+        rows,
+        session,
+        conflict_columns=None,
+        update_columns=None,
+    ):
+        """
+        Upserts rows into the specified table using a MySQL dialect
+        command.
+
+        :param table: The table into which rows are to be upserted.
+        :param rows: The value tuples ordered as the sorted column names of
+            the table.
+        :param session: The session to be used for executing the command.
+        :param conflict_columns: The columns of the unique key which detects
+            existing rows.
+        :param update_columns: The columns to be updated for existing rows.
+        :return: An instance of `MySQLUpsert` configured with the table,
+            rows, and session.
+        :rtype: MySQLUpsert
+        """
+        return MySQLUpsert(
+            table,
+            rows,
+            session=session,
+            conflict_columns=conflict_columns,
+            update_columns=update_columns,
+        )
+
     def update(self, table, ids, data, session):
         """
         Updates records in the specified table using a MySQL dialect command.
@@ -393,3 +501,19 @@ class MySQLDialect(base.AbstractDialect):
             filters=filters,
             session=session,
         )
+
+    def estimate_count(self, table, filters, session):
+        """
+        Creates a command estimating the count of records, see
+        `MySQLEstimateCount`.
+
+        :param table: The table from which records are to be counted.
+        :param filters: The filters to be used for counting the records.
+        :param session: The session to be used for executing the command.
+        :rtype: MySQLEstimateCount
+        """
+        return MySQLEstimateCount(
+            table=table,
+            filters=filters,
+            session=session,
+        )
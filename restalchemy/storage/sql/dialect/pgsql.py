@@ -18,6 +18,7 @@
 
 from __future__ import absolute_import  # noqa
 
+import contextlib
 from functools import wraps
 
 from psycopg import errors
@@ -32,6 +33,24 @@ SAVEPOINT_EXP_MAP = {
 }
 
 
+@contextlib.contextmanager
+def database_errors_handler():
+    """
+    A context manager to handle PostgreSQL database errors.
+
+    Errors from the `psycopg` library raised within the context are
+    converted to :class:`.DeadLock` or :class:`.Conflict` exceptions when
+    appropriate. It is also used by asynchronous sessions, which can't
+    rely on the decorated `execute` methods of commands.
+    """
+    try:
+        yield
+    except errors.DeadlockDetected as e:
+        raise exc.DeadLock(code=e.sqlstate, message=str(e))
+    except (errors.UniqueViolation, errors.ForeignKeyViolation) as e:
+        raise exc.Conflict(code=e.sqlstate, message=str(e))
+
+
 def handle_database_errors(func):
     """
     A decorator to handle PostgreSQL database errors.
@@ -48,12 +67,8 @@ def handle_database_errors(func):
 
     @wraps(func)
     def wrapper(self, *args, **kwargs):
-        try:
+        with database_errors_handler():
             return func(self, *args, **kwargs)
-        except errors.DeadlockDetected as e:
-            raise exc.DeadLock(code=e.sqlstate, message=str(e))
-        except (errors.UniqueViolation, errors.ForeignKeyViolation) as e:
-            raise exc.Conflict(code=e.sqlstate, message=str(e))
 
     return wrapper
 
@@ -76,6 +91,46 @@ class PgSQLInsert(base.BaseInsertCommand):
         return super().execute()
 
 
+class PgSQLUpsert(base.BaseUpsertCommand):
+    EXPRESSION = 'INSERT INTO "%s" (%s) VALUES %s'
+    CONFLICT_EXPRESSION = " ON CONFLICT (%s) DO %s"
+
+    def get_conflict_clause(self):
+        """
+        Retrieves the clause which updates existing rows.
+
+        Existing rows are detected by the conflict columns, which must be
+        covered by a unique index. The new values are taken from the
+        `EXCLUDED` row.
+
+        :return: The conflict clause of the SQL statement.
+        :rtype: str
+        """
+        escape = self._session.engine.escape
+        conflict_columns = ", ".join(escape(name) for name in self._conflict_columns)
+        if not self._update_columns:
+            return self.CONFLICT_EXPRESSION % (conflict_columns, "NOTHING")
+        names = [escape(name) for name in self._update_columns]
+        return self.CONFLICT_EXPRESSION % (
+            conflict_columns,
+            "UPDATE SET %s" % ", ".join(f"{name} = EXCLUDED.{name}" for name in names),
+        )
+
+    @handle_database_errors
+    def execute(self):
+        """
+        Executes the PostgreSQL upsert command.
+
+        This method utilizes the base class's execute method to perform the
+        command execution. It is decorated with `handle_database_errors` to
+        handle any PostgreSQL database errors that may occur during execution,
+        such as deadlocks or conflicts, and raise appropriate exceptions.
+
+        :return: The result of the command execution.
+        """
+        return super().execute()
+
+
 class PgSQLUpdate(base.BaseUpdateCommand):
     EXPRESSION = 'UPDATE "%s" SET %s WHERE %s'
 
@@ -94,6 +149,56 @@ class PgSQLUpdate(base.BaseUpdateCommand):
         return super().execute()
 
 
+class PgSQLBatchUpdate(base.BaseBatchUpdateCommand):
+    # NOTE(efrolov): The empty select from the table gives column types to
+    #                the VALUES list, otherwise untyped parameters are
+    #                resolved as text and can't be assigned to columns of
+    #                other types (uuid, timestamp, jsonb, ...).
+    EXPRESSION = (
+        'UPDATE "%s" SET %s FROM (SELECT %s FROM "%s" WHERE false '
+        'UNION ALL VALUES %s) AS "v" WHERE %s'
+    )
+
+    def get_statement(self):
+        """
+        Retrieves the SQL statement to be used in the command execution.
+
+        The rows are passed as a `VALUES` list which is joined with the
+        target table by the primary key, so every row gets its own values
+        in a single statement.
+
+        :return: The SQL statement to be used in the command execution.
+        :rtype: str
+        """
+        pk_names, column_names = self._get_escaped_names()
+        names = pk_names + column_names
+        placeholders = "(%s)" % ", ".join(["%s"] * len(names))
+        return self.EXPRESSION % (
+            self._table.name,
+            ", ".join(f'{name} = "v".{name}' for name in column_names),
+            ", ".join(names),
+            self._table.name,
+            ", ".join([placeholders] * len(self._rows)),
+            " AND ".join(
+                f'"{self._table.name}".{name} = "v".{name}' for name in pk_names
+            ),
+        )
+
+    @handle_database_errors
+    def execute(self):
+        """
+        Executes the PostgreSQL batch update command.
+
+        This method utilizes the base class's execute method to perform the
+        command execution. It is decorated with `handle_database_errors` to
+        handle any PostgreSQL database errors that may occur during execution,
+        such as deadlocks or conflicts, and raise appropriate exceptions.
+
+        :return: The result of the command execution.
+        """
+        return super().execute()
+
+
 class PgSQLDelete(base.BaseDeleteCommand):
     EXPRESSION = 'DELETE FROM "%s" WHERE %s'
 
@@ -185,6 +290,34 @@ class PgSQLCount(base.BaseCountCommand):
         return super().execute()
 
 
+class PgSQLEstimateCount(base.BaseEstimateCountCommand):
+    TABLE_EXPRESSION = (
+        "SELECT reltuples::bigint AS count FROM pg_class"
+        " WHERE oid = to_regclass(quote_ident(%s))"
+    )
+    EXPLAIN_EXPRESSION = 'EXPLAIN (FORMAT JSON) SELECT 1 FROM "%s"'
+
+    @handle_database_errors
+    def execute(self):
+        """
+        Executes the PostgreSQL estimate count command.
+
+        :return: The result of the command execution.
+        """
+        return super().execute()
+
+    def parse_estimate(self, rows):
+        if not rows:
+            return None
+        if not self.construct_where():
+            # NOTE(efrolov): reltuples is -1 until the table is vacuumed or
+            #                analyzed for the first time.
+            count = rows[0]["count"]
+            return count if count >= 0 else None
+        plan = rows[0]["QUERY PLAN"]
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
 class PgSqlOrmDialectCommand(base.BaseOrmDialectCommand):
     @handle_database_errors
     def execute(self):
@@ -244,6 +377,37 @@ class PgSQLDialect(base.AbstractDialect):
         """
         return PgSQLInsert(table, data, session=session)
 
+    def upsert(
+        self,
+        table,
+        rows,
+        session,
+        conflict_columns=None,
+        update_columns=None,
+    ):
+        """
+        Upserts rows into the specified table using a PostgreSQL dialect
+        command.
+
+        :param table: The table into which rows are to be upserted.
+        :param rows: The value tuples ordered as the sorted column names of
+            the table.
+        :param session: The session to be used for executing the command.
+        :param conflict_columns: The columns of the unique key which detects
+            existing rows.
+        :param update_columns: The columns to be updated for existing rows.
+        :return: An instance of `PgSQLUpsert` configured with the table,
+            rows, and session.
+        :rtype: PgSQLUpsert
+        """
+        return PgSQLUpsert(
+            table,
+            rows,
+            session=session,
+            conflict_columns=conflict_columns,
+            update_columns=update_columns,
+        )
+
     def update(self, table, ids, data, session):
         """
         Updates records in the specified table using a PostgreSQL dialect
@@ -393,3 +557,19 @@ class PgSQLDialect(base.AbstractDialect):
             session=session,
             filters=filters,
         )
+
+    def estimate_count(self, table, filters, session):
+        """
+        Creates a command estimating the count of records, see
+        `PgSQLEstimateCount`.
+
+        :param table: The table from which records are to be counted.
+        :param filters: The filters to be used for counting the records.
+        :param session: The session to be used for executing the command.
+        :rtype: PgSQLEstimateCount
+        """
+        return PgSQLEstimateCount(
+            table=table,
+            session=session,
+            filters=filters,
+        )
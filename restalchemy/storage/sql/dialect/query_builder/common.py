@@ -68,16 +68,16 @@ class TableAlias(BaseAlias):
             self._session,
         )
 
-    def get_columns(self, with_prefetch=True, wrap_alias=True):
+    def get_columns(self, with_prefetch=True, wrap_alias=True, fields=None):
         return [
             self.get_column_by_name(col.name, wrap_alias)
-            for col in self._clause.get_columns(with_prefetch)
+            for col in self._clause.get_columns(with_prefetch, fields=fields)
         ]
 
-    def get_prefetch_columns(self, wrap_alias=True):
+    def get_prefetch_columns(self, wrap_alias=True, fields=None):
         return [
             self.get_column_by_name(col.name, wrap_alias)
-            for col in self._clause.get_prefetch_columns()
+            for col in self._clause.get_prefetch_columns(fields=fields)
         ]
 
     def get_column_by_name(self, name, wrap_alias=True):
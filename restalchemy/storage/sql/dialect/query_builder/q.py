@@ -14,12 +14,17 @@
 #    under the License.
 import abc
 import collections
+import operator
 import threading
 
 from restalchemy.storage import base
 from restalchemy.storage.sql import filters as sql_filters
 from restalchemy.storage.sql.dialect.query_builder import common
 
+# The key of the parsed rows with the number of rows matching the filters,
+# see `SelectQ.with_total_count`.
+TOTAL_COUNT_FIELD = "__total_count"
+
 
 class Table(common.AbstractClause):
     def __init__(self, model, session):
@@ -43,18 +48,28 @@ class Table(common.AbstractClause):
             ordered_result[name] = common.Column(name, prop, self._session)
         return ordered_result
 
-    def get_columns(self, with_prefetch=True):
+    def _is_selected(self, column, fields):
+        if fields is None:
+            return not column.model_property.is_deferred()
+        return column.original_name in fields
+
+    def get_columns(self, with_prefetch=True, fields=None):
+        """
+        :param fields: Names of the columns to return, all columns except
+            the deferred ones by default.
+        """
         return [
             column
             for column in self._columns.values()
-            if not column.model_property.is_prefetch() or with_prefetch
+            if (not column.model_property.is_prefetch() or with_prefetch)
+            and self._is_selected(column, fields)
         ]
 
-    def get_prefetch_columns(self):
+    def get_prefetch_columns(self, fields=None):
         return [
             column
             for column in self._columns.values()
-            if column.model_property.is_prefetch()
+            if column.model_property.is_prefetch() and self._is_selected(column, fields)
         ]
 
     def get_column_by_name(self, name):
@@ -73,6 +88,15 @@ class Limit(common.AbstractClause):
         return "LIMIT %d" % self._value
 
 
+class TotalCount(common.AbstractClause):
+    """The number of rows matching the query regardless of the limit."""
+
+    ALIAS = "total_count"
+
+    def compile(self):
+        return "COUNT(*) OVER() AS %s" % self._session.engine.escape(self.ALIAS)
+
+
 class For(common.AbstractClause):
     def __init__(self, session, share=False):
         super(For, self).__init__(session)
@@ -189,9 +213,18 @@ class OrderByValue(common.AbstractClause):
 
 
 class ResultField(object):
-    def __init__(self, alias_name):
+    def __init__(self, alias_name, position=None):
+        """
+        :param alias_name: The alias of the column in dictionary rows.
+        :param position: The index of the column in tuple rows.
+        """
         super(ResultField, self).__init__()
         self._alias_name = alias_name
+        self._position = position
+
+    @property
+    def position(self):
+        return self._position
 
     def parse(self, row):
         return row[self._alias_name]
@@ -202,8 +235,11 @@ class ResultNode(object):
         super(ResultNode, self).__init__()
         self._child_nodes = {}
 
-    def add_child_field(self, name, alias_name):
-        self._child_nodes[name] = ResultField(alias_name=alias_name)
+    def add_child_field(self, name, alias_name, position=None):
+        self._child_nodes[name] = ResultField(
+            alias_name=alias_name,
+            position=position,
+        )
         return self._child_nodes[name]
 
     def add_child_node(self, name):
@@ -216,19 +252,87 @@ class ResultNode(object):
             result[name] = child_node.parse(row)
         return result
 
+    def build_decoder(self):
+        names = []
+        positions = []
+        children = []
+        for name, child_node in self._child_nodes.items():
+            if isinstance(child_node, ResultNode):
+                children.append((name, child_node.build_decoder()))
+            else:
+                names.append(name)
+                positions.append(child_node.position)
+        return RowDecoder(names, positions, children)
+
+
+class RowDecoder(object):
+    """Parser of tuple rows compiled from a ResultNode.
+
+    The values of a node are taken from the row by their positions at once,
+    so a row is parsed without a dictionary per row and without walking
+    the tree of the parser. The result is the same as `ResultNode.parse`
+    gives for the dictionary row.
+    """
+
+    def __init__(self, names, positions, children=()):
+        """
+        :param names: The names of the fields of the node.
+        :param positions: The positions of the columns of the fields in
+            tuple rows.
+        :param children: Pairs of the name and the decoder of the child
+            nodes.
+        """
+        super(RowDecoder, self).__init__()
+        if None in positions:
+            raise ValueError("Positions of the fields %r are unknown" % (names,))
+        self._names = tuple(names)
+        self._children = tuple(children)
+        if len(positions) == 1:
+            position = positions[0]
+            self._get_values = lambda row: (row[position],)
+        elif positions:
+            self._get_values = operator.itemgetter(*positions)
+        else:
+            self._get_values = lambda row: ()
+
+    def decode(self, row):
+        result = base.PrefetchResult(zip(self._names, self._get_values(row)))
+        for name, decoder in self._children:
+            result[name] = decoder.decode(row)
+        return result
+
 
 class ResultParser(object):
     def __init__(self):
         super(ResultParser, self).__init__()
         self._root = ResultNode()
+        self._decoder = None
 
     @property
     def root(self):
         return self._root
 
+    def get_decoder(self):
+        """
+        Returns the decoder of tuple rows.
+
+        The decoder is built on the first call, so all fields must be added
+        by then.
+
+        :rtype: RowDecoder
+        """
+        if self._decoder is None:
+            self._decoder = self._root.build_decoder()
+        return self._decoder
+
 
 class SelectQ(common.AbstractClause):
-    def __init__(self, model, session):
+    def __init__(self, model, session, fields=None):
+        """
+        :param fields: Names of the model properties to select, all of them
+            except the deferred ones by default. Prefetched relationships out
+            of the fields aren't joined.
+        """
         super(SelectQ, self).__init__(session)
         self._autoinc = 0
         self._autoinc_lock = threading.RLock()
@@ -240,21 +344,23 @@ class SelectQ(common.AbstractClause):
         )
         self._select_expressions = []
         self._table_references = [self._model_table]  # type: list
+        self._table_names = [model.__tablename__]
         self._where_expression = sql_filters.AND()
         self._order_by_expressions = []
         self._for_expression = None
         self._limit_condition = None
         self._add_column_to_select_expressions(
             result_parser_node=self._result_parser.root,
-            columns=self._model_table.get_columns(with_prefetch=False),
+            columns=self._model_table.get_columns(with_prefetch=False, fields=fields),
         )
         self._resolve_model_dependency(
             table=self._model_table,
             result_parser_node=self._result_parser.root,
+            fields=fields,
         )
 
-    def _resolve_model_dependency(self, table, result_parser_node):
-        for column in table.get_prefetch_columns():
+    def _resolve_model_dependency(self, table, result_parser_node, fields=None):
+        for column in table.get_prefetch_columns(fields=fields):
             dep_model = column.model_property.get_property_type()
 
             # Search primary key column
@@ -283,6 +389,7 @@ class SelectQ(common.AbstractClause):
                 session=self._session,
             )
             self._table_references.append(left_join)
+            self._table_names.append(dep_model.__tablename__)
 
             # Adding columns to fetch data on it
             node = result_parser_node.add_child_node(column.original_name)
@@ -302,6 +409,7 @@ class SelectQ(common.AbstractClause):
             result_parser_node.add_child_field(
                 column.original_name,
                 column.name,
+                position=len(self._select_expressions),
             )
             self._select_expressions.append(column)
         return self._select_expressions
@@ -337,6 +445,21 @@ class SelectQ(common.AbstractClause):
         self._for_expression = For(share)
         return self
 
+    def with_total_count(self):
+        """
+        Selects the number of rows matching the filters into every row.
+
+        The count is a window function, so it ignores the limit. Parsed rows
+        have it under `TOTAL_COUNT_FIELD`.
+        """
+        self._result_parser.root.add_child_field(
+            TOTAL_COUNT_FIELD,
+            TotalCount.ALIAS,
+            position=len(self._select_expressions),
+        )
+        self._select_expressions.append(TotalCount(session=self._session))
+        return self
+
     def order_by(self, property_name, sort_type="ASC"):
         column = self._model_table.get_column_by_name(
             property_name,
@@ -389,8 +512,197 @@ class SelectQ(common.AbstractClause):
     def parse_results(self, rows):
         return [self.parse_row(row) for row in rows]
 
+    def decode_row(self, row):
+        return self._result_parser.get_decoder().decode(row)
+
+    def decode_results(self, rows):
+        decode = self._result_parser.get_decoder().decode
+        return [decode(row) for row in rows]
+
+    @property
+    def result_parser(self):
+        return self._result_parser
+
+    @property
+    def table_names(self):
+        """The names of the selected and joined tables."""
+        return tuple(dict.fromkeys(self._table_names))
+
+
+class CompiledSelectQ(object):
+    """Compiled statement and result parser of SelectQ.
+
+    The object doesn't keep any session and can be shared between threads.
+    Values of a particular call are bound with `bind`.
+    """
+
+    def __init__(self, statement, result_parser, table_names):
+        super(CompiledSelectQ, self).__init__()
+        self._statement = statement
+        self._result_parser = result_parser
+        self._table_names = table_names
+
+    @property
+    def statement(self):
+        return self._statement
+
+    @property
+    def table_names(self):
+        return self._table_names
+
+    def bind(self, values):
+        return BoundSelectQ(self, values)
+
+    def parse_row(self, row):
+        return self._result_parser.root.parse(row)
+
+    def decode_row(self, row):
+        return self._result_parser.get_decoder().decode(row)
+
+    def decode_results(self, rows):
+        decode = self._result_parser.get_decoder().decode
+        return [decode(row) for row in rows]
+
+
+class BoundSelectQ(object):
+    """Query compatible with SelectQ built from the compiled statement."""
+
+    def __init__(self, compiled, values):
+        super(BoundSelectQ, self).__init__()
+        self._compiled = compiled
+        self._values = values
+
+    def compile(self):
+        return self._compiled.statement
+
+    def values(self):
+        return self._values
+
+    @property
+    def table_names(self):
+        return self._compiled.table_names
+
+    def parse_row(self, row):
+        return self._compiled.parse_row(row)
+
+    def parse_results(self, rows):
+        return [self._compiled.parse_row(row) for row in rows]
+
+    def decode_row(self, row):
+        return self._compiled.decode_row(row)
+
+    def decode_results(self, rows):
+        return self._compiled.decode_results(rows)
+
+
+class SelectQCache(object):
+    """Bounded LRU cache of compiled select statements.
+
+    The cache is keyed by the shape of the query: model (and thus the set
+    of prefetched relationships), shape of the filters tree, order_by,
+    limit and lock mode. On hit only values are extracted from filters.
+    """
+
+    def __init__(self, max_size):
+        super(SelectQCache, self).__init__()
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self):
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "size": len(self._entries),
+            "max_size": self._max_size,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    @staticmethod
+    def _get_key(
+        model, filters, limit, order_by, locked, fields=None, with_total_count=False
+    ):
+        return (
+            model,
+            sql_filters.get_filters_shape(filters),
+            tuple((order_by or {}).items()),
+            limit,
+            bool(locked),
+            None if fields is None else tuple(sorted(fields)),
+            bool(with_total_count),
+        )
+
+    def get(
+        self,
+        model,
+        session,
+        build,
+        filters=None,
+        limit=None,
+        order_by=None,
+        locked=False,
+        fields=None,
+        with_total_count=False,
+    ):
+        """Return query for the given parameters.
+
+        :param build: callable without arguments which builds SelectQ on
+            cache miss.
+        """
+        if self._max_size <= 0:
+            return build()
+
+        key = self._get_key(
+            model, filters, limit, order_by, locked, fields, with_total_count
+        )
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+
+        if compiled is not None:
+            return compiled.bind(
+                sql_filters.iterate_filters_values(model, filters, session)
+            )
+
+        query = build()
+        compiled = CompiledSelectQ(
+            query.compile(), query.result_parser, query.table_names
+        )
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return compiled.bind(query.values())
+
 
 class Q(object):
     @staticmethod
-    def select(model, session):
-        return SelectQ(model, session)
+    def select(model, session, fields=None):
+        return SelectQ(model, session, fields=fields)
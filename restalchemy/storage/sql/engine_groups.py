@@ -0,0 +1,447 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import abc
+import collections
+from concurrent import futures
+import contextlib
+import functools
+import itertools
+import logging
+import threading
+import time
+
+from mysql.connector import errors as mysql_errors
+import psycopg
+import psycopg_pool
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_POLICY = "round_robin"
+DEFAULT_MAX_FAILURES = 3
+DEFAULT_EJECT_TIME = 30.0
+DEFAULT_EWMA_ALPHA = 0.3
+DEFAULT_HEDGE_PERCENTILE = 95
+DEFAULT_HEDGE_DELAY = 0.05
+DEFAULT_HEDGE_WORKERS = 8
+DEFAULT_PROBE_STATEMENT = "SELECT 1"
+LATENCY_WINDOW_SIZE = 1000
+# The number of latency samples required to use the percentile as the
+# hedge delay.
+MIN_HEDGE_SAMPLES = 20
+
+# Errors which mean that a replica is unavailable rather than a query is
+# wrong.
+DEFAULT_FAILURE_EXCEPTIONS = (
+    psycopg.OperationalError,
+    psycopg_pool.PoolTimeout,
+    mysql_errors.OperationalError,
+    mysql_errors.InterfaceError,
+    mysql_errors.PoolError,
+)
+
+
+class Replica(object):
+    """A replica engine of a group and its balancing statistics."""
+
+    def __init__(self, name, engine):
+        super(Replica, self).__init__()
+        self.name = name
+        self.engine = engine
+        self.outstanding = 0
+        self.latency = None
+        self.failures = 0
+        self.ejected = False
+        self.ejected_until = 0.0
+        self.probe = None
+
+    def is_healthy(self):
+        return not self.ejected
+
+    def __repr__(self):
+        return "<Replica %s outstanding=%d latency=%r>" % (
+            self.name,
+            self.outstanding,
+            self.latency,
+        )
+
+
+class AbstractBalancingPolicy(metaclass=abc.ABCMeta):
+    @abc.abstractmethod
+    def choose(self, replicas):
+        """
+        Chooses a replica to read from.
+
+        :param replicas: A non-empty list of healthy replicas.
+        :type replicas: list of Replica
+        :return: The chosen replica.
+        :rtype: Replica
+        """
+        raise NotImplementedError()
+
+
+class RoundRobinPolicy(AbstractBalancingPolicy):
+    def __init__(self):
+        super(RoundRobinPolicy, self).__init__()
+        self._counter = itertools.count()
+
+    def choose(self, replicas):
+        return replicas[next(self._counter) % len(replicas)]
+
+
+class LeastOutstandingPolicy(AbstractBalancingPolicy):
+    """Chooses the replica with the least number of checked out sessions."""
+
+    def choose(self, replicas):
+        return min(replicas, key=lambda replica: replica.outstanding)
+
+
+class LatencyEWMAPolicy(AbstractBalancingPolicy):
+    """Chooses the replica with the lowest expected latency.
+
+    The expected latency is the moving average of the latency multiplied
+    by the number of requests which would be in flight. Replicas without
+    measurements are tried first.
+    """
+
+    def choose(self, replicas):
+        return min(
+            replicas,
+            key=lambda replica: (replica.latency or 0.0) * (replica.outstanding + 1),
+        )
+
+
+POLICIES = {
+    "round_robin": RoundRobinPolicy,
+    "least_outstanding": LeastOutstandingPolicy,
+    "latency_ewma": LatencyEWMAPolicy,
+}
+
+
+class EngineGroup(object):
+    """A primary engine with read replicas.
+
+    Reads are spread over the healthy replicas by the balancing policy. A
+    replica which fails `max_failures` times in a row is ejected for
+    `eject_time` seconds, then it's probed with `probe_statement` in a
+    worker thread and returns if the probe succeeds, otherwise it stays
+    ejected for another `eject_time`. If there are no healthy replicas,
+    reads go to the primary.
+
+    The latency of a replica is the latency of the statements executed on
+    its engine, see `statement_stats.StatementStats.add_listener`.
+
+    Hedged reads are opt-in: only the functions passed to `read` are
+    hedged. The read-only sessions of the contexts run arbitrary code and
+    can't be repeated on another replica, so they check out a single
+    replica, see `checkout`.
+    """
+
+    def __init__(
+        self,
+        primary,
+        replicas,
+        policy=DEFAULT_POLICY,
+        max_failures=DEFAULT_MAX_FAILURES,
+        eject_time=DEFAULT_EJECT_TIME,
+        ewma_alpha=DEFAULT_EWMA_ALPHA,
+        hedge=False,
+        hedge_percentile=DEFAULT_HEDGE_PERCENTILE,
+        hedge_delay=DEFAULT_HEDGE_DELAY,
+        hedge_workers=DEFAULT_HEDGE_WORKERS,
+        failure_exceptions=DEFAULT_FAILURE_EXCEPTIONS,
+        probe_statement=DEFAULT_PROBE_STATEMENT,
+    ):
+        """
+        Initializes the engine group.
+
+        :param primary: The read-write engine.
+        :param replicas: A dictionary of the read-only engines by name.
+        :param policy: The name of a policy from POLICIES or an instance
+            of AbstractBalancingPolicy.
+        :param max_failures: The number of failures in a row to eject a
+            replica.
+        :param eject_time: The number of seconds a replica stays ejected.
+        :param ewma_alpha: The weight of the last measurement in the
+            moving average of the latency.
+        :param hedge: Whether `read` hedges requests by default.
+        :param hedge_percentile: The percentile of the read latency used as
+            the delay before a hedged request.
+        :param hedge_delay: The delay before a hedged request until enough
+            latency samples are collected.
+        :param hedge_workers: The number of threads which run hedged reads
+            and probes.
+        :param failure_exceptions: The exceptions which mean that a replica
+            is unavailable.
+        :param probe_statement: The statement which checks an ejected
+            replica before it returns.
+        """
+        super(EngineGroup, self).__init__()
+        self._primary = primary
+        self._replicas = [Replica(name, engine) for name, engine in replicas.items()]
+        if isinstance(policy, str):
+            try:
+                policy = POLICIES[policy]()
+            except KeyError:
+                raise ValueError("Unknown balancing policy %s" % policy)
+        self._policy = policy
+        self._max_failures = max_failures
+        self._eject_time = eject_time
+        self._ewma_alpha = ewma_alpha
+        self._hedge = hedge
+        self._hedge_percentile = hedge_percentile
+        self._hedge_delay = hedge_delay
+        self._hedge_workers = hedge_workers
+        self._failure_exceptions = tuple(failure_exceptions)
+        self._probe_statement = probe_statement
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW_SIZE)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._listeners = []
+        for replica in self._replicas:
+            listener = functools.partial(self._record_latency, replica)
+            replica.engine.statement_stats.add_listener(listener)
+            self._listeners.append((replica.engine, listener))
+
+    @property
+    def primary(self):
+        return self._primary
+
+    @property
+    def replicas(self):
+        return list(self._replicas)
+
+    def get_healthy_replicas(self):
+        """
+        Returns the replicas which aren't ejected.
+
+        The ejected replicas whose time is over are probed in the
+        background.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for replica in self._replicas:
+                if (
+                    replica.ejected
+                    and replica.ejected_until <= now
+                    and (replica.probe is None or replica.probe.done())
+                ):
+                    replica.probe = self._get_executor_unlocked().submit(
+                        self._probe, replica
+                    )
+        return [replica for replica in self._replicas if replica.is_healthy()]
+
+    def _probe(self, replica):
+        try:
+            with replica.engine.session_manager() as session:
+                session.execute(self._probe_statement).fetchall()
+        except Exception:
+            LOG.warning(
+                "Replica %s is still unavailable, it's ejected for %s seconds",
+                replica.name,
+                self._eject_time,
+                exc_info=True,
+            )
+            with self._lock:
+                replica.ejected_until = time.monotonic() + self._eject_time
+        else:
+            LOG.info("Replica %s is available again", replica.name)
+            with self._lock:
+                replica.failures = 0
+                replica.ejected = False
+
+    def choose_replica(self, exclude=()):
+        """
+        Chooses a healthy replica by the balancing policy.
+
+        :param exclude: Replicas which must not be chosen.
+        :return: The chosen replica or None if there are no healthy ones.
+        :rtype: Replica
+        """
+        replicas = [
+            replica for replica in self.get_healthy_replicas() if replica not in exclude
+        ]
+        if not replicas:
+            return None
+        with self._lock:
+            return self._policy.choose(replicas)
+
+    def get_read_engine(self):
+        """
+        Returns an engine to read from without tracking its usage.
+
+        :return: A replica engine or the primary one if there are no
+            healthy replicas.
+        """
+        replica = self.choose_replica()
+        return self._primary if replica is None else replica.engine
+
+    def is_failure(self, error):
+        caused = getattr(error, "caused", None)
+        return isinstance(error, self._failure_exceptions) or isinstance(
+            caused, self._failure_exceptions
+        )
+
+    def _record_latency(self, replica, latency):
+        with self._lock:
+            if replica.latency is None:
+                replica.latency = latency
+            else:
+                replica.latency += self._ewma_alpha * (latency - replica.latency)
+            self._latencies.append(latency)
+
+    def _report_success(self, replica):
+        with self._lock:
+            replica.failures = 0
+
+    def _report_failure(self, replica):
+        with self._lock:
+            replica.failures += 1
+            if replica.failures >= self._max_failures:
+                replica.failures = 0
+                replica.ejected = True
+                replica.ejected_until = time.monotonic() + self._eject_time
+                LOG.warning(
+                    "Replica %s is ejected for %s seconds",
+                    replica.name,
+                    self._eject_time,
+                )
+
+    @contextlib.contextmanager
+    def _track(self, replica):
+        with self._lock:
+            replica.outstanding += 1
+        try:
+            yield replica.engine
+        except Exception as e:
+            if self.is_failure(e):
+                self._report_failure(replica)
+            raise
+        else:
+            self._report_success(replica)
+        finally:
+            with self._lock:
+                replica.outstanding -= 1
+
+    @contextlib.contextmanager
+    def checkout(self, exclude=()):
+        """
+        Checks out an engine to read from.
+
+        The replica is ejected if it keeps failing within the context.
+
+        :param exclude: Replicas which must not be chosen.
+        :yields: A replica engine or the primary one if there are no
+            healthy replicas.
+        """
+        replica = self.choose_replica(exclude=exclude)
+        if replica is None:
+            yield self._primary
+            return
+        with self._track(replica) as engine:
+            yield engine
+
+    def get_hedge_delay(self):
+        """
+        Returns the delay before a hedged request in seconds.
+
+        :return: The configured percentile of the recent statement
+            latencies of the replicas or the initial delay if there are not
+            enough samples.
+        :rtype: float
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < MIN_HEDGE_SAMPLES:
+            return self._hedge_delay
+        index = int(len(latencies) * self._hedge_percentile / 100.0)
+        return latencies[min(index, len(latencies) - 1)]
+
+    def _get_executor(self):
+        with self._lock:
+            return self._get_executor_unlocked()
+
+    def _get_executor_unlocked(self):
+        # NOTE(efrolov): The method must be called under the lock.
+        if self._executor is None:
+            self._executor = futures.ThreadPoolExecutor(
+                max_workers=self._hedge_workers,
+                thread_name_prefix="ra-hedged-read",
+            )
+        return self._executor
+
+    def _read(self, func, replica):
+        if replica is None:
+            engine_cm = contextlib.nullcontext(self._primary)
+        else:
+            engine_cm = self._track(replica)
+        with engine_cm as engine:
+            with engine.session_manager() as session:
+                return func(session)
+
+    def read(self, func, hedge=None):
+        """
+        Runs a read-only function on a replica.
+
+        With hedging, if the replica doesn't answer within the hedge delay,
+        the function is run on another replica as well and the first
+        successful result is returned. Hedged functions are run in worker
+        threads, each in its own session, so they must only read. The hedge
+        delay is a percentile of the statement latencies, so functions with
+        a single select are hedged best.
+
+        :param func: A function which accepts a session and returns the
+            result of the read.
+        :param hedge: Whether the read is hedged. Defaults to the `hedge`
+            setting of the group.
+        :return: The result of the function.
+        """
+        hedge = self._hedge if hedge is None else hedge
+        first = self.choose_replica()
+        if not hedge or first is None:
+            return self._read(func, first)
+
+        executor = self._get_executor()
+        first_future = executor.submit(self._read, func, first)
+        try:
+            return first_future.result(timeout=self.get_hedge_delay())
+        except futures.TimeoutError:
+            pass
+
+        second = self.choose_replica(exclude=(first,))
+        if second is None:
+            return first_future.result()
+        LOG.debug("Hedge the read from %s to %s", first.name, second.name)
+        second_future = executor.submit(self._read, func, second)
+        pending = {first_future, second_future}
+        while True:
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+            if not pending:
+                # Both reads failed, raise the error of the first one.
+                return first_future.result()
+
+    def close(self):
+        """Stops the threads of hedged reads and probes."""
+        for engine, listener in self._listeners:
+            engine.statement_stats.remove_listener(listener)
+        self._listeners = []
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
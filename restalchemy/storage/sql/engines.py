@@ -17,9 +17,12 @@
 import abc
 import contextlib
 import logging
+import time
 import typing as tp
 import urllib.parse as parse
+import weakref
 
+from mysql.connector import errors as mysql_errors
 from mysql.connector import pooling
 from psycopg.types.json import Jsonb
 from psycopg.types.json import JsonbDumper
@@ -27,13 +30,21 @@ import psycopg_pool
 
 from restalchemy.common import constants as c
 from restalchemy.common import singletons
+from restalchemy.storage.sql import engine_groups
+from restalchemy.storage.sql import pool_stats
+from restalchemy.storage.sql import pools
 from restalchemy.storage.sql import sessions
+from restalchemy.storage.sql import statement_stats
 from restalchemy.storage.sql.dialect import adapters
 from restalchemy.storage.sql.dialect import mysql
 from restalchemy.storage.sql.dialect import pgsql
+from restalchemy.storage.sql.dialect.query_builder import q
 
 DEFAULT_NAME = "default"
 DEFAULT_CONNECTION_TIMEOUT = 10
+DEFAULT_STATEMENT_CACHE_SIZE = 256
+# The default of psycopg: a statement is prepared on the 6th execution.
+PG_DEFAULT_PREPARE_THRESHOLD = 5
 LOG = logging.getLogger(__name__)
 
 
@@ -108,6 +119,9 @@ class AbstractEngine(metaclass=abc.ABCMeta):
         config=None,
         query_cache=False,
         readonly=False,
+        statement_cache_size=DEFAULT_STATEMENT_CACHE_SIZE,
+        prepared_statements=False,
+        tuple_rows=False,
     ):
         """
         Initializes the database engine.
@@ -120,6 +134,15 @@ class AbstractEngine(metaclass=abc.ABCMeta):
                             cache query results.
         :param readonly: A boolean indicating whether the engine should
                          operate in readonly mode.
+        :param statement_cache_size: The maximum number of compiled select
+                                     statements kept by the engine. 0
+                                     disables the cache.
+        :param prepared_statements: A boolean indicating whether sessions
+                                    execute statements as server-side
+                                    prepared statements.
+        :param tuple_rows: A boolean indicating whether ORM selects fetch
+                           plain tuples decoded by the column positions
+                           instead of dictionaries.
 
         :raises ValueError: If the database URL does not match the expected
             format.
@@ -141,6 +164,13 @@ class AbstractEngine(metaclass=abc.ABCMeta):
         self._session_storage = session_storage
         self._query_cache = query_cache
         self._readonly = readonly
+        self._prepared_statements = prepared_statements
+        self._tuple_rows = tuple_rows
+        self._statement_cache = q.SelectQCache(max_size=statement_cache_size)
+        self._pool_stats = pool_stats.PoolStats()
+        self._statement_stats = statement_stats.StatementStats()
+        self._metric_sender = None
+        self._metric_prefix = pool_stats.DEFAULT_METRIC_PREFIX
 
     @property
     def dialect(self):
@@ -162,6 +192,24 @@ class AbstractEngine(metaclass=abc.ABCMeta):
         """
         return self._readonly
 
+    @property
+    def prepared_statements(self):
+        """
+        Returns whether sessions execute server-side prepared statements.
+
+        :rtype: bool
+        """
+        return self._prepared_statements
+
+    @property
+    def tuple_rows(self):
+        """
+        Returns whether ORM selects fetch tuple rows decoded by position.
+
+        :rtype: bool
+        """
+        return self._tuple_rows
+
     def escape(self, value):
         """
         Escapes a value for use in a query.
@@ -247,6 +295,105 @@ class AbstractEngine(metaclass=abc.ABCMeta):
         """
         return self._query_cache
 
+    @property
+    def statement_cache(self):
+        """
+        Returns the cache of compiled select statements of the engine.
+
+        The cache reuses SQL text and result parsers of ORM selects with
+        the same shape and exposes hit/miss counters via `get_stats()`.
+
+        :rtype: SelectQCache
+        """
+        return self._statement_cache
+
+    @property
+    def statement_stats(self):
+        """
+        Returns the statistics of statements executed by the engine.
+
+        The registry is disabled by default, enable it with
+        `engine.statement_stats.configure(slow_threshold=..., explain=...)`
+        and dump the heaviest statements with `get_top()`.
+
+        :rtype: StatementStats
+        """
+        return self._statement_stats
+
+    def _get_pool_state(self):
+        """
+        Returns the state of the connection pool of the engine.
+
+        Subclasses override the method to report `pool_size`, `idle` and
+        `waiting` and to replace counters the pool keeps by itself.
+
+        :rtype: dict
+        """
+        return {}
+
+    def get_pool_stats(self):
+        """
+        Returns the stats of the connection pool of the engine.
+
+        The stats are the same for all engines: `checkouts`, `in_use`,
+        `idle`, `pool_size`, `waiting`, `requests_queued` (requests which
+        had to wait for a connection), `pool_exhausted` (requests which got
+        no connection at all), `reconnects`, the checkout wait (total, max
+        and `checkout_wait_histogram` by the upper bound of the bucket in
+        seconds) and the lifetime of closed connections.
+
+        :rtype: dict
+        """
+        stats = self._pool_stats.get_stats()
+        stats.update(
+            {"idle": 0, "pool_size": 0, "waiting": 0, "requests_queued": 0},
+        )
+        stats.update(self._get_pool_state())
+        return stats
+
+    def set_metric_sender(self, metric_sender, prefix=None):
+        """
+        Sets the sender of the pool metrics.
+
+        The sender gets the wait of every checkout as `<prefix>.checkout_wait`
+        and every failure to get a connection from the exhausted pool as
+        `<prefix>.exhausted`. The whole stats are pushed by
+        `send_pool_stats`, which should be called periodically.
+
+        :param metric_sender: An object with a `send_metric(name, value)`
+            method, like the one `HttpMetricsMiddleware` takes. None
+            disables sending.
+        :param prefix: The prefix of the metric names.
+        """
+        self._metric_sender = metric_sender
+        self._metric_prefix = prefix or pool_stats.DEFAULT_METRIC_PREFIX
+
+    def send_pool_stats(self):
+        """Pushes the stats of the pool to the metric sender if it is set."""
+        if self._metric_sender is not None:
+            pool_stats.send_stats(
+                self._metric_sender, self._metric_prefix, self.get_pool_stats()
+            )
+
+    def _send_metric(self, name, value):
+        if self._metric_sender is None:
+            return
+        try:
+            self._metric_sender.send_metric(
+                "%s.%s" % (self._metric_prefix, name), value
+            )
+        except Exception:
+            LOG.exception("Failed to send the %s pool metric", name)
+
+    def _record_checkout(self, started_at):
+        wait_time = time.monotonic() - started_at
+        self._pool_stats.record_checkout(wait_time)
+        self._send_metric("checkout_wait", wait_time)
+
+    def _record_exhausted(self):
+        self._pool_stats.record_exhausted()
+        self._send_metric("exhausted", 1)
+
     def get_connection(self):
         """
         Establishes and returns a connection to the database from a pool.
@@ -351,6 +498,7 @@ class AbstractEngine(metaclass=abc.ABCMeta):
         """
 
         conn.close()
+        self._pool_stats.record_checkin()
 
 
 class PgDictJsonbDumper(JsonbDumper):
@@ -358,11 +506,43 @@ class PgDictJsonbDumper(JsonbDumper):
         return obj if obj is None else super().dump(Jsonb(obj))
 
 
+def _track_pg_connection_lifetime(stats, conn):
+    # NOTE(efrolov): psycopg_pool drops closed connections, so the lifetime
+    #                is recorded when the connection object is collected.
+    created_at = time.monotonic()
+    weakref.finalize(
+        conn,
+        lambda: stats.record_connection_closed(time.monotonic() - created_at),
+    )
+
+
+def _get_pool_state_from_stats(pool):
+    # NOTE(efrolov): BlockingMySQLPool reports the same stats as psycopg_pool.
+    stats = pool.get_stats()
+    return {
+        "pool_size": stats.get("pool_size", 0),
+        "idle": stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        # Requests which had to wait for a connection.
+        "requests_queued": stats.get("requests_queued", 0),
+        "reconnects": stats.get("connections_lost", 0),
+    }
+
+
 class PgSQLEngine(AbstractEngine):
     URL_SCHEMA = c.RA_POSTGRESQL_PROTO_NAME
     DEFAULT_PORT = c.RA_POSTGRESQL_DB_PORT
 
-    def __init__(self, db_url, config=None, query_cache=False, readonly=False):
+    def __init__(
+        self,
+        db_url,
+        config=None,
+        query_cache=False,
+        readonly=False,
+        statement_cache_size=DEFAULT_STATEMENT_CACHE_SIZE,
+        prepared_statements=False,
+        tuple_rows=False,
+    ):
         """
         Initializes the PostgreSQL engine.
 
@@ -374,6 +554,14 @@ class PgSQLEngine(AbstractEngine):
                          operate in readonly mode. Note: Actual DB-level
                          readonly enforcement requires using a database user
                          with readonly permissions.
+        :param statement_cache_size: The maximum number of compiled select
+            statements kept by the engine.
+        :param prepared_statements: A boolean indicating whether every
+            statement is prepared on its first execution. Otherwise
+            psycopg prepares statements executed `prepare_threshold` times,
+            which can be set in `config`.
+        :param tuple_rows: A boolean indicating whether ORM selects fetch
+            plain tuples decoded by the column positions.
 
         :return: The initialized engine.
         """
@@ -385,11 +573,17 @@ class PgSQLEngine(AbstractEngine):
             config=config,
             query_cache=query_cache,
             readonly=readonly,
+            statement_cache_size=statement_cache_size,
+            prepared_statements=prepared_statements,
+            tuple_rows=tuple_rows,
         )
 
         # RA expects the pool to be ready to use
         if "open" not in self._config:
             self._config["open"] = True
+        self._prepare_threshold = self._config.pop(
+            "prepare_threshold", PG_DEFAULT_PREPARE_THRESHOLD
+        )
 
         self._pool = psycopg_pool.ConnectionPool(
             conninfo=db_url,
@@ -400,8 +594,10 @@ class PgSQLEngine(AbstractEngine):
 
     def _conn_configure_callback(self, conn):
         conn.adapters.register_dumper(dict, PgDictJsonbDumper)
+        conn.prepare_threshold = self._prepare_threshold
         if self.readonly:
             conn.read_only = True
+        _track_pg_connection_lifetime(self._pool_stats, conn)
 
     def escape(self, value):
         """
@@ -466,7 +662,14 @@ class PgSQLEngine(AbstractEngine):
         :rtype: psycopg2.extensions.connection
         """
 
-        return self._pool.getconn()
+        started_at = time.monotonic()
+        try:
+            conn = self._pool.getconn()
+        except psycopg_pool.PoolTimeout:
+            self._record_exhausted()
+            raise
+        self._record_checkout(started_at)
+        return conn
 
     def close_connection(self, conn):
         """
@@ -480,22 +683,188 @@ class PgSQLEngine(AbstractEngine):
         """
 
         self._pool.putconn(conn)
+        self._pool_stats.record_checkin()
+
+    def _get_pool_state(self):
+        return _get_pool_state_from_stats(self._pool)
+
+
+class AsyncPgSQLEngine(AbstractEngine):
+    """PostgreSQL engine for asyncio applications.
+
+    The engine is built on `psycopg_pool.AsyncConnectionPool`. Sessions are
+    stored per asyncio task, and the methods which acquire connections or
+    sessions are coroutines. The pool is opened on the first use or by an
+    explicit `open` call.
+    """
+
+    URL_SCHEMA = c.RA_POSTGRESQL_PROTO_NAME
+    DEFAULT_PORT = c.RA_POSTGRESQL_DB_PORT
+
+    escape = PgSQLEngine.escape
+
+    def __init__(
+        self,
+        db_url,
+        config=None,
+        query_cache=False,
+        readonly=False,
+        statement_cache_size=DEFAULT_STATEMENT_CACHE_SIZE,
+        prepared_statements=False,
+        tuple_rows=False,
+    ):
+        """
+        Initializes the asyncio PostgreSQL engine.
+
+        :param db_url: The connection URL for the PostgreSQL database.
+        :param config: A dictionary of configuration options for the pool.
+        :param query_cache: Not supported by the engine, kept for the
+            compatibility with other engines.
+        :param readonly: A boolean indicating whether the engine should
+                         operate in readonly mode.
+        :param statement_cache_size: The maximum number of compiled select
+            statements kept by the engine.
+        :param prepared_statements: The same as for `PgSQLEngine`.
+        :param tuple_rows: The same as for `PgSQLEngine`.
+        """
+        super(AsyncPgSQLEngine, self).__init__(
+            db_url=db_url,
+            dialect=pgsql.PgSQLDialect(),
+            session_storage=sessions.SessionContextStorage(),
+            config=config,
+            query_cache=query_cache,
+            readonly=readonly,
+            statement_cache_size=statement_cache_size,
+            prepared_statements=prepared_statements,
+            tuple_rows=tuple_rows,
+        )
+
+        # NOTE(efrolov): The pool can't be opened without a running event
+        #                loop, so it's opened on the first use.
+        self._config.pop("open", None)
+        self._prepare_threshold = self._config.pop(
+            "prepare_threshold", PG_DEFAULT_PREPARE_THRESHOLD
+        )
+        self._pool = psycopg_pool.AsyncConnectionPool(
+            conninfo=db_url,
+            configure=self._conn_configure_callback,
+            open=False,
+            **self._config,
+        )
+
+    async def _conn_configure_callback(self, conn):
+        conn.adapters.register_dumper(dict, PgDictJsonbDumper)
+        conn.prepare_threshold = self._prepare_threshold
+        if self.readonly:
+            await conn.set_read_only(True)
+        _track_pg_connection_lifetime(self._pool_stats, conn)
+
+    async def open(self, wait=True):
+        """
+        Opens the connection pool.
+
+        It's safe to call the method on the opened pool.
+
+        :param wait: Wait until the pool has `min_size` connections.
+        """
+        await self._pool.open(wait=wait)
+
+    async def close(self):
+        """Closes the connection pool."""
+        await self._pool.close()
+
+    async def get_connection(self):
+        """
+        Retrieves a connection from the pool.
+
+        :returns: A connection object for database operations.
+        :rtype: psycopg.AsyncConnection
+        """
+        await self.open()
+        started_at = time.monotonic()
+        try:
+            conn = await self._pool.getconn()
+        except psycopg_pool.PoolTimeout:
+            self._record_exhausted()
+            raise
+        self._record_checkout(started_at)
+        return conn
+
+    async def close_connection(self, conn):
+        """
+        Releases a connection back to the pool.
+
+        :param conn: The connection to be released back to the pool.
+        :type conn: psycopg.AsyncConnection
+        """
+        await self._pool.putconn(conn)
+        self._pool_stats.record_checkin()
+
+    def _get_pool_state(self):
+        return _get_pool_state_from_stats(self._pool)
+
+    async def get_session(self):
+        """
+        Creates and returns a new AsyncPgSQLSession for the current engine.
+
+        :returns: A session object for database operations.
+        :rtype: AsyncPgSQLSession
+        """
+        return sessions.AsyncPgSQLSession(
+            engine=self,
+            conn=await self.get_connection(),
+        )
+
+    @contextlib.asynccontextmanager
+    async def session_manager(self, session=None):
+        """
+        The asynchronous version of `AbstractEngine.session_manager`.
+
+        :param session: An optional session object. If not provided, a session
+            is retrieved from the storage of the current task or a new one is
+            created.
+        :yields: The active session for database operations.
+        """
+        session = session or self._get_session_from_storage()
+        async with sessions.async_session_manager(engine=self, session=session) as s:
+            yield s
 
 
 class MySQLEngine(AbstractEngine):
     URL_SCHEMA = c.RA_MYSQL_PROTO_NAME
     DEFAULT_PORT = c.RA_MYSQL_DB_PORT
 
-    def __init__(self, db_url, config=None, query_cache=False, readonly=False):
+    def __init__(
+        self,
+        db_url,
+        config=None,
+        query_cache=False,
+        readonly=False,
+        statement_cache_size=DEFAULT_STATEMENT_CACHE_SIZE,
+        prepared_statements=False,
+        tuple_rows=False,
+    ):
         """
         Initializes the MySQL engine.
 
         :param db_url: The URL of the database connection.
         :param config: A dictionary of configuration options for the engine.
+            If it has any of `pools.POOL_CONFIG_KEYS` (`min_size`,
+            `max_size`, `timeout`, `max_waiting`, `max_lifetime`,
+            `max_idle`, `check`), the engine uses the blocking
+            `pools.BlockingMySQLPool` configured by them. Otherwise
+            `mysql.connector.pooling.MySQLConnectionPool` is used.
         :param query_cache: A boolean indicating whether the engine should
             cache query results.
         :param readonly: A boolean indicating whether the engine should
                          operate in readonly mode.
+        :param statement_cache_size: The maximum number of compiled select
+            statements kept by the engine.
+        :param prepared_statements: A boolean indicating whether sessions
+            execute statements with prepared cursors. A statement is
+            prepared once per session.
+        :param tuple_rows: A boolean indicating whether ORM selects fetch
+            plain tuples decoded by the column positions.
 
         :raises ValueError: If the database URL does not match the expected
             format.
@@ -507,6 +876,9 @@ class MySQLEngine(AbstractEngine):
             config=config,
             query_cache=query_cache,
             readonly=readonly,
+            statement_cache_size=statement_cache_size,
+            prepared_statements=prepared_statements,
+            tuple_rows=tuple_rows,
         )
 
         if "connection_timeout" not in self._config:
@@ -526,6 +898,21 @@ class MySQLEngine(AbstractEngine):
         if self._readonly:
             self._config["init_command"] = "SET SESSION TRANSACTION READ ONLY"
 
+        self._blocking_pool = bool(pools.POOL_CONFIG_KEYS & set(self._config))
+        if self._blocking_pool:
+            pool_config = {
+                key: self._config.pop(key)
+                for key in pools.POOL_CONFIG_KEYS & set(self._config)
+            }
+            self._config.pop("pool_name", None)
+            self._config.pop("pool_size", None)
+            self._pool = pools.BlockingMySQLPool(
+                connect_kwargs=self._config,
+                on_close=self._pool_stats.record_connection_closed,
+                **pool_config,
+            )
+            return
+
         try:
             self._pool = pooling.MySQLConnectionPool(**self._config)
         except AttributeError as e:
@@ -545,8 +932,12 @@ class MySQLEngine(AbstractEngine):
         the pool are released.
         """
         pool = getattr(self, "_pool", None)
-        if pool is not None:
-            self._pool._remove_connections()
+        if pool is None:
+            return
+        if self._blocking_pool:
+            pool.close()
+        else:
+            pool._remove_connections()
 
     def get_connection(self):
         """
@@ -559,7 +950,43 @@ class MySQLEngine(AbstractEngine):
         :returns: A connection object for database operations.
         :rtype: mysql.connector.connection.MySQLConnection
         """
-        return self._pool.get_connection()
+        started_at = time.monotonic()
+        try:
+            if self._blocking_pool:
+                conn = self._pool.getconn()
+            else:
+                conn = self._pool.get_connection()
+        except mysql_errors.PoolError:
+            self._record_exhausted()
+            raise
+        self._record_checkout(started_at)
+        if self._blocking_pool:
+            return conn
+        # NOTE(efrolov): The pool reconnects its connection objects in
+        #                place, so a reconnect changes the server id.
+        cnx = getattr(conn, "_cnx", conn)
+        self._pool_stats.track_connection(id(cnx), cnx.connection_id)
+        return conn
+
+    def close_connection(self, conn):
+        """
+        Returns a connection to the pool.
+
+        :param conn: The connection to be returned to the pool.
+        """
+        if self._blocking_pool:
+            self._pool.putconn(conn)
+            self._pool_stats.record_checkin()
+        else:
+            super(MySQLEngine, self).close_connection(conn)
+
+    def _get_pool_state(self):
+        if self._blocking_pool:
+            return _get_pool_state_from_stats(self._pool)
+        return {
+            "pool_size": self._pool.pool_size,
+            "idle": self._pool._cnx_queue.qsize(),
+        }
 
     def get_session(self):
         """
@@ -587,10 +1014,14 @@ class EngineFactory(singletons.InheritSingleton):
         """
         super(EngineFactory, self).__init__()
         self._engines = {}
+        self._engine_groups = {}
         self._engines_map = {
             MySQLEngine.URL_SCHEMA: MySQLEngine,
             PgSQLEngine.URL_SCHEMA: PgSQLEngine,
         }
+        self._async_engines_map = {
+            AsyncPgSQLEngine.URL_SCHEMA: AsyncPgSQLEngine,
+        }
 
     def configure_postgresql_factory(
         self,
@@ -598,6 +1029,7 @@ class EngineFactory(singletons.InheritSingleton):
         section=c.DB_CONFIG_SECTION,
         name=DEFAULT_NAME,
         readonly=False,
+        use_async=False,
     ):
         """
         Configures the engine factory for a PostgreSQL database.
@@ -612,6 +1044,7 @@ class EngineFactory(singletons.InheritSingleton):
         :param name: The name of the engine to configure.
         :param readonly: A boolean indicating whether the engine should
                          operate in readonly mode. Defaults to False.
+        :param use_async: Create an asyncio engine. Defaults to False.
         """
         pool_config = {
             "min_size": conf[section].connection_pool_min_size,
@@ -627,6 +1060,10 @@ class EngineFactory(singletons.InheritSingleton):
         connection_kwargs = _postgresql_connection_kwargs(conf, section)
         if connection_kwargs:
             pool_config["kwargs"] = connection_kwargs
+        if conf[section].connection_prepare_threshold is not None:
+            pool_config["prepare_threshold"] = conf[
+                section
+            ].connection_prepare_threshold
 
         self.configure_factory(
             db_url=conf[section].connection_url,
@@ -634,6 +1071,10 @@ class EngineFactory(singletons.InheritSingleton):
             query_cache=conf[section].connection_query_cache,
             name=name,
             readonly=readonly,
+            statement_cache_size=conf[section].connection_statement_cache_size,
+            prepared_statements=conf[section].connection_prepared_statements,
+            tuple_rows=conf[section].connection_tuple_rows,
+            use_async=use_async,
         )
 
     def configure_mysql_factory(
@@ -657,14 +1098,28 @@ class EngineFactory(singletons.InheritSingleton):
         :param readonly: A boolean indicating whether the engine should
                          operate in readonly mode. Defaults to False.
         """
+        section_conf = conf[section]
+        if section_conf.connection_pool_blocking:
+            pool_config = {
+                "min_size": section_conf.connection_pool_size,
+                "max_size": section_conf.connection_pool_max_size,
+                "timeout": section_conf.connection_pool_client_timeout,
+                "max_waiting": section_conf.connection_pool_max_waiting,
+                "max_lifetime": section_conf.connection_max_lifetime,
+                "max_idle": section_conf.connection_max_idle,
+                "check": section_conf.connection_pool_check,
+            }
+        else:
+            pool_config = {"pool_size": section_conf.connection_pool_size}
         self.configure_factory(
             db_url=conf[section].connection_url,
-            config={
-                "pool_size": conf[section].connection_pool_size,
-            },
+            config=pool_config,
             query_cache=conf[section].connection_query_cache,
             name=name,
             readonly=readonly,
+            statement_cache_size=conf[section].connection_statement_cache_size,
+            prepared_statements=conf[section].connection_prepared_statements,
+            tuple_rows=conf[section].connection_tuple_rows,
         )
 
     def configure_factory(
@@ -674,6 +1129,10 @@ class EngineFactory(singletons.InheritSingleton):
         query_cache=False,
         name=DEFAULT_NAME,
         readonly=False,
+        statement_cache_size=DEFAULT_STATEMENT_CACHE_SIZE,
+        use_async=False,
+        prepared_statements=False,
+        tuple_rows=False,
     ):
         """
         Configures and creates a new database engine instance for the given
@@ -693,15 +1152,32 @@ class EngineFactory(singletons.InheritSingleton):
                      the factory. Defaults to 'default'.
         :param readonly: A boolean indicating whether the engine should
                          operate in readonly mode. Defaults to False.
+        :param statement_cache_size: The maximum number of compiled select
+                                     statements kept by the engine.
+        :param use_async: A boolean indicating whether an asyncio engine
+                          should be created. Defaults to False.
+        :param prepared_statements: A boolean indicating whether sessions
+                                    execute server-side prepared
+                                    statements. Defaults to False.
+        :param tuple_rows: A boolean indicating whether ORM selects fetch
+                           plain tuples decoded by the column positions.
+                           Defaults to False.
 
         :raises ValueError: If the schema from the db_url is not supported
                             or if no driver is found for the schema.
         """
 
         schema = db_url.split(":")[0]
+        engines_map = self._async_engines_map if use_async else self._engines_map
         try:
-            self._engines[name] = self._engines_map[schema.lower()](
-                db_url=db_url, config=config, query_cache=query_cache, readonly=readonly
+            self._engines[name] = engines_map[schema.lower()](
+                db_url=db_url,
+                config=config,
+                query_cache=query_cache,
+                readonly=readonly,
+                statement_cache_size=statement_cache_size,
+                prepared_statements=prepared_statements,
+                tuple_rows=tuple_rows,
             )
         except KeyError:
             raise ValueError("Can not find driver for schema %s" % schema)
@@ -724,6 +1200,67 @@ class EngineFactory(singletons.InheritSingleton):
             ("Can not return %s engine. Please configure EngineFactory") % name,
         )
 
+    def configure_engine_group(
+        self,
+        primary,
+        replicas,
+        name=DEFAULT_NAME,
+        **kwargs,
+    ):
+        """
+        Groups configured engines into a primary and its read replicas.
+
+        Read-only contexts of the group's name read from the replicas
+        chosen by the balancing policy of the group.
+
+        :param primary: The name of the read-write engine.
+        :param replicas: The names of the read-only engines.
+        :param name: The name of the group. Defaults to 'default'.
+        :param kwargs: Balancing, ejection and hedging options, see
+                       `engine_groups.EngineGroup`.
+        :return: The configured group.
+        :rtype: engine_groups.EngineGroup
+        :raises ValueError: If one of the engines is not configured.
+        """
+        group = engine_groups.EngineGroup(
+            primary=self.get_engine(primary),
+            replicas={replica: self.get_engine(replica) for replica in replicas},
+            **kwargs,
+        )
+        self.destroy_engine_group(name)
+        self._engine_groups[name] = group
+        return group
+
+    def get_engine_group(self, name=DEFAULT_NAME):
+        """
+        Returns an engine group by name.
+
+        :param name: The name of the group. Defaults to 'default'.
+        :return: The engine group.
+        :rtype: engine_groups.EngineGroup
+        :raises ValueError: If the group is not configured.
+        """
+        group = self._engine_groups.get(name, None)
+        if group:
+            return group
+        raise ValueError(
+            ("Can not return %s engine group. Please configure EngineFactory") % name,
+        )
+
+    def has_engine_group(self, name=DEFAULT_NAME):
+        return name in self._engine_groups
+
+    def destroy_engine_group(self, name=DEFAULT_NAME):
+        """
+        Removes the engine group with the specified name. The engines of
+        the group are kept.
+
+        :param name: The name of the group. Defaults to 'default'.
+        """
+        group = self._engine_groups.pop(name, None)
+        if group is not None:
+            group.close()
+
     def destroy_engine(self, name=DEFAULT_NAME):
         """
         Removes and destroys the engine instance associated with the specified
@@ -751,6 +1288,8 @@ class EngineFactory(singletons.InheritSingleton):
         ValueError until at least one engine is configured using
         configure_factory().
         """
+        for name in list(self._engine_groups):
+            self.destroy_engine_group(name)
         self._engines = {}
 
 
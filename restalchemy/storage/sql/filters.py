@@ -433,6 +433,14 @@ class AsIsType(types.BaseType):
         return value
 
 
+def _sorted_items(filter_list):
+    # NOTE(efrolov): Mappings are compiled in the order of names, so the
+    #                same filters give byte-identical SQL regardless of the
+    #                order they were added in. It lets the database reuse
+    #                prepared statements and plans.
+    return sorted(filter_list.items(), key=lambda item: item[0])
+
+
 def convert_filters(model, filters_root, session):
     filters_root = filters_root or filters.AND()
     if isinstance(filters_root, filters.AbstractExpression):
@@ -464,7 +472,7 @@ def iterate_filters(model, filter_list, session):
     # old style mappings (dict, multidict)
     if isinstance(filter_list, collections_abc.Mapping):
         clauses = []
-        for name, filt in filter_list.items():
+        for name, filt in _sorted_items(filter_list):
             if isinstance(model, common.TableAlias):
                 value_type = (
                     model.original.model.properties.properties[name].get_property_type()
@@ -504,3 +512,81 @@ def iterate_filters(model, filter_list, session):
         return clauses
 
     raise ValueError("Unknown type of filters: %s" % filter_list)
+
+
+def _clause_shape(filt):
+    if not isinstance(filt, filters.AbstractClause):
+        # Deprecated plain value, always converted to EQ
+        return None
+    if isinstance(filt, filters.JSONFields):
+        # NOTE(efrolov): JSON keys are inlined into the statement and the
+        #                cast depends on the value type.
+        return (
+            type(filt),
+            tuple(
+                (key, type(clause), type(clause.value))
+                for key, clause in filt.value.items()
+            ),
+        )
+    return type(filt)
+
+
+def get_filters_shape(filters_root):
+    """Return a hashable description of the statement produced by filters.
+
+    Two filter trees with the same shape compile to the same SQL text and
+    differ only in the bound values.
+    """
+    if isinstance(filters_root, filters.AbstractExpression):
+        return (type(filters_root), get_filters_shape(filters_root.clauses))
+
+    if isinstance(filters_root, tuple):
+        return tuple(get_filters_shape(cause) for cause in filters_root)
+
+    if isinstance(filters_root, collections_abc.Mapping):
+        return tuple(
+            (name, _clause_shape(filt)) for name, filt in _sorted_items(filters_root)
+        )
+
+    if filters_root is None:
+        return None
+
+    raise ValueError("Unknown type of filters: %s" % filters_root)
+
+
+def iterate_filters_values(model, filter_list, session, result=None):
+    """Collect bound values of filters in the order of `iterate_filters`.
+
+    The clauses are built without columns, so the result is equal to
+    `convert_filters(...).value` but no SQL expression is constructed.
+    """
+    result = [] if result is None else result
+
+    if isinstance(filter_list, filters.AbstractExpression):
+        return iterate_filters_values(model, filter_list.clauses, session, result)
+
+    if isinstance(filter_list, tuple):
+        for cause in filter_list:
+            iterate_filters_values(model, cause, session, result)
+        return result
+
+    if isinstance(filter_list, collections_abc.Mapping):
+        mapping = FILTER_MAPPING[session.engine.dialect.name]
+        for name, filt in _sorted_items(filter_list):
+            value_type = (
+                model.properties.properties[name].get_property_type()
+            ) or AsIsType()
+            if isinstance(filt, filters.AbstractClause):
+                clause = mapping[type(filt)](None, value_type, filt.value, session)
+            else:
+                clause = EQ(None, value_type, filt, session=session)
+            if isinstance(clause, AbstractExpression):
+                result.extend(clause.value)
+            else:
+                result.append(clause.value)
+        return result
+
+    if filter_list is None:
+        return result
+
+    raise ValueError("Unknown type of filters: %s" % filter_list)
@@ -15,22 +15,141 @@
 #    under the License.
 
 import abc
+import contextlib
+import functools
+import itertools
 
 import orjson
 
 from restalchemy.common import exceptions as common_exc
 from restalchemy.dm import filters as dm_filters
 from restalchemy.dm import models
+from restalchemy.dm import properties
+from restalchemy.dm import relationships
 from restalchemy.storage import base
 from restalchemy.storage import exceptions
 from restalchemy.storage.sql import engines
+from restalchemy.storage.sql import sessions
 from restalchemy.storage.sql import tables
 from restalchemy.storage.sql.dialect import exceptions as exc
+from restalchemy.storage.sql.dialect.query_builder import q
+
+DEFAULT_BATCH_SIZE = 1000
+COUNT_MODE_EXACT = "exact"
+COUNT_MODE_ESTIMATE = "estimate"
+COUNT_MODES = (COUNT_MODE_EXACT, COUNT_MODE_ESTIMATE)
+
+
+def _is_loadable_relationship(model_cls, name):
+    prop = model_cls.properties.properties.get(name)
+    return (
+        prop is not None
+        and issubclass(prop.get_property_class(), relationships.BaseRelationship)
+        and not prop.is_prefetch()
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_eager_relationships(model_cls):
+    """
+    Returns the names of the relationships of a model which are selected
+    while the model is restored, i.e. neither prefetched nor lazy ones.
+    """
+    return tuple(
+        name
+        for name, prop in model_cls.properties.properties.items()
+        if _is_loadable_relationship(model_cls, name)
+        and not issubclass(prop.get_property_class(), relationships.LazyRelationship)
+    )
+
+
+def _check_sync_engine(engine, model_cls):
+    # NOTE(efrolov): The session manager of the asyncio engine can't be
+    #                used by the synchronous loaders of relationships and
+    #                deferred properties.
+    if isinstance(engine, engines.AsyncPgSQLEngine):
+        raise exceptions.SyncLoadNotSupported(model=model_cls.__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def get_deferred_properties(model_cls):
+    """Returns the names of the deferred properties of a model."""
+    return frozenset(
+        name
+        for name, prop in model_cls.properties.properties.items()
+        if prop.is_deferred()
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def supports_trusted_restore(model_cls):
+    """
+    Checks whether models of a class can be restored without validation.
+
+    Models which override `restore_from_storage`, `restore`, `pour` or
+    `validate` are always restored by these methods, so their checks and
+    normalization are applied to the stored values too.
+    """
+    return (
+        model_cls.restore_from_storage.__func__
+        is SQLStorableMixin.restore_from_storage.__func__
+        and model_cls.restore.__func__ is models.Model.restore.__func__
+        and model_cls.pour is models.Model.pour
+        and model_cls.validate is models.Model.validate
+    )
+
+
+class DeferredFieldsLoader(object):
+    """
+    Loads the properties which weren't selected for a whole result set.
+
+    The first access to a property of any model of the result set selects
+    it for all the models at once, see `SQLStorableMixin.load_fields`.
+    """
+
+    def __init__(self, model_cls, rows):
+        """
+        :param model_cls: The model class with a single id property.
+        :param rows: The selected rows of the result set.
+        """
+        super(DeferredFieldsLoader, self).__init__()
+        self._model_cls = model_cls
+        self._id_name = model_cls.get_id_property_name()
+        self._ids = [row[self._id_name] for row in rows]
+        self._values = {}
+
+    def load(self, ids, name):
+        """
+        Returns the value of a property of a model of the result set.
+
+        :param ids: The stored values of the id properties of the model.
+        :param name: The name of the property.
+        """
+        values = self._values.get(name)
+        if values is None:
+            values = self._model_cls.load_fields(self._ids, name)
+            self._values[name] = values
+        id_value = self._model_cls._from_storage_value(
+            self._id_name, ids[self._id_name]
+        )
+        if id_value not in values:
+            raise exceptions.RecordNotFound(
+                model=self._model_cls,
+                filters={self._id_name: dm_filters.EQ(id_value)},
+            )
+        return values[id_value]
 
 
 class ObjectCollection(
     base.AbstractObjectCollection, base.AbstractObjectCollectionCountMixin
 ):
+    # NOTE(efrolov): Models are restored from the selected rows without
+    #                validation and defaults, see
+    #                `SQLStorableMixin.restore_from_storage_trusted` and
+    #                `supports_trusted_restore`. Set it to False in a
+    #                subclass to validate them.
+    trusted_restore = True
+
     @property
     def _table(self):
         return self.model_cls.get_table()
@@ -48,14 +167,52 @@ class ObjectCollection(
         limit=None,
         order_by=None,
         locked=False,
+        shared_cache=False,
+        load=None,
+        load_depth=1,
+        fields=None,
+        undefer=None,
     ):
+        """
+        Returns models matching the filters.
+
+        :param cache: Cache the result within the session.
+        :param shared_cache: Use the process-wide result cache which is
+            invalidated by commits writing the table. Locked selects are
+            never cached.
+        :param load: Names of relationships to load in one select per
+            relationship instead of one select per row.
+        :param load_depth: How many levels of relationships to load. The
+            related models of each level load the relationships from `load`
+            they have, so `load=["parent"], load_depth=3` loads the parents
+            of a tree up to the great-grandparents.
+        :param fields: Names of the properties to select, the id properties
+            are always selected. The other properties are loaded from the
+            database on first access, so hidden large columns aren't
+            transferred.
+        :param undefer: Names of the deferred properties to select with the
+            others. Deferred properties are loaded on first access by
+            default.
+
+        Selects by primary key equality return the model from the identity
+        map of the session if it's there, see `sessions.SessionIdentityMap`.
+        """
         with self._engine.session_manager(session=session) as s:
+            model = self._get_from_identity_map(s, filters, locked)
+            if model is not None:
+                return [model]
             if cache is True:
                 return s.cache.get_all(
                     engine=self._engine,
                     table=self._table,
                     filters=filters,
-                    fallback=self._get_all,
+                    fallback=functools.partial(
+                        self._get_all,
+                        load=load,
+                        load_depth=load_depth,
+                        fields=fields,
+                        undefer=undefer,
+                    ),
                     limit=limit,
                     order_by=order_by,
                     locked=locked,
@@ -67,9 +224,144 @@ class ObjectCollection(
                 limit=limit,
                 order_by=order_by,
                 locked=locked,
+                shared_cache=shared_cache,
+                load=load,
+                load_depth=load_depth,
+                fields=fields,
+                undefer=undefer,
             )
 
-    def _get_all(self, filters, session, limit, order_by=None, locked=False):
+    @base.error_catcher
+    def get_all_with_count(
+        self,
+        filters=None,
+        limit=None,
+        order_by=None,
+        session=None,
+        fields=None,
+    ):
+        """
+        Returns a page of models and the number of all models matching the
+        filters.
+
+        The total is selected by the same statement with COUNT(*) OVER(),
+        so a paginated list doesn't need a separate `count`.
+
+        :param fields: Names of the properties to select, see `get_all`.
+        :return: A tuple of the list of models and the total.
+        """
+        with self._engine.session_manager(session=session) as s:
+            fields = self._get_selected_fields(fields)
+            result = self._table.select(
+                engine=self._engine,
+                filters=filters,
+                limit=limit,
+                order_by=order_by,
+                session=s,
+                fields=fields,
+                with_total_count=True,
+            )
+            rows = result.rows
+            # NOTE(efrolov): There are no rows without an offset only if
+            #                nothing matches the filters.
+            total = rows[0][q.TOTAL_COUNT_FIELD] if rows else 0
+            for row in rows:
+                del row[q.TOTAL_COUNT_FIELD]
+            return self._restore_all(rows, s, fields=fields), total
+
+    def _get_from_identity_map(self, session, filters, locked):
+        identity_map = sessions.get_identity_map(session)
+        if identity_map is None or locked:
+            return None
+        return identity_map.get_by_filters(self.model_cls, filters)
+
+    def _get_selected_fields(self, fields, undefer=None):
+        """
+        Returns the fields to select with the id properties or None if the
+        default ones, all but the deferred properties, are selected.
+        """
+        if fields is None and not undefer:
+            return None
+        all_fields = self.model_cls.properties.properties.keys()
+        deferred = get_deferred_properties(self.model_cls)
+        if fields is None:
+            fields = all_fields - deferred
+        unknown = (set(fields) | set(undefer or ())) - set(all_fields)
+        if unknown:
+            raise ValueError(
+                "%s has no properties %s"
+                % (self.model_cls.__name__, ", ".join(sorted(unknown)))
+            )
+        selected = (
+            frozenset(fields)
+            | frozenset(undefer or ())
+            | frozenset(self.model_cls.id_properties)
+        )
+        return None if selected == all_fields - deferred else selected
+
+    def _restore_all(self, rows, session, fields=None, locked=False):
+        rows = self._defer_properties(rows, fields)
+        restore = self._get_restorer()
+        identity_map = sessions.get_identity_map(session)
+        if identity_map is None:
+            return [restore(**params) for params in rows]
+        # NOTE(efrolov): The models from the map take the values of the
+        #                locked rows, the changes are read-modify-write
+        #                under the lock.
+        return [
+            identity_map.merge(restore(**params), refresh=locked) for params in rows
+        ]
+
+    def _defer_properties(self, rows, fields):
+        if fields is None:
+            names = get_deferred_properties(self.model_cls)
+        else:
+            names = self.model_cls.properties.properties.keys() - fields
+        if not rows:
+            return rows
+        names = names.difference(rows[0])
+        if not names or not all(
+            name in rows[0] for name in self.model_cls.id_properties
+        ):
+            return rows
+        # NOTE(efrolov): The properties which weren't selected are loaded
+        #                for the whole result set on first access, a query
+        #                per model would be N+1 queries.
+        loader = None
+        if len(self.model_cls.id_properties) == 1:
+            loader = DeferredFieldsLoader(self.model_cls, rows).load
+        return [
+            self.model_cls.defer_properties(params, names, loader=loader)
+            for params in rows
+        ]
+
+    def _get_restorer(self):
+        if self.trusted_restore and supports_trusted_restore(self.model_cls):
+            return self.model_cls.restore_from_storage_trusted
+        return self.model_cls.restore_from_storage
+
+    def _get_all(
+        self,
+        filters,
+        session,
+        limit,
+        order_by=None,
+        locked=False,
+        shared_cache=False,
+        load=None,
+        load_depth=1,
+        fields=None,
+        undefer=None,
+    ):
+        for name in load or ():
+            if not _is_loadable_relationship(self.model_cls, name):
+                raise ValueError(
+                    "%s has no relationship %s to load"
+                    % (self.model_cls.__name__, name)
+                )
+        fields = self._get_selected_fields(fields, undefer)
+        if fields is not None and load:
+            fields = fields | frozenset(load)
         result = self._table.select(
             engine=self._engine,
             filters=filters,
@@ -77,17 +369,188 @@ class ObjectCollection(
             order_by=order_by,
             session=session,
             locked=locked,
+            shared_cache=shared_cache and not locked,
+            fields=fields,
         )
-        return [self.model_cls.restore_from_storage(**params) for params in result.rows]
+        rows = result.rows
+        if load and load_depth > 0:
+            rows = self._load_relationships(rows, session, load, load_depth)
+        return self._restore_all(rows, session, fields=fields, locked=locked)
+
+    def _load_relationships(self, rows, session, load, load_depth):
+        """
+        Replaces foreign keys of the rows with the related models.
+
+        The related models of each relationship are selected by the distinct
+        foreign keys in batches of `DEFAULT_BATCH_SIZE`. Foreign keys without
+        a related row are kept, so restoring the model fails as before.
+        """
+        rows = [dict(row) for row in rows]
+        for name in load:
+            model_cls = self.model_cls.properties.properties[name].get_property_type()
+            id_name = model_cls.get_id_property_name()
+            id_type = model_cls.properties.properties[id_name].get_property_type()
+            ids = list(
+                {
+                    id_type.from_simple_type(row[name])
+                    for row in rows
+                    if row[name] is not None
+                }
+            )
+            nested_load = [
+                nested
+                for nested in load
+                if _is_loadable_relationship(model_cls, nested)
+            ]
+            related = {}
+            for start in range(0, len(ids), DEFAULT_BATCH_SIZE):
+                for model in model_cls.objects.get_all(
+                    filters={
+                        id_name: dm_filters.In(ids[start : start + DEFAULT_BATCH_SIZE])
+                    },
+                    session=session,
+                    load=nested_load,
+                    load_depth=load_depth - 1,
+                ):
+                    related[model.get_id()] = model
+            for row in rows:
+                if row[name] is None:
+                    continue
+                model = related.get(id_type.from_simple_type(row[name]))
+                if model is not None:
+                    row[name] = model
+        return rows
+
+    @base.generator_error_catcher
+    def iter_all(
+        self,
+        filters=None,
+        order_by=None,
+        batch_size=sessions.DEFAULT_STREAM_BATCH_SIZE,
+        session=None,
+    ):
+        """Yield models lazily using a server-side (streaming) cursor.
+
+        Unlike `get_all`, the result set is never materialized, so memory
+        stays flat on huge tables. PostgreSQL uses a named cursor, MySQL an
+        unbuffered one. Rows are restored by batches of `batch_size`, the
+        related models of a batch are selected at once in the session, see
+        `get_all(load=...)`, and the deferred properties of a batch are
+        loaded for the whole batch on first access, see
+        `DeferredFieldsLoader`. An unbuffered cursor blocks its connection
+        until the end of the rows, so on MySQL the rows are streamed in a
+        separate session which doesn't see uncommitted changes of the
+        session.
+
+        :param batch_size: The number of rows fetched from the server at
+            once.
+        """
+        with self._engine.session_manager(session=session) as s:
+            with self._stream_session_manager(s) as stream_session:
+                rows = self._table.select_stream(
+                    engine=self._engine,
+                    filters=filters,
+                    session=stream_session,
+                    order_by=order_by,
+                    batch_size=batch_size,
+                )
+                load = get_eager_relationships(self.model_cls)
+                restore = self._get_restorer()
+                batch_size = batch_size or sessions.DEFAULT_STREAM_BATCH_SIZE
+                while True:
+                    batch = list(itertools.islice(rows, batch_size))
+                    if not batch:
+                        return
+                    if load:
+                        batch = self._load_relationships(batch, s, load, 1)
+                    batch = self._defer_properties(batch, fields=None)
+                    for params in batch:
+                        yield restore(**params)
+
+    def _stream_session_manager(self, session):
+        if session.stream_blocks_connection:
+            return sessions.session_manager(engine=self._engine)
+        return contextlib.nullcontext(session)
+
+    @base.generator_error_catcher
+    def iter_batches(
+        self,
+        filters=None,
+        batch_size=DEFAULT_BATCH_SIZE,
+        order_by=None,
+    ):
+        """Yield lists of models walking the table with keyset pagination.
+
+        Every batch is selected in its own short transaction with a keyset
+        predicate built from the last row of the previous batch (see
+        `dm.filters.build_keyset_filter`), so no snapshot is held between
+        batches. Rows are ordered by the optional single `order_by` column
+        and by the id column as a tiebreaker.
+
+        :param batch_size: The maximum number of models in a batch.
+        :param order_by: Dict with at most one column (besides the id) to
+            sort by, for example {"created_at": "desc"}.
+        """
+        id_name = self.model_cls.get_id_property_name()
+        sort_column, sort_direction = None, "asc"
+        for name, direction in (order_by or {}).items():
+            if name == id_name:
+                continue
+            if sort_column is not None:
+                raise ValueError("Only one column besides id can be used to sort")
+            sort_column, sort_direction = name, (direction or "asc").lower()
+        batch_order_by = {sort_column: sort_direction} if sort_column else {}
+        batch_order_by[id_name] = "asc"
+
+        batch_filters = filters
+        while True:
+            # NOTE(efrolov): Always start a new session (transaction) to
+            #                keep transactions short.
+            with sessions.session_manager(engine=self._engine) as s:
+                batch = self._get_all(
+                    filters=batch_filters,
+                    session=s,
+                    limit=batch_size,
+                    order_by=batch_order_by,
+                )
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+
+            last = batch[-1]
+            keyset_filter = dm_filters.build_keyset_filter(
+                id_name=id_name,
+                marker_id=getattr(last, id_name),
+                sort_column=sort_column,
+                sort_value=getattr(last, sort_column) if sort_column else None,
+                sort_direction=sort_direction,
+            )
+            batch_filters = (
+                dm_filters.AND(keyset_filter, filters) if filters else keyset_filter
+            )
 
     @base.error_catcher
-    def get_one(self, filters=None, session=None, cache=False, locked=False):
+    def get_one(
+        self,
+        filters=None,
+        session=None,
+        cache=False,
+        locked=False,
+        shared_cache=False,
+        fields=None,
+        undefer=None,
+    ):
         result = self.get_all(
             filters=filters,
             session=session,
             cache=cache,
             limit=2,
             locked=locked,
+            shared_cache=shared_cache,
+            fields=fields,
+            undefer=undefer,
         )
         result_len = len(result)
         if result_len == 1:
@@ -97,15 +560,45 @@ class ObjectCollection(
         else:
             raise exceptions.HasManyRecords(model=self.model_cls, filters=filters)
 
-    def get_one_or_none(self, filters=None, session=None, cache=False, locked=False):
+    def get_one_or_none(
+        self,
+        filters=None,
+        session=None,
+        cache=False,
+        locked=False,
+        shared_cache=False,
+    ):
         try:
             return self.get_one(
-                filters=filters, session=session, cache=cache, locked=locked
+                filters=filters,
+                session=session,
+                cache=cache,
+                locked=locked,
+                shared_cache=shared_cache,
             )
         except exceptions.RecordNotFound:
             return None
 
-    def _query(self, where_conditions, where_values, session, limit, order_by, locked):
+    @base.error_catcher
+    @base.dead_lock_catcher
+    def batch_update(self, models, session=None, force=False):
+        """Update models with one statement per chunk of rows.
+
+        See `batch_update` of the session for details.
+        """
+        with self._engine.session_manager(session=session) as s:
+            s.batch_update(models, force=force)
+
+    def _query(
+        self,
+        where_conditions,
+        where_values,
+        session,
+        limit,
+        order_by,
+        locked,
+        shared_cache=False,
+    ):
         result = self._table.custom_select(
             engine=self._engine,
             where_conditions=where_conditions,
@@ -114,11 +607,9 @@ class ObjectCollection(
             limit=limit,
             order_by=order_by,
             locked=locked,
+            shared_cache=shared_cache and not locked,
         )
-        return [
-            self.model_cls.restore_from_storage(**params)
-            for params in list(result.fetchall())
-        ]
+        return self._restore_all(list(result.fetchall()), session, locked=locked)
 
     @base.error_catcher
     def query(
@@ -130,11 +621,14 @@ class ObjectCollection(
         limit=None,
         order_by=None,
         locked=False,
+        shared_cache=False,
     ):
         """
 
         :param where_conditions: "NOT (bala < %s)"
         :param where_values: (5, 10,)
+        :param shared_cache: Use the process-wide result cache, see
+            `get_all`.
         """
         with self._engine.session_manager(session=session) as s:
             if cache is True:
@@ -156,12 +650,142 @@ class ObjectCollection(
                 limit=limit,
                 order_by=order_by,
                 locked=locked,
+                shared_cache=shared_cache,
             )
 
     @base.error_catcher
-    def count(self, session=None, filters=None):
+    def count(
+        self,
+        session=None,
+        filters=None,
+        shared_cache=False,
+        mode=COUNT_MODE_EXACT,
+        exact_below=None,
+    ):
+        """
+        Returns the number of models matching the filters.
+
+        :param mode: "exact" runs COUNT(*). "estimate" returns the estimate
+            of the database without scanning the table: the table
+            statistics if there are no filters and the EXPLAIN row estimate
+            otherwise. It falls back to the exact count if the database has
+            no estimate.
+        :param exact_below: Count exactly if the estimate is less than the
+            threshold, small counts are cheap and shown more often.
+        """
+        if mode not in COUNT_MODES:
+            raise ValueError("Unknown count mode %s" % mode)
         with self._engine.session_manager(session=session) as s:
-            result = self._table.count(engine=self._engine, session=s, filters=filters)
+            if mode == COUNT_MODE_ESTIMATE:
+                estimate = self._table.estimate_count(
+                    engine=self._engine, session=s, filters=filters
+                )
+                if estimate is not None and (
+                    exact_below is None or estimate >= exact_below
+                ):
+                    return estimate
+            result = self._table.count(
+                engine=self._engine,
+                session=s,
+                filters=filters,
+                shared_cache=shared_cache,
+            )
+            data = list(result.fetchall())
+            return data[0]["count"]
+
+    @base.async_error_catcher
+    async def aget_all(
+        self,
+        filters=None,
+        session=None,
+        limit=None,
+        order_by=None,
+        locked=False,
+    ):
+        """The asynchronous `get_all`, requires an asyncio engine."""
+        async with self._engine.session_manager(session=session) as s:
+            model = self._get_from_identity_map(s, filters, locked)
+            if model is not None:
+                return [model]
+            result = await self._table.aselect(
+                engine=self._engine,
+                filters=filters,
+                session=s,
+                limit=limit,
+                order_by=order_by,
+                locked=locked,
+            )
+            rows = await self._aload_relationships(result.rows, s)
+            return self._restore_all(rows, s, locked=locked)
+
+    async def _aload_relationships(self, rows, session):
+        """
+        Replaces foreign keys of the rows with the related models.
+
+        The same as `_load_relationships` for all the relationships which
+        are selected while restoring, as they can't be selected
+        synchronously with the asyncio engine. The related models load
+        their relationships the same way.
+        """
+        load = get_eager_relationships(self.model_cls)
+        if not load or not rows:
+            return rows
+        rows = [dict(row) for row in rows]
+        for name in load:
+            model_cls = self.model_cls.properties.properties[name].get_property_type()
+            id_name = model_cls.get_id_property_name()
+            id_type = model_cls.properties.properties[id_name].get_property_type()
+            ids = list(
+                {
+                    id_type.from_simple_type(row[name])
+                    for row in rows
+                    if row[name] is not None
+                }
+            )
+            related = {}
+            for start in range(0, len(ids), DEFAULT_BATCH_SIZE):
+                for model in await model_cls.objects.aget_all(
+                    filters={
+                        id_name: dm_filters.In(ids[start : start + DEFAULT_BATCH_SIZE])
+                    },
+                    session=session,
+                ):
+                    related[model.get_id()] = model
+            for row in rows:
+                if row[name] is None:
+                    continue
+                value_id = id_type.from_simple_type(row[name])
+                if value_id not in related:
+                    raise exceptions.RecordNotFound(
+                        model=model_cls, filters={id_name: dm_filters.EQ(value_id)}
+                    )
+                row[name] = related[value_id]
+        return rows
+
+    @base.async_error_catcher
+    async def aget_one(self, filters=None, session=None, locked=False):
+        """The asynchronous `get_one`, requires an asyncio engine."""
+        result = await self.aget_all(
+            filters=filters,
+            session=session,
+            limit=2,
+            locked=locked,
+        )
+        result_len = len(result)
+        if result_len == 1:
+            return result[0]
+        elif result_len == 0:
+            raise exceptions.RecordNotFound(model=self.model_cls, filters=filters)
+        else:
+            raise exceptions.HasManyRecords(model=self.model_cls, filters=filters)
+
+    @base.async_error_catcher
+    async def acount(self, session=None, filters=None):
+        """The asynchronous `count`, requires an asyncio engine."""
+        async with self._engine.session_manager(session=session) as s:
+            result = await self._table.acount(
+                engine=self._engine, session=s, filters=filters
+            )
             data = list(result.fetchall())
             return data[0]["count"]
 
@@ -201,18 +825,157 @@ class SQLStorableMixin(base.AbstractStorableMixin, metaclass=abc.ABCMeta):
     def _get_engine(cls):
         return engines.engine_factory.get_engine()
 
+    def _add_to_identity_map(self, session):
+        identity_map = sessions.get_identity_map(session)
+        if identity_map is not None:
+            identity_map.add(self)
+
+    def _remove_from_identity_map(self, session):
+        identity_map = sessions.get_identity_map(session)
+        if identity_map is not None:
+            identity_map.remove(self)
+
+    @classmethod
+    def defer_properties(cls, params, names, loader=None):
+        """
+        Returns the stored values with the loaders of the properties.
+
+        :param params: The stored values with the id properties.
+        :param names: Names of the properties to load on first access.
+        :param loader: A callable with the arguments of `load_field` which
+            returns the value, `load_field` by default.
+        """
+        loader = loader or cls.load_field
+        params = dict(params)
+        ids = {name: params[name] for name in cls.id_properties}
+        for name in names:
+            params[name] = properties.DeferredValue(
+                functools.partial(loader, ids, name)
+            )
+        return params
+
     @classmethod
     def restore_from_storage(cls, **kwargs):
+        obj = cls.restore(**cls._get_model_format(kwargs))
+        obj._saved = True
+        return obj
+
+    @classmethod
+    def restore_from_storage_trusted(cls, **kwargs):
+        """
+        Restores a model from the values just read from the storage.
+
+        The values are converted the same way as by `restore_from_storage`,
+        but they are set without validation, see `Model.restore_trusted`.
+        """
+        obj = cls.restore_trusted(**cls._get_model_format(kwargs))
+        obj._saved = True
+        return obj
+
+    @classmethod
+    def _get_model_format(cls, kwargs):
+        deferred = get_deferred_properties(cls).difference(kwargs)
+        if deferred and all(name in kwargs for name in cls.id_properties):
+            kwargs = cls.defer_properties(kwargs, deferred)
         model_format = {}
         for name, value in kwargs.items():
-            model_format[name] = (
-                cls.properties.properties[name]
-                .get_property_type()
-                .from_simple_type(value)
+            prop = cls.properties.properties[name]
+            prop_type = prop.get_property_type()
+            if isinstance(value, properties.DeferredValue):
+                model_format[name] = value
+            elif (
+                value is not None
+                and issubclass(
+                    prop.get_property_class(), relationships.LazyRelationship
+                )
+                and not isinstance(value, prop_type)
+            ):
+                model_format[name] = prop_type.to_lazy_value(value)
+            else:
+                model_format[name] = prop_type.from_simple_type(value)
+        return model_format
+
+    @classmethod
+    def _from_storage_value(cls, name, value):
+        return (
+            cls.properties.properties[name].get_property_type().from_simple_type(value)
+        )
+
+    @classmethod
+    @base.error_catcher
+    def load_field(cls, ids, name):
+        """
+        Selects a property of a stored model.
+
+        It's the loader of the deferred properties and the properties which
+        weren't selected, see the `fields` argument of
+        `ObjectCollection.get_all`.
+
+        :param ids: The stored values of the id properties.
+        :param name: The name of the property.
+        :return: The value of the property.
+        """
+        engine = cls._get_engine()
+        _check_sync_engine(engine, cls)
+        filters = {
+            id_name: dm_filters.EQ(cls._from_storage_value(id_name, value))
+            for id_name, value in ids.items()
+        }
+        with engine.session_manager() as s:
+            rows = (
+                cls.get_table()
+                .select(
+                    engine=engine,
+                    filters=filters,
+                    session=s,
+                    limit=1,
+                    fields=frozenset(ids) | {name},
+                )
+                .rows
             )
-        obj = cls.restore(**model_format)
-        obj._saved = True
-        return obj
+        if not rows:
+            raise exceptions.RecordNotFound(model=cls, filters=filters)
+        return cls._from_storage_value(name, rows[0][name])
+
+    @classmethod
+    @base.error_catcher
+    def load_fields(cls, ids, name):
+        """
+        Selects a property of stored models with a single id property.
+
+        The models are selected by their ids in batches of
+        `DEFAULT_BATCH_SIZE`, see `DeferredFieldsLoader`.
+
+        :param ids: The stored values of the id property.
+        :param name: The name of the property.
+        :return: The values of the property by the ids.
+        """
+        engine = cls._get_engine()
+        _check_sync_engine(engine, cls)
+        id_name = cls.get_id_property_name()
+        ids = [cls._from_storage_value(id_name, value) for value in ids]
+        values = {}
+        with engine.session_manager() as s:
+            for start in range(0, len(ids), DEFAULT_BATCH_SIZE):
+                rows = (
+                    cls.get_table()
+                    .select(
+                        engine=engine,
+                        filters={
+                            id_name: dm_filters.In(
+                                ids[start : start + DEFAULT_BATCH_SIZE]
+                            )
+                        },
+                        session=s,
+                        fields=frozenset((id_name, name)),
+                    )
+                    .rows
+                )
+                for row in rows:
+                    values[cls._from_storage_value(id_name, row[id_name])] = (
+                        cls._from_storage_value(name, row[name])
+                    )
+        return values
 
     @base.error_catcher
     @base.dead_lock_catcher
@@ -229,6 +992,36 @@ class SQLStorableMixin(base.AbstractStorableMixin, metaclass=abc.ABCMeta):
             except exc.Conflict as e:
                 raise exceptions.ConflictRecords(model=self, msg=str(e))
             self._saved = True
+            self._add_to_identity_map(s)
+
+    @base.error_catcher
+    @base.dead_lock_catcher
+    def upsert(self, session=None, conflict_columns=None, update_columns=None):
+        """Insert the model or update the existing row in one statement.
+
+        :param conflict_columns: The columns of the unique key which detects
+            the existing row. Defaults to the primary key. MySQL detects it
+            by any unique key of the table.
+        :param update_columns: The columns to be updated for the existing
+            row. Defaults to all columns except the conflict ones.
+        """
+        with self._get_engine().session_manager(session=session) as s:
+            table = self.get_table()
+            column_names = table.get_column_names(session=s)
+            data = self._get_prepared_data()
+            try:
+                table.upsert(
+                    engine=self._get_engine(),
+                    rows=[tuple(data[name] for name in column_names)],
+                    session=s,
+                    conflict_columns=conflict_columns,
+                    update_columns=update_columns,
+                )
+            except exc.Conflict as e:
+                raise exceptions.ConflictRecords(model=self, msg=str(e))
+            self._saved = True
+            # NOTE(efrolov): The stored row may differ from the model.
+            self._remove_from_identity_map(s)
 
     def save(self, session=None):
         # TODO(efrolov): Add filters parameters.
@@ -245,12 +1038,13 @@ class SQLStorableMixin(base.AbstractStorableMixin, metaclass=abc.ABCMeta):
                     result = self.get_table().update(
                         engine=self._get_engine(),
                         ids=self._get_prepared_data(self.get_id_properties()),
-                        data=self._get_prepared_data(self.get_data_properties()),
+                        data=self._get_prepared_data(self.get_loaded_data_properties()),
                         session=s,
                     )
                 except exc.Conflict as e:
                     raise exceptions.ConflictRecords(model=self, msg=str(e))
                 if result.get_count() == 0:
+                    self._remove_from_identity_map(s)
                     _filters = {
                         name: dm_filters.EQ(prop.value)
                         for name, prop in self.get_id_properties().items()
@@ -258,12 +1052,27 @@ class SQLStorableMixin(base.AbstractStorableMixin, metaclass=abc.ABCMeta):
                     type(self).objects.get_one(filters=_filters, session=s)
                 if result.get_count() > 1:
                     raise exceptions.MultipleUpdatesDetected(model=self, filters={})
+                self._add_to_identity_map(s)
+
+    def get_loaded_data_properties(self):
+        """
+        Returns the data properties except the deferred ones which aren't
+        loaded yet.
+        """
+        # NOTE(efrolov): Properties which aren't loaded can't be changed,
+        #                don't load them to write back.
+        return {
+            name: prop
+            for name, prop in self.get_data_properties().items()
+            if not isinstance(prop, properties.DeferredProperty)
+        }
 
     @base.error_catcher
     @base.dead_lock_catcher
     def delete(self, session=None):
         # TODO(efrolov): Add filters parameters.
         with self._get_engine().session_manager(session=session) as s:
+            self._remove_from_identity_map(s)
             result = self.get_table().delete(
                 engine=self._get_engine(),
                 ids=self._get_prepared_data(self.get_id_properties()),
@@ -282,11 +1091,34 @@ class SQLStorableMixin(base.AbstractStorableMixin, metaclass=abc.ABCMeta):
         # Allow to filter by id without full model
         return id_type.to_simple_type(value)
 
+    @classmethod
+    def to_lazy_value(cls, value):
+        """
+        Returns a reference to the model which is selected on first access.
+
+        The model is selected in the current session of the engine, so it
+        comes from the identity map of the session if it's there.
+
+        :param value: The id of the model as it's stored.
+        :rtype: relationships.LazyValue
+        """
+        for name in cls.id_properties:
+            value_id = (
+                cls.properties.properties[name]
+                .get_property_type()
+                .from_simple_type(value)
+            )
+            return relationships.LazyValue(value_id, cls.from_simple_type)
+
     @classmethod
     @base.dead_lock_catcher
     def from_simple_type(cls, value):
         if value is None:
             return None
+        if isinstance(value, cls):
+            # NOTE(efrolov): The related model is loaded already, see
+            #                `ObjectCollection.get_all(load=...)`.
+            return value
         if isinstance(value, base.PrefetchResult):
             for name in cls.id_properties.keys():
                 if value[name]:
@@ -301,6 +1133,7 @@ class SQLStorableMixin(base.AbstractStorableMixin, metaclass=abc.ABCMeta):
                 .from_simple_type(value)
             )
             engine = engines.engine_factory.get_engine()
+            _check_sync_engine(engine, cls)
             return cls.objects.get_one(
                 filters={name: dm_filters.EQ(value)}, cache=engine.query_cache
             )
@@ -312,15 +1145,23 @@ class SQLStorableWithJSONFieldsMixin(SQLStorableMixin, metaclass=abc.ABCMeta):
     __jsonfields__ = None
 
     @classmethod
-    def restore_from_storage(cls, **kwargs):
+    def _get_model_format(cls, kwargs):
         if cls.__jsonfields__ is None:
             raise UndefinedAttribute(attr_name="__jsonfields__")
         kwargs = kwargs.copy()
         for field in cls.__jsonfields__:
             # Some databases' clients support JSON fields natively.
-            if isinstance(kwargs[field], str):
+            if isinstance(kwargs.get(field), str):
                 kwargs[field] = orjson.loads(kwargs[field])
-        return super(SQLStorableWithJSONFieldsMixin, cls).restore_from_storage(**kwargs)
+        return super(SQLStorableWithJSONFieldsMixin, cls)._get_model_format(kwargs)
+
+    @classmethod
+    def _from_storage_value(cls, name, value):
+        if name in (cls.__jsonfields__ or ()) and isinstance(value, str):
+            value = orjson.loads(value)
+        return super(SQLStorableWithJSONFieldsMixin, cls)._from_storage_value(
+            name, value
+        )
 
     def _get_prepared_data(self, properties=None):
         if self.__jsonfields__ is None:
@@ -0,0 +1,149 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import bisect
+import threading
+import time
+
+# Upper bounds in seconds of the buckets of the checkout wait histogram.
+DEFAULT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+DEFAULT_METRIC_PREFIX = "restalchemy.db.pool"
+
+
+class PoolStats(object):
+    """Thread-safe counters of a connection pool.
+
+    Engines record checkouts, checkins and connection events here. The
+    state of the pool itself (its size and idle connections) is added by
+    the engine in `AbstractEngine.get_pool_stats`.
+    """
+
+    def __init__(self, wait_buckets=DEFAULT_WAIT_BUCKETS):
+        super(PoolStats, self).__init__()
+        self._wait_buckets = tuple(sorted(wait_buckets))
+        self._lock = threading.Lock()
+        self._connections = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._checkouts = 0
+            self._checkins = 0
+            self._exhausted = 0
+            self._reconnects = 0
+            self._wait_total = 0.0
+            self._wait_max = 0.0
+            self._wait_histogram = [0] * (len(self._wait_buckets) + 1)
+            self._lifetime_count = 0
+            self._lifetime_total = 0.0
+            self._lifetime_max = 0.0
+
+    def record_checkout(self, wait_time):
+        index = bisect.bisect_left(self._wait_buckets, wait_time)
+        with self._lock:
+            self._checkouts += 1
+            self._wait_total += wait_time
+            self._wait_max = max(self._wait_max, wait_time)
+            self._wait_histogram[index] += 1
+
+    def record_checkin(self):
+        with self._lock:
+            self._checkins += 1
+
+    def record_exhausted(self):
+        with self._lock:
+            self._exhausted += 1
+
+    def record_connection_closed(self, lifetime):
+        with self._lock:
+            self._lifetime_count += 1
+            self._lifetime_total += lifetime
+            self._lifetime_max = max(self._lifetime_max, lifetime)
+
+    def record_reconnect(self, lifetime):
+        with self._lock:
+            self._reconnects += 1
+        self.record_connection_closed(lifetime)
+
+    def track_connection(self, key, connection_id):
+        """
+        Detects reconnects of a connection object reused by the pool.
+
+        :param key: A stable key of the connection object.
+        :param connection_id: The server id of the current connection.
+        """
+        now = time.monotonic()
+        with self._lock:
+            previous = self._connections.get(key)
+            self._connections[key] = (
+                (connection_id, now)
+                if previous is None or previous[0] != connection_id
+                else previous
+            )
+        if previous is not None and previous[0] != connection_id:
+            self.record_reconnect(now - previous[1])
+
+    def get_wait_histogram(self):
+        """
+        Returns the number of checkouts by the upper bound of their wait.
+
+        :rtype: dict
+        """
+        bounds = [str(bound) for bound in self._wait_buckets] + ["inf"]
+        with self._lock:
+            return dict(zip(bounds, self._wait_histogram))
+
+    def get_stats(self):
+        """
+        Returns the counters of the pool.
+
+        :return: A dictionary with `checkouts`, `in_use`, `pool_exhausted`,
+            `reconnects`, the checkout wait and the connection lifetime.
+        :rtype: dict
+        """
+        with self._lock:
+            stats = {
+                "checkouts": self._checkouts,
+                "in_use": self._checkouts - self._checkins,
+                "pool_exhausted": self._exhausted,
+                "reconnects": self._reconnects,
+                "checkout_wait_total": self._wait_total,
+                "checkout_wait_max": self._wait_max,
+                "connection_lifetime_count": self._lifetime_count,
+                "connection_lifetime_total": self._lifetime_total,
+                "connection_lifetime_max": self._lifetime_max,
+            }
+        stats["checkout_wait_histogram"] = self.get_wait_histogram()
+        return stats
+
+
+def send_stats(metric_sender, prefix, stats):
+    """
+    Pushes pool stats to a metric sender.
+
+    Nested dictionaries, like the wait histogram, are sent as one metric
+    per key.
+
+    :param metric_sender: An object with a `send_metric(name, value)`
+        method, like the one `HttpMetricsMiddleware` takes.
+    :param prefix: The prefix of the metric names.
+    :param stats: A dictionary returned by `AbstractEngine.get_pool_stats`.
+    """
+    for name, value in stats.items():
+        if isinstance(value, dict):
+            send_stats(metric_sender, "%s.%s" % (prefix, name), value)
+        else:
+            metric_sender.send_metric("%s.%s" % (prefix, name), value)
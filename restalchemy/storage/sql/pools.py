@@ -0,0 +1,328 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import logging
+import random
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import errors as mysql_errors
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MIN_SIZE = 1
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_WAITING = 0
+DEFAULT_MAX_LIFETIME = 3600.0
+DEFAULT_MAX_IDLE = 600.0
+
+# The keys of the engine config which configure the pool rather than the
+# connections.
+POOL_CONFIG_KEYS = frozenset(
+    (
+        "min_size",
+        "max_size",
+        "timeout",
+        "max_waiting",
+        "max_lifetime",
+        "max_idle",
+        "check",
+    )
+)
+
+
+class PoolTimeout(mysql_errors.PoolError):
+    pass
+
+
+class TooManyRequests(mysql_errors.PoolError):
+    pass
+
+
+class PoolClosed(mysql_errors.PoolError):
+    pass
+
+
+class _PooledConnection(object):
+    def __init__(self, conn, max_lifetime):
+        super(_PooledConnection, self).__init__()
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.returned_at = self.created_at
+        # NOTE(efrolov): Reduce the lifetime by a random 10% to avoid mass
+        #                eviction, as psycopg_pool does.
+        self.expires_at = self.created_at + max_lifetime * random.uniform(0.9, 1.0)
+
+
+class BlockingMySQLPool(object):
+    """A MySQL connection pool which queues requests.
+
+    Unlike `mysql.connector.pooling.MySQLConnectionPool`, the pool waits up
+    to `timeout` seconds for a connection instead of failing immediately
+    when all connections are in use. The pool grows from `min_size` up to
+    `max_size` connections, validates idle connections on checkout and
+    replaces connections older than `max_lifetime` or idle for more than
+    `max_idle` seconds. The knobs mirror the ones of `psycopg_pool`.
+    """
+
+    def __init__(
+        self,
+        connect_kwargs,
+        min_size=DEFAULT_MIN_SIZE,
+        max_size=None,
+        timeout=DEFAULT_TIMEOUT,
+        max_waiting=DEFAULT_MAX_WAITING,
+        max_lifetime=DEFAULT_MAX_LIFETIME,
+        max_idle=DEFAULT_MAX_IDLE,
+        check=True,
+        on_close=None,
+    ):
+        """
+        Initializes the pool and opens `min_size` connections.
+
+        :param connect_kwargs: Arguments of `mysql.connector.connect`.
+        :param min_size: The number of connections the pool keeps open.
+        :param max_size: The maximum number of connections. Defaults to
+            `min_size`.
+        :param timeout: The maximum time in seconds to wait for a
+            connection.
+        :param max_waiting: The maximum number of waiting requests. 0 means
+            no limit.
+        :param max_lifetime: The time in seconds after which a connection
+            is replaced.
+        :param max_idle: The time in seconds after which an idle connection
+            above `min_size` is closed.
+        :param check: Whether idle connections are pinged on checkout.
+        :param on_close: A callable which accepts the lifetime in seconds of
+            each closed connection.
+        """
+        super(BlockingMySQLPool, self).__init__()
+        max_size = min_size if max_size is None else max_size
+        if max_size < min_size or max_size < 1:
+            raise ValueError(
+                "max_size (%s) must be positive and not less than min_size (%s)"
+                % (max_size, min_size)
+            )
+        self._connect_kwargs = connect_kwargs
+        self._min_size = min_size
+        self._max_size = max_size
+        self._timeout = timeout
+        self._max_waiting = max_waiting
+        self._max_lifetime = max_lifetime
+        self._max_idle = max_idle
+        self._check = check
+        self._on_close = on_close
+        self._cond = threading.Condition()
+        self._idle = collections.deque()
+        self._in_use = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._stats = collections.Counter()
+
+        for _ in range(min_size):
+            with self._cond:
+                self._size += 1
+            self._idle.append(self._connect())
+
+    @property
+    def pool_size(self):
+        return self._size
+
+    def _connect(self):
+        try:
+            conn = mysql.connector.connect(**self._connect_kwargs)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._stats["connections_errors"] += 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["connections_num"] += 1
+        return _PooledConnection(conn, self._max_lifetime)
+
+    def _close(self, pooled):
+        try:
+            pooled.conn.close()
+        except Exception:
+            LOG.debug("Failed to close the connection", exc_info=True)
+        if self._on_close is not None:
+            self._on_close(time.monotonic() - pooled.created_at)
+
+    def _pop_expired(self, now):
+        # NOTE(efrolov): The method must be called under the lock. The
+        #                oldest returned connections are at the left.
+        expired = []
+        for pooled in list(self._idle):
+            idle_expired = (
+                self._size - len(expired) > self._min_size
+                and now - pooled.returned_at > self._max_idle
+            )
+            if idle_expired or pooled.expires_at <= now:
+                self._idle.remove(pooled)
+                expired.append(pooled)
+        self._size -= len(expired)
+        return expired
+
+    def _is_valid(self, pooled):
+        if not self._check:
+            return True
+        try:
+            return pooled.conn.is_connected()
+        except Exception:
+            return False
+
+    def getconn(self, timeout=None):
+        """
+        Checks out a connection, waiting if all connections are in use.
+
+        :param timeout: Overrides the timeout of the pool.
+        :return: A MySQL connection.
+        :raises PoolTimeout: If no connection is available in time.
+        :raises TooManyRequests: If there are `max_waiting` requests
+            waiting already.
+        :raises PoolClosed: If the pool is closed.
+        """
+        timeout = self._timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            pooled, to_close = self._acquire(deadline)
+            for expired in to_close:
+                self._close(expired)
+            if pooled is None:
+                pooled = self._connect()
+            elif not self._is_valid(pooled):
+                LOG.warning("Discard the broken connection %r", pooled.conn)
+                with self._cond:
+                    self._size -= 1
+                    self._stats["connections_lost"] += 1
+                self._close(pooled)
+                continue
+            with self._cond:
+                self._in_use[id(pooled.conn)] = pooled
+            return pooled.conn
+
+    def _acquire(self, deadline):
+        """
+        Returns an idle connection or None if a new one should be opened.
+        """
+        with self._cond:
+            self._stats["requests_num"] += 1
+            queued = False
+            while True:
+                if self._closed:
+                    raise PoolClosed("The pool is closed")
+                to_close = self._pop_expired(time.monotonic())
+                if self._idle:
+                    return self._idle.pop(), to_close
+                if self._size < self._max_size:
+                    self._size += 1
+                    return None, to_close
+                if self._max_waiting and self._waiting >= self._max_waiting:
+                    self._stats["requests_errors"] += 1
+                    raise TooManyRequests(
+                        "The pool already has %d requests waiting" % self._waiting
+                    )
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["requests_errors"] += 1
+                    raise PoolTimeout(
+                        "Couldn't get a connection after %.2f sec" % self._timeout
+                    )
+                if not queued:
+                    queued = True
+                    self._stats["requests_queued"] += 1
+                started_at = time.monotonic()
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                    self._stats["requests_wait_ms"] += int(
+                        (time.monotonic() - started_at) * 1000
+                    )
+
+    def putconn(self, conn):
+        """
+        Returns a connection to the pool.
+
+        An open transaction is rolled back and the session is reset, so
+        user variables, temporary tables and prepared statements don't leak
+        to the next borrower. Broken, expired connections and connections
+        returned to the closed pool are closed.
+
+        :param conn: A connection checked out from the pool.
+        """
+        with self._cond:
+            pooled = self._in_use.pop(id(conn), None)
+        if pooled is None:
+            raise ValueError("The connection %r doesn't belong to the pool" % conn)
+
+        discard = self._closed or pooled.expires_at <= time.monotonic()
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.reset_session()
+            except Exception:
+                LOG.warning("Discard the broken connection %r", conn, exc_info=True)
+                discard = True
+
+        with self._cond:
+            if discard:
+                self._size -= 1
+                self._stats["returns_bad"] += 1
+            else:
+                pooled.returned_at = time.monotonic()
+                self._idle.append(pooled)
+            self._cond.notify()
+        if discard:
+            self._close(pooled)
+
+    def get_stats(self):
+        """
+        Returns the state and counters of the pool.
+
+        The keys are the same as the ones of `psycopg_pool` stats.
+
+        :rtype: dict
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update(
+                {
+                    "pool_min": self._min_size,
+                    "pool_max": self._max_size,
+                    "pool_size": self._size,
+                    "pool_available": len(self._idle),
+                    "requests_waiting": self._waiting,
+                }
+            )
+        return stats
+
+    def close(self):
+        """Closes the idle connections and the pool."""
+        with self._cond:
+            self._closed = True
+            to_close = list(self._idle)
+            self._idle.clear()
+            self._size -= len(to_close)
+            self._cond.notify_all()
+        for pooled in to_close:
+            self._close(pooled)
@@ -0,0 +1,234 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import copy
+import threading
+import time
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = 60.0
+
+
+class CachedResult(object):
+    """Rows of a cached select, compatible with the process results."""
+
+    def __init__(self, rows):
+        super(CachedResult, self).__init__()
+        self._rows = rows
+
+    @property
+    def rows(self):
+        return self._rows
+
+    def get_rows(self):
+        return self._rows
+
+    def fetchall(self):
+        return iter(self._rows)
+
+
+class ResultCache(object):
+    """A process-wide LRU cache of select results with a TTL.
+
+    Entries are invalidated by table: sessions collect the tables they
+    write and call `invalidate_tables` on commit. A result is kept under
+    all the tables it's selected from, e.g. the tables of the prefetched
+    relationships joined by a select. Every invalidation starts
+    a new epoch, the generation of a table is the epoch of its last
+    invalidation. A result selected before an invalidation of its table is
+    not stored, so a select racing with a commit can't put stale rows into
+    the cache. A result isn't stored either if the table is invalidated
+    after the transaction of the session has started, as the snapshot of a
+    repeatable read transaction can be older than the commit.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
+        super(ResultCache, self).__init__()
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._keys_by_table = collections.defaultdict(set)
+        self._generations = collections.Counter()
+        self._epoch = 0
+        self._stats = collections.Counter()
+        self.configure(max_size=max_size, ttl=ttl)
+
+    def configure(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
+        """
+        Sets the limits of the cache and clears it.
+
+        :param max_size: The maximum number of cached results.
+        :param ttl: The time in seconds a result is kept.
+        """
+        with self._lock:
+            self._max_size = max_size
+            self._ttl = ttl
+        self.clear()
+
+    def _remove(self, key):
+        # NOTE(efrolov): The method must be called under the lock.
+        table_names, _, _ = self._entries.pop(key)
+        for table_name in table_names:
+            keys = self._keys_by_table[table_name]
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_table[table_name]
+
+    def get(self, key):
+        """
+        Returns a cached value or None.
+
+        :param key: A hashable key of the result.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[2]
+
+    def get_generation(self, table_names):
+        """
+        Returns the generation of the tables, the latest one of them.
+
+        :param table_names: An iterable of table names.
+        """
+        with self._lock:
+            return max(
+                (self._generations[table_name] for table_name in table_names),
+                default=0,
+            )
+
+    def get_epoch(self):
+        """Returns the number of the current epoch of invalidations."""
+        with self._lock:
+            return self._epoch
+
+    def set(self, key, table_names, value, generation=None):
+        """
+        Stores a value.
+
+        :param key: A hashable key of the result.
+        :param table_names: An iterable of the tables the result is selected
+            from.
+        :param value: The value to store.
+        :param generation: The generation of the tables before the value was
+            selected, the value isn't stored if any of the tables is
+            invalidated since then.
+        """
+        table_names = frozenset(table_names)
+        with self._lock:
+            if self._max_size <= 0:
+                return
+            if generation is not None and any(
+                self._generations[table_name] > generation for table_name in table_names
+            ):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (table_names, time.monotonic() + self._ttl, value)
+            for table_name in table_names:
+                self._keys_by_table[table_name].add(key)
+            while len(self._entries) > self._max_size:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate_tables(self, table_names):
+        """
+        Removes all results of the tables.
+
+        :param table_names: An iterable of table names.
+        """
+        with self._lock:
+            self._epoch += 1
+            for table_name in table_names:
+                self._generations[table_name] = self._epoch
+                self._stats["invalidations"] += 1
+                for key in list(self._keys_by_table.get(table_name, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_table.clear()
+            self._stats.clear()
+
+    def get_stats(self):
+        """
+        Returns the statistics of the cache.
+
+        :return: A dictionary with `hits`, `misses`, `evictions`,
+            `expirations`, `invalidations` and the current `size`.
+        :rtype: dict
+        """
+        with self._lock:
+            stats = {
+                name: self._stats[name]
+                for name in (
+                    "hits",
+                    "misses",
+                    "evictions",
+                    "expirations",
+                    "invalidations",
+                )
+            }
+            stats["size"] = len(self._entries)
+        return stats
+
+    def execute(self, engine, session, table_names, command):
+        """
+        Returns the result of a select command from the cache or executes it.
+
+        The cache is bypassed if the session has written any of the tables,
+        so the session sees its own uncommitted changes. Rows are copied on every
+        hit, so models restored from them don't share mutable values. The
+        selected rows aren't stored if a table is invalidated since the
+        transaction of the session has started, see `cache_epoch` of the
+        sessions.
+
+        :param engine: The engine the command is executed with.
+        :param session: The session the command is executed in.
+        :param table_names: The names of the tables the command selects
+            from, see `get_table_names` of the commands.
+        :param command: A select, count or custom select command.
+        :return: A result with `rows` and `fetchall`.
+        """
+        if not session.changed_tables.isdisjoint(table_names):
+            return command.execute()
+
+        key = (
+            engine.db_host,
+            engine.db_port,
+            engine.db_name,
+            command.get_statement(),
+            repr(tuple(command.get_values())),
+        )
+        rows = self.get(key)
+        if rows is None:
+            generation = self.get_generation(table_names)
+            rows = list(command.execute().rows)
+            if generation <= session.cache_epoch:
+                self.set(key, table_names, rows, generation)
+        return CachedResult(copy.deepcopy(rows))
+
+
+shared_cache = ResultCache()
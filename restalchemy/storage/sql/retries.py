@@ -0,0 +1,331 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import functools
+import logging
+import random
+import threading
+import time
+
+from restalchemy.storage import exceptions
+from restalchemy.storage.sql import engines
+from restalchemy.storage.sql import sessions
+from restalchemy.storage.sql.dialect import exceptions as dialect_exc
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF = 0.05
+DEFAULT_MAX_BACKOFF = 2.0
+DEFAULT_METRIC_PREFIX = "restalchemy.db.transaction"
+
+# Deadlock found when trying to get lock.
+MYSQL_DEADLOCK_ERRNO = 1213
+# deadlock_detected and serialization_failure.
+RETRYABLE_SQLSTATES = frozenset(("40P01", "40001"))
+
+
+def is_retryable(error):
+    """
+    Checks whether a transaction failed by the error can be run again.
+
+    Deadlocks and serialization failures are retryable. The error is
+    looked up through the chain of the wrapping exceptions, so storage
+    exceptions raised from driver errors are detected as well.
+
+    :param error: The exception raised by the transaction.
+    :rtype: bool
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (exceptions.DeadLock, dialect_exc.DeadLock)):
+            return True
+        if getattr(error, "errno", None) == MYSQL_DEADLOCK_ERRNO:
+            return True
+        if getattr(error, "sqlstate", None) in RETRYABLE_SQLSTATES:
+            return True
+        error = getattr(error, "caused", None) or error.__cause__ or error.__context__
+    return False
+
+
+class RetryStats(object):
+    """Thread-safe counters of retried transactions."""
+
+    def __init__(self):
+        super(RetryStats, self).__init__()
+        self._lock = threading.Lock()
+        self._metric_sender = None
+        self._metric_prefix = DEFAULT_METRIC_PREFIX
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._transactions = 0
+            self._retries = 0
+            self._retried = 0
+            self._exhausted = 0
+
+    def set_metric_sender(self, metric_sender, prefix=None):
+        """
+        Sets the sender of the retry metrics.
+
+        The sender gets `<prefix>.retries` on every retry and
+        `<prefix>.exhausted` when a transaction fails after the last attempt.
+
+        :param metric_sender: An object with a `send_metric(name, value)`
+            method, like the one `HttpMetricsMiddleware` takes. None
+            disables sending.
+        :param prefix: The prefix of the metric names.
+        """
+        self._metric_sender = metric_sender
+        self._metric_prefix = prefix or DEFAULT_METRIC_PREFIX
+
+    def _send_metric(self, name, value):
+        if self._metric_sender is None:
+            return
+        try:
+            self._metric_sender.send_metric(
+                "%s.%s" % (self._metric_prefix, name), value
+            )
+        except Exception:
+            LOG.exception("Failed to send the %s transaction metric", name)
+
+    def record_transaction(self):
+        with self._lock:
+            self._transactions += 1
+
+    def record_retry(self, attempt):
+        with self._lock:
+            self._retries += 1
+            if attempt == 1:
+                self._retried += 1
+        self._send_metric("retries", 1)
+
+    def record_exhausted(self):
+        with self._lock:
+            self._exhausted += 1
+        self._send_metric("exhausted", 1)
+
+    def get_stats(self):
+        """
+        Returns the counters of retried transactions.
+
+        :return: A dictionary with the number of `transactions`, `retries`,
+            `retried_transactions` and `exhausted` transactions which failed
+            after all attempts.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "transactions": self._transactions,
+                "retries": self._retries,
+                "retried_transactions": self._retried,
+                "exhausted": self._exhausted,
+            }
+
+
+retry_stats = RetryStats()
+
+
+class Attempt(object):
+    """A context manager of one attempt of a retryable transaction.
+
+    The context opens a session and commits it on exit. A retryable error
+    is suppressed unless it's the last attempt, so the loop over the
+    attempts goes on.
+    """
+
+    def __init__(self, transaction, number):
+        super(Attempt, self).__init__()
+        self.number = number
+        self.failed = False
+        self._transaction = transaction
+        self._cm = None
+
+    def __enter__(self):
+        self._cm = self._transaction.session_manager()
+        return self._cm.__enter__()
+
+    def _retry_on(self, error):
+        if not self._transaction.should_retry(error, self.number):
+            return False
+        self.failed = True
+        return True
+
+    def __exit__(self, exc_type, exc_value, tb):
+        try:
+            if self._cm.__exit__(exc_type, exc_value, tb):
+                return True
+        except Exception as e:
+            # NOTE(efrolov): The commit has failed or the session manager
+            #                has converted the error.
+            if not self._retry_on(e):
+                raise
+            return True
+        if not isinstance(exc_value, Exception):
+            return False
+        return self._retry_on(exc_value)
+
+
+class RetryableTransaction(object):
+    """Runs a transactional block again on deadlocks and serialization
+    failures.
+
+    A `with` block can't be run twice, so the transaction is either a
+    decorated function or a loop over the attempts:
+
+        @retryable_transaction(max_attempts=5)
+        def move(src, dst, session):
+            ...
+
+        for attempt in retryable_transaction(engine=engine):
+            with attempt as session:
+                ...
+
+    Each attempt runs in a new session, which is committed at the end of
+    the attempt. Only the block is run again, so it must not have side
+    effects outside of the database. Within an outer session the block is
+    run once, as only the whole outer transaction could be retried.
+    """
+
+    def __init__(
+        self,
+        max_attempts=DEFAULT_MAX_ATTEMPTS,
+        backoff=DEFAULT_BACKOFF,
+        max_backoff=DEFAULT_MAX_BACKOFF,
+        engine=None,
+        context=None,
+        stats=None,
+    ):
+        """
+        Initializes the retryable transaction.
+
+        :param max_attempts: The maximum number of attempts.
+        :param backoff: The maximum delay in seconds before the first retry,
+            it's doubled on every retry. The actual delay is random between
+            0 and the maximum one.
+        :param max_backoff: The upper limit of the maximum delay.
+        :param engine: The engine of the sessions. Defaults to the default
+            engine of the factory.
+        :param context: A context whose `session_manager` opens the
+            sessions instead of the engine.
+        :param stats: The counters of retries. Defaults to `retry_stats`.
+        """
+        super(RetryableTransaction, self).__init__()
+        if max_attempts < 1:
+            raise ValueError("max_attempts (%s) must be positive" % max_attempts)
+        self._max_attempts = max_attempts
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._engine = engine
+        self._context = context
+        self._stats = retry_stats if stats is None else stats
+
+    def _get_engine(self):
+        return self._engine or engines.engine_factory.get_engine()
+
+    def session_manager(self):
+        if self._context is not None:
+            return self._context.session_manager()
+        return self._get_engine().session_manager()
+
+    def _in_outer_session(self):
+        if self._context is not None:
+            return False
+        try:
+            self._get_engine().get_session_storage().get_session()
+        except sessions.SessionNotFound:
+            return False
+        return True
+
+    def get_delay(self, attempt):
+        """
+        Returns a random delay before the retry of the failed attempt.
+
+        :param attempt: The number of the failed attempt starting from 1.
+        :rtype: float
+        """
+        limit = min(self._max_backoff, self._backoff * 2 ** (attempt - 1))
+        return random.uniform(0, limit)
+
+    def should_retry(self, error, attempt):
+        if not is_retryable(error):
+            return False
+        if attempt >= self._max_attempts or self._in_outer_session():
+            self._stats.record_exhausted()
+            return False
+        LOG.warning(
+            "Retry the transaction after the attempt %d of %d failed: %s",
+            attempt,
+            self._max_attempts,
+            error,
+        )
+        self._stats.record_retry(attempt)
+        return True
+
+    def __iter__(self):
+        self._stats.record_transaction()
+        for number in range(1, self._max_attempts + 1):
+            attempt = Attempt(self, number)
+            yield attempt
+            if not attempt.failed:
+                return
+            time.sleep(self.get_delay(number))
+
+    def run(self, func, *args, **kwargs):
+        """
+        Runs a function in a transaction until it succeeds.
+
+        :param func: A function which accepts the session as the `session`
+            keyword argument.
+        :return: The result of the function.
+        """
+        for attempt in self:
+            with attempt as session:
+                result = func(*args, session=session, **kwargs)
+        return result
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.run(func, *args, **kwargs)
+
+        return wrapper
+
+
+def retryable_transaction(
+    max_attempts=DEFAULT_MAX_ATTEMPTS,
+    backoff=DEFAULT_BACKOFF,
+    max_backoff=DEFAULT_MAX_BACKOFF,
+    engine=None,
+    context=None,
+):
+    """
+    Returns a transaction which is run again on deadlocks and
+    serialization failures.
+
+    See `RetryableTransaction` for the usage.
+
+    :rtype: RetryableTransaction
+    """
+    return RetryableTransaction(
+        max_attempts=max_attempts,
+        backoff=backoff,
+        max_backoff=max_backoff,
+        engine=engine,
+        context=context,
+    )
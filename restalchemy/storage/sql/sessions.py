@@ -14,19 +14,106 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections.abc
 import contextlib
+import contextvars
+import functools
+import itertools
 import logging
 import threading
+import time
 
 from mysql.connector import errors
 from psycopg import errors as pg_errors
 from psycopg import rows as pg_rows
 
+from restalchemy.dm import filters as dm_filters
+from restalchemy.storage import base
 from restalchemy.storage import exceptions as exc
+from restalchemy.storage.sql import result_cache
+from restalchemy.storage.sql.dialect import exceptions as dialect_exc
 from restalchemy.storage.sql.dialect import mysql
 from restalchemy.storage.sql.dialect import pgsql
 
 LOG = logging.getLogger(__name__)
+DEFAULT_STREAM_BATCH_SIZE = 1000
+DEFAULT_COPY_THRESHOLD = 1000
+DEFAULT_BATCH_UPDATE_SIZE = 1000
+# The maximum number of prepared cursors kept by a MySQL session, the
+# same as the default `prepared_max` of psycopg.
+DEFAULT_PREPARED_MAX = 100
+# The maximum number of bind parameters in a PostgreSQL statement.
+PG_MAX_PARAMS = 65535
+
+
+def _get_insert_rows(session, table, models):
+    """Build value tuples ordered as the sorted column names of the table."""
+    column_names = table.get_column_names(session=session)
+    rows = []
+    for model in models:
+        snapshot = model.get_storable_snapshot()
+        rows.append(tuple(snapshot[name] for name in column_names))
+    return rows
+
+
+def _prepare_batch_update(session, models, force):
+    """Collect the columns and value rows to update models in one batch.
+
+    Only columns which are dirty in at least one model are updated. Models
+    without changes are skipped unless `force` is set, the same way
+    `update` does it. The deferred properties which aren't loaded are
+    neither compared nor written, unless the column is written for
+    another model.
+
+    :return: A tuple of the column names, the models to update and their
+        value rows (primary key values followed by the column values).
+    """
+    table = models[0].get_table()
+    pk_names = table.get_pk_names(session=session)
+    columns = set()
+    models_to_update = []
+    for model in models:
+        loaded = model.get_loaded_data_properties()
+        if force:
+            columns.update(loaded)
+            models_to_update.append(model)
+            continue
+        dirty = [name for name, prop in loaded.items() if prop.is_dirty()]
+        if dirty:
+            columns.update(dirty)
+            models_to_update.append(model)
+    columns = sorted(columns)
+
+    rows = []
+    for model in models_to_update:
+        model.validate()
+        snapshot = model.get_storable_snapshot(
+            {name: model.properties[name] for name in pk_names + columns}
+        )
+        rows.append(tuple(snapshot[name] for name in pk_names + columns))
+    return columns, models_to_update, rows
+
+
+def _check_batch_update_result(session, models, count):
+    """Report not found and multiple updated rows like `update` does.
+
+    The updated models replace the ones in the identity map of the session.
+    """
+    if count > len(models):
+        raise exc.MultipleUpdatesDetected(model=models[0], filters={})
+    identity_map = get_identity_map(session)
+    if count < len(models):
+        for model in models:
+            if identity_map is not None:
+                identity_map.remove(model)
+            _filters = {
+                name: dm_filters.EQ(prop.value)
+                for name, prop in model.get_id_properties().items()
+            }
+            type(model).objects.get_one(filters=_filters, session=session)
+    if identity_map is not None:
+        for model in models:
+            identity_map.add(model)
 
 
 class SessionQueryCache(object):
@@ -83,7 +170,9 @@ class SessionQueryCache(object):
         order_by=None,
         locked=False,
     ):
-        query_hash = self._get_hash(engine, table, filters, limit, locked)
+        query_hash = self._get_hash(
+            engine, table, filters, limit=limit, order_by=order_by, locked=locked
+        )
         if query_hash not in self.__query_cache:
             self.__query_cache[query_hash] = fallback(
                 filters=filters,
@@ -106,7 +195,13 @@ class SessionQueryCache(object):
         locked=False,
     ):
         query_hash = self._get_hash_by_query(
-            engine, table, where_conditions, where_values, limit, locked
+            engine,
+            table,
+            where_conditions,
+            where_values,
+            limit=limit,
+            order_by=order_by,
+            locked=locked,
         )
         if query_hash not in self.__query_cache:
             self.__query_cache[query_hash] = fallback(
@@ -120,13 +215,217 @@ class SessionQueryCache(object):
         return self.__query_cache[query_hash]
 
 
-class PgSQLSession(object):
+class SessionIdentityMap(object):
+    """Models restored or saved within a session by class and primary key.
+
+    Selects by primary key equality return the model from the map instead
+    of querying the database, so a row is restored once per session and
+    repeated lookups return the same object. Changes made by raw SQL
+    statements are not tracked.
+    """
+
+    def __init__(self):
+        super(SessionIdentityMap, self).__init__()
+        self._models = {}
+
+    @staticmethod
+    def _get_key(model_cls, id_values):
+        try:
+            return model_cls, tuple(
+                model_cls.properties.properties[name]
+                .get_property_type()
+                .to_simple_type(id_values[name])
+                for name in sorted(model_cls.id_properties)
+            )
+        except Exception:
+            return None
+
+    def _get_model_key(self, model):
+        return self._get_key(
+            type(model),
+            {name: getattr(model, name) for name in model.id_properties},
+        )
+
+    def get_by_filters(self, model_cls, filters):
+        """
+        Returns the model selected by the filters if it is in the map.
+
+        :param model_cls: The class of the model.
+        :param filters: Filters of a select, only a mapping with EQ filters
+            by all the id properties is looked up.
+        :return: The model or None.
+        """
+        if not isinstance(filters, collections.abc.Mapping) or (
+            set(filters) != set(model_cls.id_properties)
+        ):
+            return None
+        id_values = {}
+        for name, clause in filters.items():
+            if type(clause) is not dm_filters.EQ:
+                return None
+            id_values[name] = clause.value
+        key = self._get_key(model_cls, id_values)
+        return None if key is None else self._models.get(key)
+
+    def merge(self, model, refresh=False):
+        """
+        Adds the model unless the map has the model with the same key.
+
+        :param refresh: Replace the properties of the model from the map
+            with the ones of the given model, e.g. restored from a row just
+            selected with a lock. The changes of the model from the map are
+            discarded.
+        :return: The model from the map.
+        """
+        key = self._get_model_key(model)
+        if key is None:
+            return model
+        mapped = self._models.setdefault(key, model)
+        if refresh and mapped is not model:
+            mapped.properties = model.properties
+            mapped.id_properties = model.id_properties
+            mapped._saved = model._saved
+        return mapped
+
+    def add(self, model):
+        """Adds the model replacing the one with the same key."""
+        key = self._get_model_key(model)
+        if key is not None:
+            self._models[key] = model
+
+    def remove(self, model):
+        self._models.pop(self._get_model_key(model), None)
+
+    def clear(self):
+        self._models.clear()
+
+
+def get_identity_map(session):
+    """Returns the identity map of the session or None.
+
+    Sessions of other implementations may have no identity map.
+    """
+    identity_map = getattr(session, "identity_map", None)
+    if isinstance(identity_map, SessionIdentityMap):
+        return identity_map
+    return None
+
+
+class TableChangesMixin(object):
+    """Collects the tables written within a session.
+
+    Results of the tables in the shared result cache are invalidated when
+    the session commits.
+    """
+
+    _changed_tables = frozenset()
+    _cache_epoch = 0
+
+    @property
+    def changed_tables(self):
+        return self._changed_tables
+
+    @property
+    def cache_epoch(self):
+        """The epoch of the shared result cache when the transaction started.
+
+        The snapshot of the transaction is taken later, so results of the
+        tables invalidated after the epoch may be stale.
+        """
+        return self._cache_epoch
+
+    def track_table_change(self, table_name):
+        self._changed_tables = self._changed_tables | {table_name}
+
+    def _start_cache_epoch(self):
+        self._cache_epoch = result_cache.shared_cache.get_epoch()
+
+    def _reset_table_changes(self, committed):
+        changed_tables, self._changed_tables = self._changed_tables, frozenset()
+        if committed and changed_tables:
+            result_cache.shared_cache.invalidate_tables(changed_tables)
+        self._start_cache_epoch()
+
+
+class StatementStatsMixin(object):
+    """Records executed statements in the statistics of the engine.
+
+    See `statement_stats.StatementStats`.
+    """
+
+    def _explain(self, statement, values):
+        """Returns the plan of a select or None if it can't be captured."""
+        return None
+
+    def _record_statement(self, statement, values, started_at, rows, explain=True):
+        # NOTE(efrolov): The listeners of the statistics are called even if
+        #                it's disabled, see `StatementStats.add_listener`.
+        self._engine.statement_stats.record(
+            statement,
+            values,
+            time.monotonic() - started_at,
+            rows,
+            explain=(
+                functools.partial(self._explain, statement, values) if explain else None
+            ),
+        )
+
+
+class PipelineResult(object):
+    """The result of a statement sent in the pipeline mode.
+
+    The result isn't received when the statement is sent. The pipeline is
+    synchronized at the first access to the rows or the row count, and
+    errors of the pipeline are converted the same way as the ones of
+    commands.
+    """
+
+    def __init__(self, cursor, pipeline):
+        super(PipelineResult, self).__init__()
+        self._cursor = cursor
+        self._pipeline = pipeline
+
+    def _sync(self):
+        if self._cursor.pgresult is None:
+            with pgsql.database_errors_handler():
+                self._pipeline.sync()
+
+    @property
+    def rowcount(self):
+        self._sync()
+        return self._cursor.rowcount
+
+    def fetchall(self):
+        self._sync()
+        return self._cursor.fetchall()
+
+    def fetchone(self):
+        self._sync()
+        return self._cursor.fetchone()
+
+    def __iter__(self):
+        self._sync()
+        return iter(self._cursor)
+
+
+class PgSQLSession(TableChangesMixin, StatementStatsMixin):
+    # NOTE(efrolov): Other statements can be run while the rows of a
+    #                named cursor are streamed.
+    stream_blocks_connection = False
+
     def __init__(self, engine):
         self._engine = engine
         self._conn = self._engine.get_connection()
         self._cursor = self._conn.cursor(row_factory=pg_rows.dict_row)
+        self._tuple_cursor = None
+        self._pipeline = None
+        # NOTE(efrolov): None lets psycopg decide by `prepare_threshold`.
+        self._prepare = True if engine.prepared_statements else None
         self._log = LOG
+        self._stream_counter = itertools.count(1)
         self.cache = SessionQueryCache(session=self)
+        self.identity_map = SessionIdentityMap()
+        self._start_cache_epoch()
 
     @property
     def engine(self):
@@ -138,36 +437,159 @@ class PgSQLSession(object):
         if not min(map(lambda m: isinstance(m, model_type), models)):
             raise TypeError("All models in the list must be of the same type")
 
-    def batch_insert(self, models):
+    def batch_insert(self, models, copy_threshold=DEFAULT_COPY_THRESHOLD):
+        """Insert models of the same type with one command.
+
+        Batches of at least `copy_threshold` models are loaded with
+        `COPY ... FROM STDIN`, smaller ones with `executemany`. Within a
+        pipeline `executemany` is always used, as COPY isn't supported
+        there. Values are taken from storable snapshots of the models.
+
+        :param copy_threshold: The minimum number of models to use COPY,
+            0 or None disables COPY.
+        """
         if models:
             # Check models type
             first_model = models[0]
             self._check_models_same_type(first_model, models)
 
             # process values
-            values = []
             table = first_model.get_table()
-            statement = pgsql.PgSQLInsert(
-                table=table,
-                data=first_model.get_storable_snapshot(),
-                session=self,
-            ).get_statement()
-            for model in models:
-                snapshot = model.get_storable_snapshot()
-                insert = pgsql.PgSQLInsert(
+            self.track_table_change(table.name)
+            column_names = table.get_column_names(session=self)
+            values = _get_insert_rows(self, table, models)
+
+            use_copy = (
+                copy_threshold
+                and len(values) >= copy_threshold
+                and self._pipeline is None
+            )
+            try:
+                if use_copy:
+                    return self.copy_rows(table, column_names, values)
+                statement = pgsql.PgSQLInsert(
                     table=table,
-                    data=snapshot,
+                    data={},
                     session=self,
+                ).get_statement()
+                return self.execute_many(statement, values)
+            except pg_errors.UniqueViolation as e:
+                raise exc.ConflictRecords(
+                    model=type(first_model).__name__,
+                    msg=str(e),
                 )
-                values.append(insert.get_values())
 
+    def copy_rows(self, table, column_names, rows):
+        """Load rows into the table with `COPY ... FROM STDIN`.
+
+        Values are sent in the text format and parsed by the server
+        according to the column types, the same way as parameters of
+        `INSERT` statements.
+
+        :param table: The table to load rows into.
+        :param column_names: Names of the columns in the order of values.
+        :param rows: Iterable of value tuples.
+        """
+        statement = "COPY %s (%s) FROM STDIN" % (
+            self._engine.escape(table.name),
+            ", ".join(self._engine.escape(name) for name in column_names),
+        )
+        self._log.debug(
+            "Execute copy statement %s within %s database",
+            statement,
+            self._engine.db_name,
+        )
+        with self._cursor.copy(statement) as copy:
+            for row in rows:
+                copy.write_row(row)
+        return self._cursor
+
+    def batch_update(self, models, force=False, batch_size=DEFAULT_BATCH_UPDATE_SIZE):
+        """Update models of the same type with one statement per chunk.
+
+        Only the columns which are dirty in at least one of the models are
+        updated. `RecordNotFound` and `MultipleUpdatesDetected` are raised
+        in the same cases as by `update`.
+
+        :param force: Update all the models and all the columns.
+        :param batch_size: The maximum number of rows in one statement.
+        """
+        if models:
+            # Check models type
+            first_model = models[0]
+            self._check_models_same_type(first_model, models)
+
+            table = first_model.get_table()
+            self.track_table_change(table.name)
+            columns, models, rows = _prepare_batch_update(self, models, force)
+            if not columns:
+                return
+            row_len = len(rows[0])
+            batch_size = max(1, min(batch_size, PG_MAX_PARAMS // row_len))
             try:
-                return self.execute_many(statement, values)
-            except pg_errors.UniqueViolation as e:
+                for start in range(0, len(rows), batch_size):
+                    result = pgsql.PgSQLBatchUpdate(
+                        table=table,
+                        columns=columns,
+                        rows=rows[start : start + batch_size],
+                        session=self,
+                    ).execute()
+                    _check_batch_update_result(
+                        self,
+                        models[start : start + batch_size],
+                        result.get_count(),
+                    )
+            except dialect_exc.Conflict as e:
+                raise exc.ConflictRecords(
+                    model=type(first_model).__name__,
+                    msg=str(e),
+                )
+
+    def batch_upsert(
+        self,
+        models,
+        conflict_columns=None,
+        update_columns=None,
+        batch_size=DEFAULT_BATCH_UPDATE_SIZE,
+    ):
+        """Insert models of the same type or update the existing ones.
+
+        Models are upserted with `INSERT ... ON CONFLICT DO UPDATE`
+        statements, one per chunk of `batch_size` rows. The models are
+        marked as saved afterwards.
+
+        :param conflict_columns: The columns of the unique key which detects
+            existing rows. Defaults to the primary key.
+        :param update_columns: The columns to be updated for existing rows.
+            Defaults to all columns except the conflict ones.
+        :param batch_size: The maximum number of rows in one statement.
+        """
+        if models:
+            # Check models type
+            first_model = models[0]
+            self._check_models_same_type(first_model, models)
+
+            table = first_model.get_table()
+            rows = _get_insert_rows(self, table, models)
+            batch_size = max(1, min(batch_size, PG_MAX_PARAMS // len(rows[0])))
+            try:
+                for start in range(0, len(rows), batch_size):
+                    table.upsert(
+                        engine=self._engine,
+                        rows=rows[start : start + batch_size],
+                        session=self,
+                        conflict_columns=conflict_columns,
+                        update_columns=update_columns,
+                    )
+            except dialect_exc.Conflict as e:
                 raise exc.ConflictRecords(
                     model=type(first_model).__name__,
                     msg=str(e),
                 )
+            for model in models:
+                model._saved = True
+                # NOTE(efrolov): The stored row may differ from the model.
+                self.identity_map.remove(model)
 
     def batch_delete(self, models):
         if models:
@@ -177,6 +599,7 @@ class PgSQLSession(object):
 
             # process values
             table = first_model.get_table()
+            self.track_table_change(table.name)
             values = []
             for model in models:
                 pk_values = {}
@@ -188,10 +611,70 @@ class PgSQLSession(object):
                 snapshot=values,
                 session=self,
             )
+            for model in models:
+                self.identity_map.remove(model)
 
             return self.execute(operation.get_statement(), operation.get_values())
 
-    def execute(self, statement, values=None):
+    @contextlib.contextmanager
+    def pipeline(self):
+        """Send the statements executed within the context in a pipeline.
+
+        Statements are sent without waiting for the results of the previous
+        ones, so independent writes take one round trip instead of one per
+        statement. The pipeline is synchronized when the context exits and
+        when the rows or the row count of a result are accessed, e.g. to
+        check that an update has found its row. Database errors are raised
+        at these points and converted to `DeadLock` and `Conflict` the same
+        way as the errors of commands. COPY and streaming are not supported
+        within the pipeline.
+
+        Nested contexts are allowed, the exit of a nested one is a
+        synchronization point.
+
+        :yields: The `psycopg.Pipeline` of the connection.
+        """
+        with pgsql.database_errors_handler():
+            with self._conn.pipeline() as pipeline:
+                outer, self._pipeline = self._pipeline, pipeline
+                try:
+                    yield pipeline
+                finally:
+                    self._pipeline = outer
+
+    @staticmethod
+    def _get_row_factory(tuple_rows):
+        return pg_rows.tuple_row if tuple_rows else pg_rows.dict_row
+
+    def _get_cursor(self, tuple_rows):
+        if not tuple_rows:
+            return self._cursor
+        if self._tuple_cursor is None:
+            self._tuple_cursor = self._conn.cursor(row_factory=pg_rows.tuple_row)
+        return self._tuple_cursor
+
+    def _get_prepare(self, prepare):
+        # NOTE(efrolov): Statements which aren't built by the dialect
+        #                commands are left to `prepare_threshold`.
+        return self._prepare if prepare else None
+
+    def _execute_in_pipeline(self, statement, values, tuple_rows=False, prepare=False):
+        # NOTE(efrolov): Each statement gets its own cursor, so the results
+        #                of the statements sent together are kept.
+        cursor = self._conn.cursor(row_factory=self._get_row_factory(tuple_rows))
+        started_at = time.monotonic()
+        cursor.execute(statement, values, prepare=self._get_prepare(prepare))
+        self._record_statement(statement, values, started_at, None, explain=False)
+        return PipelineResult(cursor, self._pipeline)
+
+    def execute(self, statement, values=None, tuple_rows=False, prepare=False):
+        """
+        :param tuple_rows: Whether rows are fetched as tuples instead of
+            dictionaries.
+        :param prepare: Whether the statement is prepared on the server if
+            the engine enables prepared statements. Only the statements
+            built by the dialect commands are prepared.
+        """
         try:
             self._log.debug(
                 ("Execute statement %s with values %s within %s database"),
@@ -199,11 +682,30 @@ class PgSQLSession(object):
                 values,
                 self._engine.db_name,
             )
-            self._cursor.execute(statement, values)
-            return self._cursor
+            if self._pipeline is not None:
+                return self._execute_in_pipeline(statement, values, tuple_rows, prepare)
+            cursor = self._get_cursor(tuple_rows)
+            started_at = time.monotonic()
+            cursor.execute(statement, values, prepare=self._get_prepare(prepare))
+            self._record_statement(statement, values, started_at, cursor.rowcount)
+            return cursor
         except errors.DatabaseError:
             raise
 
+    def _explain(self, statement, values):
+        # NOTE(efrolov): A failed statement aborts the whole transaction in
+        #                PostgreSQL, so the plan is captured in a savepoint.
+        with self._conn.cursor(row_factory=pg_rows.dict_row) as cursor:
+            cursor.execute("SAVEPOINT ra_explain")
+            try:
+                cursor.execute("EXPLAIN (FORMAT JSON) " + statement, values)
+                return cursor.fetchone()["QUERY PLAN"]
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT ra_explain")
+                raise
+            finally:
+                cursor.execute("RELEASE SAVEPOINT ra_explain")
+
     def execute_many(self, statement, values):
         self._log.debug(
             ("Execute batch statement %s with values %s within %s database"),
@@ -211,26 +713,70 @@ class PgSQLSession(object):
             values,
             self._engine.db_name,
         )
+        started_at = time.monotonic()
         self._cursor.executemany(statement, values)
+        self._record_statement(
+            statement, values, started_at, self._cursor.rowcount, explain=False
+        )
         return self._cursor
 
+    def execute_stream(self, statement, values=None, batch_size=None, tuple_rows=False):
+        """Execute statement on a server-side cursor and yield rows.
+
+        Rows are fetched from the server by batches of `batch_size`, so
+        the result set is never materialized on the client side. The
+        cursor lives in the current transaction. With `tuple_rows` the
+        rows are tuples instead of dictionaries.
+        """
+        batch_size = batch_size or DEFAULT_STREAM_BATCH_SIZE
+        name = "ra_stream_%d" % next(self._stream_counter)
+        self._log.debug(
+            ("Execute stream statement %s with values %s within %s database"),
+            statement,
+            values,
+            self._engine.db_name,
+        )
+        with self._conn.cursor(
+            name=name, row_factory=self._get_row_factory(tuple_rows)
+        ) as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(statement, values)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+
     def rollback(self):
         self._conn.rollback()
+        self._reset_table_changes(committed=False)
+        self.identity_map.clear()
 
     def commit(self):
         self._conn.commit()
+        self._reset_table_changes(committed=True)
 
     def close(self):
         self._engine.close_connection(self._conn)
 
 
-class MySQLSession(object):
+class MySQLSession(TableChangesMixin, StatementStatsMixin):
+    # NOTE(efrolov): The connection can't run other statements until the
+    #                rows of an unbuffered cursor are read to the end.
+    stream_blocks_connection = True
+
     def __init__(self, engine):
         self._engine = engine
         self._conn = self._engine.get_connection()
         self._cursor = self._conn.cursor(dictionary=True, buffered=True)
+        self._tuple_cursor = None
+        self._prepared_cursors = collections.OrderedDict()
         self._log = LOG
+        self._max_allowed_packet = None
         self.cache = SessionQueryCache(session=self)
+        self.identity_map = SessionIdentityMap()
+        self._start_cache_epoch()
 
     @property
     def engine(self):
@@ -242,31 +788,77 @@ class MySQLSession(object):
         if not min(map(lambda m: isinstance(m, model_type), models)):
             raise TypeError("All models in the list must be of the same type")
 
+    def _get_max_allowed_packet(self):
+        if self._max_allowed_packet is None:
+            self._cursor.execute("SELECT @@max_allowed_packet AS value")
+            self._max_allowed_packet = int(self._cursor.fetchone()["value"])
+        return self._max_allowed_packet
+
+    @staticmethod
+    def _get_value_size(value):
+        if isinstance(value, str):
+            return len(value.encode("utf-8"))
+        if isinstance(value, (bytes, bytearray)):
+            return len(value)
+        return len(str(value))
+
+    @classmethod
+    def _estimate_row_size(cls, row, row_overhead):
+        # NOTE(efrolov): The upper bound of the size of the row in the
+        #                rendered statement: the encoded value with every
+        #                byte escaped by the connector, the `_binary`
+        #                prefix, quotes and a separator.
+        return sum(2 * cls._get_value_size(value) + 12 for value in row) + row_overhead
+
+    def _split_rows_by_packet(self, rows, statement_size, row_overhead=4):
+        limit = self._get_max_allowed_packet() - statement_size
+        chunk = []
+        chunk_size = 0
+        for row in rows:
+            row_size = self._estimate_row_size(row, row_overhead)
+            if chunk and chunk_size + row_size > limit:
+                yield chunk
+                chunk = []
+                chunk_size = 0
+            chunk.append(row)
+            chunk_size += row_size
+        if chunk:
+            yield chunk
+
     def batch_insert(self, models):
+        """Insert models of the same type with multi-row statements.
+
+        Models are inserted with `INSERT ... VALUES (...), (...)`
+        statements. Rows are split into chunks so that every statement
+        fits into `max_allowed_packet` of the server.
+        """
         if models:
             # Check models type
             first_model = models[0]
             self._check_models_same_type(first_model, models)
 
             # process values
-            values = []
             table = first_model.get_table()
-            statement = mysql.MySQLInsert(
-                table=table,
-                data=first_model.get_storable_snapshot(),
-                session=self,
-            ).get_statement()
-            for model in models:
-                snapshot = model.get_storable_snapshot()
-                insert = mysql.MySQLInsert(
+            self.track_table_change(table.name)
+            values = _get_insert_rows(self, table, models)
+
+            statement_size = len(
+                mysql.MySQLBatchInsert(
                     table=table,
-                    data=snapshot,
+                    rows=[],
                     session=self,
-                )
-                values.append(insert.get_values())
-
+                ).get_statement()
+            )
             try:
-                return self.execute_many(statement, values)
+                result = None
+                for chunk in self._split_rows_by_packet(values, statement_size):
+                    insert = mysql.MySQLBatchInsert(
+                        table=table,
+                        rows=chunk,
+                        session=self,
+                    )
+                    result = self.execute(insert.get_statement(), insert.get_values())
+                return result
             except errors.IntegrityError as e:
                 # Error codes from Maria DB documentation. See more on website
                 # https://mariadb.com/kb/en/mariadb-error-codes/
@@ -279,6 +871,111 @@ class MySQLSession(object):
                 else:
                     raise exc.UnknownStorageException(caused=e)
 
+    def batch_update(self, models, force=False):
+        """Update models of the same type with one statement per chunk.
+
+        Only the columns which are dirty in at least one of the models are
+        updated. Rows are split into chunks so that every statement fits
+        into `max_allowed_packet` of the server. `RecordNotFound` and
+        `MultipleUpdatesDetected` are raised in the same cases as by
+        `update`.
+
+        :param force: Update all the models and all the columns.
+        """
+        if models:
+            # Check models type
+            first_model = models[0]
+            self._check_models_same_type(first_model, models)
+
+            table = first_model.get_table()
+            self.track_table_change(table.name)
+            columns, models, rows = _prepare_batch_update(self, models, force)
+            if not columns:
+                return
+            sizes = [
+                len(
+                    mysql.MySQLBatchUpdate(
+                        table=table,
+                        columns=columns,
+                        rows=[()] * count,
+                        session=self,
+                    ).get_statement()
+                )
+                for count in (1, 2)
+            ]
+            start = 0
+            try:
+                for chunk in self._split_rows_by_packet(
+                    rows,
+                    sizes[0],
+                    row_overhead=sizes[1] - sizes[0],
+                ):
+                    result = mysql.MySQLBatchUpdate(
+                        table=table,
+                        columns=columns,
+                        rows=chunk,
+                        session=self,
+                    ).execute()
+                    _check_batch_update_result(
+                        self,
+                        models[start : start + len(chunk)],
+                        result.get_count(),
+                    )
+                    start += len(chunk)
+            except dialect_exc.Conflict as e:
+                raise exc.ConflictRecords(
+                    model=type(first_model).__name__,
+                    msg=str(e),
+                )
+
+    def batch_upsert(self, models, conflict_columns=None, update_columns=None):
+        """Insert models of the same type or update the existing ones.
+
+        Models are upserted with `INSERT ... ON DUPLICATE KEY UPDATE`
+        statements. Rows are split into chunks so that every statement fits
+        into `max_allowed_packet` of the server. The models are marked as
+        saved afterwards.
+
+        :param conflict_columns: Not used for the conflict detection, MySQL
+            detects existing rows by any unique key of the table.
+        :param update_columns: The columns to be updated for existing rows.
+            Defaults to all columns except the primary key.
+        """
+        if models:
+            # Check models type
+            first_model = models[0]
+            self._check_models_same_type(first_model, models)
+
+            table = first_model.get_table()
+            rows = _get_insert_rows(self, table, models)
+            statement_size = len(
+                mysql.MySQLUpsert(
+                    table=table,
+                    rows=[],
+                    session=self,
+                    conflict_columns=conflict_columns,
+                    update_columns=update_columns,
+                ).get_statement()
+            )
+            try:
+                for chunk in self._split_rows_by_packet(rows, statement_size):
+                    table.upsert(
+                        engine=self._engine,
+                        rows=chunk,
+                        session=self,
+                        conflict_columns=conflict_columns,
+                        update_columns=update_columns,
+                    )
+            except dialect_exc.Conflict as e:
+                raise exc.ConflictRecords(
+                    model=type(first_model).__name__,
+                    msg=str(e),
+                )
+            for model in models:
+                model._saved = True
+                # NOTE(efrolov): The stored row may differ from the model.
+                self.identity_map.remove(model)
+
     def batch_delete(self, models):
         if models:
             # Check models type
@@ -287,6 +984,7 @@ class MySQLSession(object):
 
             # process values
             table = first_model.get_table()
+            self.track_table_change(table.name)
             values = []
             for model in models:
                 pk_values = {}
@@ -298,10 +996,27 @@ class MySQLSession(object):
                 snapshot=values,
                 session=self,
             )
+            for model in models:
+                self.identity_map.remove(model)
 
             return self.execute(operation.get_statement(), operation.get_values())
 
-    def execute(self, statement, values=None):
+    def _get_cursor(self, tuple_rows):
+        if not tuple_rows:
+            return self._cursor
+        if self._tuple_cursor is None:
+            self._tuple_cursor = self._conn.cursor(buffered=True)
+        return self._tuple_cursor
+
+    def execute(self, statement, values=None, tuple_rows=False, prepare=False):
+        """
+        :param tuple_rows: Whether rows are fetched as tuples instead of
+            dictionaries.
+        :param prepare: Whether the statement is prepared on the server if
+            the engine enables prepared statements. Only the statements
+            built by the dialect commands are prepared, as MySQL doesn't
+            support savepoints and some DDL in prepared statements.
+        """
         try:
             self._log.debug(
                 ("Execute statement %s with values %s within %s database"),
@@ -309,13 +1024,65 @@ class MySQLSession(object):
                 values,
                 self._engine.db_name,
             )
-            self._cursor.execute(statement, values)
-            return self._cursor
+            if prepare and self._can_prepare(values):
+                return self._execute_prepared(statement, values, tuple_rows)
+            cursor = self._get_cursor(tuple_rows)
+            started_at = time.monotonic()
+            cursor.execute(statement, values)
+            self._record_statement(statement, values, started_at, cursor.rowcount)
+            return cursor
         except errors.DatabaseError as e:
             if e.errno == 1213:
                 raise exc.DeadLock(msg=e.msg)
             raise
 
+    def _can_prepare(self, values):
+        # NOTE(efrolov): Lists of IN filters are expanded into the statement
+        #                on the client, they can't be bound to a prepared one.
+        return self._engine.prepared_statements and not any(
+            isinstance(value, (list, tuple)) for value in values or ()
+        )
+
+    def _get_prepared_cursor(self, statement, tuple_rows=False):
+        # NOTE(efrolov): A prepared cursor keeps the last prepared statement
+        #                only, so every statement gets its own cursor.
+        key = (statement, tuple_rows)
+        cursor = self._prepared_cursors.pop(key, None)
+        if cursor is None:
+            cursor = self._conn.cursor(prepared=True, dictionary=not tuple_rows)
+            while len(self._prepared_cursors) >= DEFAULT_PREPARED_MAX:
+                _, evicted = self._prepared_cursors.popitem(last=False)
+                evicted.close()
+        self._prepared_cursors[key] = cursor
+        return cursor
+
+    def _execute_prepared(self, statement, values, tuple_rows=False):
+        cursor = self._get_prepared_cursor(statement, tuple_rows)
+        started_at = time.monotonic()
+        cursor.execute(statement, values)
+        # NOTE(efrolov): Prepared cursors aren't buffered, the rows are read
+        #                at once to keep the connection free for the next
+        #                statements.
+        rows = cursor.fetchall() if cursor.with_rows else []
+        self._record_statement(statement, values, started_at, cursor.rowcount)
+        return FetchedResult(rows, cursor.rowcount)
+
+    def _close_prepared_cursors(self):
+        while self._prepared_cursors:
+            _, cursor = self._prepared_cursors.popitem()
+            try:
+                cursor.close()
+            except Exception:
+                LOG.debug("Failed to close the prepared cursor", exc_info=True)
+
+    def _explain(self, statement, values):
+        cursor = self._conn.cursor(dictionary=True, buffered=True)
+        try:
+            cursor.execute("EXPLAIN FORMAT=JSON " + statement, values)
+            return next(iter(cursor.fetchone().values()))
+        finally:
+            cursor.close()
+
     def execute_many(self, statement, values):
         self._log.debug(
             ("Execute batch statement %s with values %s within %s database"),
@@ -323,19 +1090,250 @@ class MySQLSession(object):
             values,
             self._engine.db_name,
         )
+        started_at = time.monotonic()
         self._cursor.executemany(statement, values)
+        self._record_statement(
+            statement, values, started_at, self._cursor.rowcount, explain=False
+        )
         return self._cursor
 
+    def execute_stream(self, statement, values=None, batch_size=None, tuple_rows=False):
+        """Execute statement on an unbuffered cursor and yield rows.
+
+        Rows are read from the connection by batches of `batch_size`. The
+        connection can't be used for other statements until the stream is
+        exhausted or closed. With `tuple_rows` the rows are tuples instead
+        of dictionaries.
+        """
+        batch_size = batch_size or DEFAULT_STREAM_BATCH_SIZE
+        self._log.debug(
+            ("Execute stream statement %s with values %s within %s database"),
+            statement,
+            values,
+            self._engine.db_name,
+        )
+        cursor = self._conn.cursor(dictionary=not tuple_rows, buffered=False)
+        try:
+            try:
+                cursor.execute(statement, values)
+            except errors.DatabaseError as e:
+                if e.errno == 1213:
+                    raise exc.DeadLock(msg=e.msg)
+                raise
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+        finally:
+            # NOTE(efrolov): Drain the rest of the result set by batches
+            #                if the stream was closed before the end.
+            while self._conn.unread_result and cursor.fetchmany(batch_size):
+                pass
+            cursor.close()
+
     def rollback(self):
         self._conn.rollback()
+        self._reset_table_changes(committed=False)
+        self.identity_map.clear()
 
     def commit(self):
         self._conn.commit()
+        self._reset_table_changes(committed=True)
 
     def close(self):
+        # NOTE(efrolov): The pool resets returned connections, which
+        #                deallocates their prepared statements.
+        self._close_prepared_cursors()
         self._engine.close_connection(self._conn)
 
 
+class FetchedResult(object):
+    """Result of a statement with all the rows already fetched.
+
+    Provides the part of the cursor interface used by process results, so
+    results of asynchronous sessions are handled by the same code.
+    """
+
+    def __init__(self, rows, rowcount):
+        super(FetchedResult, self).__init__()
+        self._rows = rows
+        self.rowcount = rowcount
+
+    def fetchall(self):
+        return self._rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class AsyncPgSQLSession(TableChangesMixin, StatementStatsMixin):
+    """Session of an asyncio PostgreSQL engine.
+
+    All the methods which talk to the database are coroutines. Statements
+    are compiled by the same dialect commands as in `PgSQLSession`.
+    """
+
+    def __init__(self, engine, conn):
+        self._engine = engine
+        self._conn = conn
+        self._prepare = True if engine.prepared_statements else None
+        self._log = LOG
+        self.identity_map = SessionIdentityMap()
+        self._start_cache_epoch()
+
+    @property
+    def engine(self):
+        return self._engine
+
+    async def execute(self, statement, values=None, tuple_rows=False, prepare=False):
+        """
+        :param tuple_rows: Whether rows are fetched as tuples instead of
+            dictionaries.
+        :param prepare: Whether the statement is prepared on the server if
+            the engine enables prepared statements.
+        """
+        self._log.debug(
+            ("Execute statement %s with values %s within %s database"),
+            statement,
+            values,
+            self._engine.db_name,
+        )
+        row_factory = pg_rows.tuple_row if tuple_rows else pg_rows.dict_row
+        async with self._conn.cursor(row_factory=row_factory) as cursor:
+            started_at = time.monotonic()
+            with pgsql.database_errors_handler():
+                await cursor.execute(
+                    statement, values, prepare=self._prepare if prepare else None
+                )
+            self._record_statement(statement, values, started_at, cursor.rowcount)
+            rows = await cursor.fetchall() if cursor.description else []
+            return FetchedResult(rows, cursor.rowcount)
+
+    async def execute_many(self, statement, values):
+        self._log.debug(
+            ("Execute batch statement %s with values %s within %s database"),
+            statement,
+            values,
+            self._engine.db_name,
+        )
+        async with self._conn.cursor() as cursor:
+            with pgsql.database_errors_handler():
+                await cursor.executemany(statement, values)
+            return FetchedResult([], cursor.rowcount)
+
+    async def copy_rows(self, table, column_names, rows):
+        """The same as `PgSQLSession.copy_rows` but asynchronous."""
+        statement = "COPY %s (%s) FROM STDIN" % (
+            self._engine.escape(table.name),
+            ", ".join(self._engine.escape(name) for name in column_names),
+        )
+        self._log.debug(
+            "Execute copy statement %s within %s database",
+            statement,
+            self._engine.db_name,
+        )
+        async with self._conn.cursor() as cursor:
+            with pgsql.database_errors_handler():
+                async with cursor.copy(statement) as copy:
+                    for row in rows:
+                        await copy.write_row(row)
+            return FetchedResult([], cursor.rowcount)
+
+    async def batch_insert(self, models, copy_threshold=DEFAULT_COPY_THRESHOLD):
+        """The same as `PgSQLSession.batch_insert` but asynchronous."""
+        if models:
+            # Check models type
+            first_model = models[0]
+            PgSQLSession._check_models_same_type(first_model, models)
+
+            table = first_model.get_table()
+            self.track_table_change(table.name)
+            column_names = table.get_column_names(session=self)
+            values = _get_insert_rows(self, table, models)
+
+            use_copy = copy_threshold and len(values) >= copy_threshold
+            try:
+                if use_copy:
+                    return await self.copy_rows(table, column_names, values)
+                statement = pgsql.PgSQLInsert(
+                    table=table,
+                    data={},
+                    session=self,
+                ).get_statement()
+                return await self.execute_many(statement, values)
+            except dialect_exc.Conflict as e:
+                raise exc.ConflictRecords(
+                    model=type(first_model).__name__,
+                    msg=str(e),
+                )
+
+    @base.async_error_catcher
+    @base.async_dead_lock_catcher
+    async def ainsert(self, model):
+        """Insert the model, the asynchronous `model.insert`."""
+        try:
+            await model.get_table().ainsert(
+                engine=self._engine,
+                data=model._get_prepared_data(),
+                session=self,
+            )
+        except dialect_exc.Conflict as e:
+            raise exc.ConflictRecords(model=model, msg=str(e))
+        model._saved = True
+        self.identity_map.add(model)
+
+    @base.async_error_catcher
+    @base.async_dead_lock_catcher
+    async def aupdate(self, model, force=False):
+        """Update the model, the asynchronous `model.update`."""
+        if model.is_dirty() or force:
+            model.validate()
+            try:
+                result = await model.get_table().aupdate(
+                    engine=self._engine,
+                    ids=model._get_prepared_data(model.get_id_properties()),
+                    data=model._get_prepared_data(model.get_loaded_data_properties()),
+                    session=self,
+                )
+            except dialect_exc.Conflict as e:
+                raise exc.ConflictRecords(model=model, msg=str(e))
+            if result.get_count() == 0:
+                self.identity_map.remove(model)
+                _filters = {
+                    name: dm_filters.EQ(prop.value)
+                    for name, prop in model.get_id_properties().items()
+                }
+                await type(model).objects.aget_one(filters=_filters, session=self)
+            if result.get_count() > 1:
+                raise exc.MultipleUpdatesDetected(model=model, filters={})
+            self.identity_map.add(model)
+
+    @base.async_error_catcher
+    @base.async_dead_lock_catcher
+    async def adelete(self, model):
+        """Delete the model, the asynchronous `model.delete`."""
+        self.identity_map.remove(model)
+        return await model.get_table().adelete(
+            engine=self._engine,
+            ids=model._get_prepared_data(model.get_id_properties()),
+            session=self,
+        )
+
+    async def rollback(self):
+        await self._conn.rollback()
+        self._reset_table_changes(committed=False)
+        self.identity_map.clear()
+
+    async def commit(self):
+        await self._conn.commit()
+        self._reset_table_changes(committed=True)
+
+    async def close(self):
+        await self._engine.close_connection(self._conn)
+
+
 @contextlib.contextmanager
 def session_manager(engine, session=None):
     if session is None:
@@ -352,6 +1350,23 @@ def session_manager(engine, session=None):
         yield session
 
 
+@contextlib.asynccontextmanager
+async def async_session_manager(engine, session=None):
+    """The same as `session_manager` but for asyncio engines."""
+    if session is None:
+        session = await engine.get_session()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+    else:
+        yield session
+
+
 class SessionConflict(Exception):
     pass
 
@@ -390,3 +1405,32 @@ class SessionThreadStorage(object):
         except SessionNotFound:
             self._storage.session = session
             return self._storage.session
+
+
+class SessionContextStorage(SessionThreadStorage):
+    """Session storage bound to the current asyncio task.
+
+    Every task runs in its own copy of the context, so concurrent tasks
+    of one thread don't share the stored session.
+    """
+
+    _storage = contextvars.ContextVar("restalchemy_session", default=None)
+
+    def get_session(self):
+        session = self._storage.get()
+        if session is None:
+            raise SessionNotFound("A session is not exists for this context")
+        return session
+
+    def remove_session(self):
+        self._storage.set(None)
+
+    def store_session(self, session):
+        try:
+            stored_session = self.get_session()
+            raise SessionConflict(
+                "Another session %r is already stored!", stored_session
+            )
+        except SessionNotFound:
+            self._storage.set(session)
+            return session
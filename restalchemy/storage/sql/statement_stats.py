@@ -0,0 +1,299 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import functools
+import logging
+import re
+import threading
+import time
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_SHAPES = 256
+DEFAULT_LATENCY_WINDOW = 512
+DEFAULT_EXPLAIN_INTERVAL = 60.0
+DEFAULT_TOP_LIMIT = 10
+FINGERPRINT_CACHE_SIZE = 1024
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST_RE = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))+\s*\)")
+_REPEATED_LIST_RE = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=FINGERPRINT_CACHE_SIZE)
+def fingerprint(statement):
+    """
+    Returns the normalized shape of a statement.
+
+    Literals are replaced with `?`, lists of placeholders (IN lists, rows
+    of batch inserts) are collapsed to `(...)`, so statements which differ
+    only in values or in the number of values have the same fingerprint.
+
+    :param statement: The SQL statement.
+    :rtype: str
+    """
+    result = _LITERAL_RE.sub("?", statement)
+    result = _PLACEHOLDER_LIST_RE.sub("(...)", result)
+    result = _REPEATED_LIST_RE.sub("(...)", result)
+    return _WHITESPACE_RE.sub(" ", result).strip()
+
+
+def get_values_shape(values):
+    """
+    Returns the types of the bound values without the values themselves.
+
+    :param values: The values bound to a statement.
+    :rtype: str
+    """
+    if values is None:
+        return "()"
+    if isinstance(values, dict):
+        items = sorted(
+            "%s: %s" % (name, type(value).__name__) for name, value in values.items()
+        )
+        return "{%s}" % ", ".join(items)
+    return "(%s)" % ", ".join(
+        "%s[%d]" % (type(value).__name__, len(value))
+        if isinstance(value, (list, tuple))
+        else type(value).__name__
+        for value in values
+    )
+
+
+class ShapeStats(object):
+    """The statistics of the statements with the same fingerprint."""
+
+    def __init__(self, fingerprint, latency_window=DEFAULT_LATENCY_WINDOW):
+        super(ShapeStats, self).__init__()
+        self.fingerprint = fingerprint
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.slow_calls = 0
+        self.plan = None
+        self.explained_at = None
+        self.latencies = collections.deque(maxlen=latency_window)
+
+    def get_percentile(self, percentile):
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return 0.0
+        index = int(len(latencies) * percentile / 100.0)
+        return latencies[min(index, len(latencies) - 1)]
+
+    def to_dict(self):
+        return {
+            "fingerprint": self.fingerprint,
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.calls if self.calls else 0.0,
+            "max_time": self.max_time,
+            "p99_time": self.get_percentile(99),
+            "rows": self.rows,
+            "slow_calls": self.slow_calls,
+            "plan": self.plan,
+        }
+
+
+class StatementStats(object):
+    """In-process statistics of executed statements by fingerprint.
+
+    Sessions record every statement when the registry is enabled. Statements
+    slower than `slow_threshold` seconds are logged with the types of their
+    values. With `explain` enabled, the plan of a slow select is captured
+    at most once per `explain_interval` seconds for each fingerprint.
+    """
+
+    def __init__(
+        self,
+        enabled=False,
+        slow_threshold=None,
+        explain=False,
+        explain_interval=DEFAULT_EXPLAIN_INTERVAL,
+        max_shapes=DEFAULT_MAX_SHAPES,
+        latency_window=DEFAULT_LATENCY_WINDOW,
+    ):
+        super(StatementStats, self).__init__()
+        self._lock = threading.Lock()
+        self._shapes = {}
+        self._dropped = 0
+        self._listeners = ()
+        self.configure(
+            enabled=enabled,
+            slow_threshold=slow_threshold,
+            explain=explain,
+            explain_interval=explain_interval,
+            max_shapes=max_shapes,
+            latency_window=latency_window,
+        )
+
+    def configure(
+        self,
+        enabled=True,
+        slow_threshold=None,
+        explain=False,
+        explain_interval=DEFAULT_EXPLAIN_INTERVAL,
+        max_shapes=DEFAULT_MAX_SHAPES,
+        latency_window=DEFAULT_LATENCY_WINDOW,
+    ):
+        """
+        Sets the options of the registry and clears it.
+
+        :param enabled: Whether statements are recorded.
+        :param slow_threshold: The duration in seconds from which a
+            statement is logged as slow. None disables the log.
+        :param explain: Whether plans of slow selects are captured.
+        :param explain_interval: The minimum time in seconds between plan
+            captures of a fingerprint.
+        :param max_shapes: The maximum number of fingerprints, statements
+            of new fingerprints are dropped when it's reached.
+        :param latency_window: The number of the last latencies of a
+            fingerprint used for percentiles.
+        """
+        with self._lock:
+            self._enabled = enabled
+            self._slow_threshold = slow_threshold
+            self._explain = explain
+            self._explain_interval = explain_interval
+            self._max_shapes = max_shapes
+            self._latency_window = latency_window
+        self.clear()
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    def add_listener(self, listener):
+        """
+        Adds a callable which is called with the duration in seconds of
+        every executed statement, even if the registry is disabled.
+        """
+        with self._lock:
+            self._listeners += (listener,)
+
+    def remove_listener(self, listener):
+        with self._lock:
+            self._listeners = tuple(
+                item for item in self._listeners if item is not listener
+            )
+
+    def _get_shape(self, key):
+        # NOTE(efrolov): The method must be called under the lock.
+        shape = self._shapes.get(key)
+        if shape is None:
+            if len(self._shapes) >= self._max_shapes:
+                self._dropped += 1
+                return None
+            shape = self._shapes[key] = ShapeStats(key, self._latency_window)
+        return shape
+
+    def _should_explain(self, shape, statement, now):
+        # NOTE(efrolov): The method must be called under the lock.
+        keyword = statement.lstrip()[:6].upper()
+        if not self._explain or not keyword.startswith(("SELECT", "WITH")):
+            return False
+        if (
+            shape.explained_at is not None
+            and now - shape.explained_at < self._explain_interval
+        ):
+            return False
+        shape.explained_at = now
+        return True
+
+    def record(self, statement, values, duration, rows, explain=None):
+        """
+        Records an executed statement.
+
+        :param statement: The SQL statement.
+        :param values: The values bound to the statement.
+        :param duration: The execution time in seconds.
+        :param rows: The number of returned or affected rows.
+        :param explain: A callable without arguments which returns the plan
+            of the statement, it's called for slow selects if plans are
+            captured.
+        """
+        for listener in self._listeners:
+            listener(duration)
+        if not self._enabled:
+            return
+        key = fingerprint(statement)
+        slow = self._slow_threshold is not None and duration >= self._slow_threshold
+        with self._lock:
+            shape = self._get_shape(key)
+            if shape is not None:
+                shape.calls += 1
+                shape.total_time += duration
+                shape.max_time = max(shape.max_time, duration)
+                shape.rows += max(rows or 0, 0)
+                shape.latencies.append(duration)
+                shape.slow_calls += int(slow)
+            capture = (
+                slow
+                and explain is not None
+                and shape is not None
+                and self._should_explain(shape, statement, time.monotonic())
+            )
+        if not slow:
+            return
+
+        plan = None
+        if capture:
+            try:
+                plan = explain()
+            except Exception:
+                LOG.warning("Failed to explain the statement %s", key, exc_info=True)
+            else:
+                with self._lock:
+                    shape.plan = plan
+        LOG.warning(
+            "Slow statement (%.3f sec): %s with values %s%s",
+            duration,
+            key,
+            get_values_shape(values),
+            "" if plan is None else ", plan: %s" % (plan,),
+        )
+
+    def get_top(self, limit=DEFAULT_TOP_LIMIT, order_by="total_time"):
+        """
+        Returns the statistics of the heaviest fingerprints.
+
+        :param limit: The maximum number of fingerprints.
+        :param order_by: The key to sort by in descending order: one of
+            `calls`, `total_time`, `mean_time`, `max_time`, `p99_time`,
+            `rows` and `slow_calls`.
+        :return: A list of dictionaries with the keys above, `fingerprint`
+            and the last captured `plan`.
+        :rtype: list
+        """
+        with self._lock:
+            shapes = [shape.to_dict() for shape in self._shapes.values()]
+        if shapes and order_by not in shapes[0]:
+            raise ValueError("Unknown statistic %s" % order_by)
+        shapes.sort(key=lambda shape: shape[order_by], reverse=True)
+        return shapes[:limit]
+
+    def get_dropped(self):
+        """Returns the number of statements of fingerprints over the limit."""
+        with self._lock:
+            return self._dropped
+
+    def clear(self):
+        with self._lock:
+            self._shapes.clear()
+            self._dropped = 0
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from restalchemy.storage.sql import result_cache
 
 OPERATIONAL_STORAGE_SIMPLE_TABLE_KEY = "table"
 
@@ -27,23 +28,40 @@ class SQLTable(object):
     def model(self):
         return self._model
 
-    def get_column_names(self, session, with_pk=True, do_sort=True):
+    def get_column_names(self, session, with_pk=True, do_sort=True, with_deferred=True):
+        """
+        :param with_deferred: Include the columns of deferred properties.
+            Selects leave them out, writes need all columns.
+        """
         result = []
+        deferred = frozenset() if with_deferred else self.get_deferred_column_names()
         for name, prop in self._model.properties.items():
             if not with_pk and prop.is_id_property():
                 continue
+            if name in deferred:
+                continue
             result.append(name)
         if do_sort:
             result.sort()
         return result
 
-    def get_escaped_column_names(self, session, with_pk=True, do_sort=True):
+    def get_deferred_column_names(self):
+        return frozenset(
+            name
+            for name, prop in self._model.properties.properties.items()
+            if prop.is_deferred()
+        )
+
+    def get_escaped_column_names(
+        self, session, with_pk=True, do_sort=True, with_deferred=True
+    ):
         return [
             session.engine.escape(column_name)
             for column_name in self.get_column_names(
                 session=session,
                 with_pk=with_pk,
                 do_sort=do_sort,
+                with_deferred=with_deferred,
             )
         ]
 
@@ -70,6 +88,7 @@ class SQLTable(object):
         return self._table_name
 
     def insert(self, engine, data, session):
+        session.track_table_change(self.name)
         cmd = engine.dialect.insert(
             table=self,
             data=data,
@@ -77,7 +96,26 @@ class SQLTable(object):
         )
         return cmd.execute()
 
+    def upsert(
+        self,
+        engine,
+        rows,
+        session,
+        conflict_columns=None,
+        update_columns=None,
+    ):
+        session.track_table_change(self.name)
+        cmd = engine.dialect.upsert(
+            table=self,
+            rows=rows,
+            session=session,
+            conflict_columns=conflict_columns,
+            update_columns=update_columns,
+        )
+        return cmd.execute()
+
     def update(self, engine, ids, data, session):
+        session.track_table_change(self.name)
         cmd = engine.dialect.update(
             table=self,
             ids=ids,
@@ -87,6 +125,7 @@ class SQLTable(object):
         return cmd.execute()
 
     def delete(self, engine, ids, session):
+        session.track_table_change(self.name)
         cmd = engine.dialect.delete(
             table=self,
             ids=ids,
@@ -94,13 +133,46 @@ class SQLTable(object):
         )
         return cmd.execute()
 
-    def select(self, engine, filters, session, limit=None, order_by=None, locked=False):
-        """
+    async def ainsert(self, engine, data, session):
+        session.track_table_change(self.name)
+        cmd = engine.dialect.insert(
+            table=self,
+            data=data,
+            session=session,
+        )
+        return await cmd.aexecute()
 
-        Warning: query with and w/o (limit or group_by) won't flush each other
-        if cached!
-        """
-        q = engine.dialect.orm.select(self._model, session).where(
+    async def aupdate(self, engine, ids, data, session):
+        session.track_table_change(self.name)
+        cmd = engine.dialect.update(
+            table=self,
+            ids=ids,
+            data=data,
+            session=session,
+        )
+        return await cmd.aexecute()
+
+    async def adelete(self, engine, ids, session):
+        session.track_table_change(self.name)
+        cmd = engine.dialect.delete(
+            table=self,
+            ids=ids,
+            session=session,
+        )
+        return await cmd.aexecute()
+
+    def _build_select(
+        self,
+        engine,
+        filters,
+        session,
+        limit,
+        order_by,
+        locked,
+        fields=None,
+        with_total_count=False,
+    ):
+        q = engine.dialect.orm.select(self._model, session, fields=fields).where(
             filters=filters,
         )
 
@@ -113,13 +185,131 @@ class SQLTable(object):
         if locked:
             q.for_(share=not locked)
 
-        cmd = engine.dialect.orm_command(
+        if with_total_count:
+            q.with_total_count()
+
+        return q
+
+    def _get_select_command(
+        self,
+        engine,
+        filters,
+        session,
+        limit,
+        order_by,
+        locked,
+        fields=None,
+        with_total_count=False,
+    ):
+        q = engine.statement_cache.get(
+            model=self._model,
+            session=session,
+            build=lambda: self._build_select(
+                engine=engine,
+                filters=filters,
+                session=session,
+                limit=limit,
+                order_by=order_by,
+                locked=locked,
+                fields=fields,
+                with_total_count=with_total_count,
+            ),
+            filters=filters,
+            limit=limit,
+            order_by=order_by,
+            locked=locked,
+            fields=fields,
+            with_total_count=with_total_count,
+        )
+
+        return engine.dialect.orm_command(
             table=self,
             query=q,
             session=session,
         )
+
+    def _execute_select(self, engine, session, cmd, shared_cache):
+        if shared_cache:
+            return result_cache.shared_cache.execute(
+                engine=engine,
+                session=session,
+                table_names=cmd.get_table_names(),
+                command=cmd,
+            )
         return cmd.execute()
 
+    def select(
+        self,
+        engine,
+        filters,
+        session,
+        limit=None,
+        order_by=None,
+        locked=False,
+        shared_cache=False,
+        fields=None,
+        with_total_count=False,
+    ):
+        """
+
+        Warning: query with and w/o (limit or group_by) won't flush each other
+        if cached!
+
+        :param shared_cache: Use the process-wide result cache, see
+            `result_cache.ResultCache`.
+        :param fields: Names of the model properties to select, all of them
+            by default.
+        :param with_total_count: Select the number of rows matching the
+            filters into every row, see `SelectQ.with_total_count`.
+        """
+        cmd = self._get_select_command(
+            engine=engine,
+            filters=filters,
+            session=session,
+            limit=limit,
+            order_by=order_by,
+            locked=locked,
+            fields=fields,
+            with_total_count=with_total_count,
+        )
+        return self._execute_select(engine, session, cmd, shared_cache)
+
+    async def aselect(
+        self, engine, filters, session, limit=None, order_by=None, locked=False
+    ):
+        cmd = self._get_select_command(
+            engine=engine,
+            filters=filters,
+            session=session,
+            limit=limit,
+            order_by=order_by,
+            locked=locked,
+        )
+        return await cmd.aexecute()
+
+    def select_stream(self, engine, filters, session, order_by=None, batch_size=None):
+        q = engine.statement_cache.get(
+            model=self._model,
+            session=session,
+            build=lambda: self._build_select(
+                engine=engine,
+                filters=filters,
+                session=session,
+                limit=None,
+                order_by=order_by,
+                locked=False,
+            ),
+            filters=filters,
+            order_by=order_by,
+        )
+
+        cmd = engine.dialect.orm_command(
+            table=self,
+            query=q,
+            session=session,
+        )
+        return cmd.execute_stream(batch_size=batch_size)
+
     def custom_select(
         self,
         engine,
@@ -129,6 +319,7 @@ class SQLTable(object):
         limit=None,
         order_by=None,
         locked=False,
+        shared_cache=False,
     ):
         cmd = engine.dialect.custom_select(
             table=self,
@@ -139,12 +330,31 @@ class SQLTable(object):
             locked=locked,
             session=session,
         )
-        return cmd.execute()
+        return self._execute_select(engine, session, cmd, shared_cache)
 
-    def count(self, engine, session, filters):
+    def count(self, engine, session, filters, shared_cache=False):
         cmd = engine.dialect.count(
             table=self,
             filters=filters,
             session=session,
         )
-        return cmd.execute()
+        return self._execute_select(engine, session, cmd, shared_cache)
+
+    def estimate_count(self, engine, session, filters):
+        """
+        Returns the estimated number of rows or None if it's unknown.
+        """
+        cmd = engine.dialect.estimate_count(
+            table=self,
+            filters=filters,
+            session=session,
+        )
+        return cmd.parse_estimate(cmd.execute().get_rows())
+
+    async def acount(self, engine, session, filters):
+        cmd = engine.dialect.count(
+            table=self,
+            filters=filters,
+            session=session,
+        )
+        return await cmd.aexecute()
@@ -18,10 +18,17 @@ import tempfile
 import unittest
 
 import mock
+import webob
 
+from restalchemy.api import constants
+from restalchemy.api import contexts
 from restalchemy.api import controllers
 from restalchemy.api import packers
+from restalchemy.api import resources
 from restalchemy.dm import filters as dm_filters
+from restalchemy.dm import models
+from restalchemy.dm import properties
+from restalchemy.dm import types
 
 FAKE_LOCATION_PATH = "fake location path"
 
@@ -390,3 +397,142 @@ class TestAutoFiltersAndValues(unittest.TestCase):
             },
             filters,
         )
+
+
+class FieldsModel(models.ModelWithUUID, models.CustomPropertiesMixin):
+    name = properties.property(types.String())
+    description = properties.property(types.String())
+
+
+class FieldsController(controllers.BaseResourceControllerPaginated):
+    __resource__ = resources.ResourceByRAModel(FieldsModel, convert_underscore=False)
+
+
+class TestStorageFields(unittest.TestCase):
+    def setUp(self):
+        super(TestStorageFields, self).setUp()
+        FieldsModel.objects = mock.Mock()
+        FieldsModel.objects.get_all.return_value = []
+        self.addCleanup(delattr, FieldsModel, "objects")
+
+    def _make_controller(self, query, method=constants.FILTER):
+        request = webob.Request.blank("/" + query)
+        request.api_context = contexts.RequestContext(request)
+        request.api_context.set_active_method(method)
+        controller = FieldsController(request)
+        controller._prepare_pagination_meta()
+        return controller
+
+    def test_filter_passes_fields(self):
+        controller = self._make_controller("?fields=uuid&fields=name")
+
+        controller.filter(filters={})
+
+        self.assertEqual(
+            {"uuid", "name"}, FieldsModel.objects.get_all.call_args[1]["fields"]
+        )
+
+    def test_paginated_filter_passes_fields(self):
+        controller = self._make_controller("?fields=name&page_limit=1")
+
+        controller.filter(filters={})
+
+        self.assertEqual({"name"}, FieldsModel.objects.get_all.call_args[1]["fields"])
+
+    def test_get_passes_fields(self):
+        controller = self._make_controller("?fields=name", method=constants.GET)
+
+        controller.get(uuid="resource-id")
+
+        self.assertEqual({"name"}, FieldsModel.objects.get_one.call_args[1]["fields"])
+
+    def test_update_selects_all_fields(self):
+        controller = self._make_controller("?fields=name", method=constants.UPDATE)
+
+        controller.update(uuid="resource-id", name="new")
+
+        self.assertIsNone(FieldsModel.objects.get_one.call_args[1]["fields"])
+
+    def test_without_fields(self):
+        controller = self._make_controller("")
+
+        controller.filter(filters={})
+
+        self.assertIsNone(FieldsModel.objects.get_all.call_args[1]["fields"])
+
+    def test_unknown_field_selects_all_fields(self):
+        controller = self._make_controller("?fields=name&fields=unknown")
+
+        controller.filter(filters={})
+
+        self.assertIsNone(FieldsModel.objects.get_all.call_args[1]["fields"])
+
+    def test_custom_properties_select_all_fields(self):
+        controller = self._make_controller("?fields=name")
+
+        with mock.patch.object(
+            FieldsModel, "__custom_properties__", {"custom": types.String()}
+        ):
+            controller.filter(filters={})
+
+        self.assertIsNone(FieldsModel.objects.get_all.call_args[1]["fields"])
+
+
+class TotalCountController(FieldsController):
+    _with_total_count = True
+
+
+class TestTotalCount(unittest.TestCase):
+    def setUp(self):
+        super(TestTotalCount, self).setUp()
+        FieldsModel.objects = mock.Mock()
+        FieldsModel.objects.get_all_with_count.return_value = ([], 7)
+        FieldsModel.objects.count.return_value = 7
+        self.addCleanup(delattr, FieldsModel, "objects")
+
+    def _make_controller(self, query):
+        request = webob.Request.blank("/" + query)
+        request.api_context = contexts.RequestContext(request)
+        request.api_context.set_active_method(constants.FILTER)
+        controller = TotalCountController(request)
+        controller._prepare_pagination_meta()
+        return controller
+
+    @mock.patch.object(controllers.Controller, "_create_response")
+    def test_first_page_selects_total(self, create_response_mock):
+        controller = self._make_controller("?page_limit=2")
+
+        body = controller.filter(filters={})
+        controller._create_response(body, 200, {})
+
+        FieldsModel.objects.get_all_with_count.assert_called_once()
+        FieldsModel.objects.count.assert_not_called()
+        headers = create_response_mock.call_args[0][2]
+        self.assertEqual("7", headers["X-Total-Count"])
+
+    def test_page_with_marker_counts_total(self):
+        FieldsModel.objects.get_all.return_value = []
+        controller = self._make_controller(
+            "?page_limit=2&page_marker=00000000-0000-0000-0000-000000000001"
+        )
+
+        controller.filter(filters={"name": dm_filters.EQ("a")})
+
+        FieldsModel.objects.count.assert_called_once_with(
+            filters={"name": dm_filters.EQ("a")}
+        )
+        FieldsModel.objects.get_all_with_count.assert_not_called()
+        self.assertEqual(7, controller._total_count)
+
+    def test_disabled_by_default(self):
+        FieldsModel.objects.get_all.return_value = []
+        request = webob.Request.blank("/?page_limit=2")
+        request.api_context = contexts.RequestContext(request)
+        request.api_context.set_active_method(constants.FILTER)
+        controller = FieldsController(request)
+        controller._prepare_pagination_meta()
+
+        controller.filter(filters={})
+
+        FieldsModel.objects.get_all_with_count.assert_not_called()
+        self.assertIsNone(controller._total_count)
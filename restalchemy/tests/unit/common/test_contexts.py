@@ -18,6 +18,7 @@ import unittest
 import mock
 
 from restalchemy.common import contexts
+from restalchemy.storage.sql import engine_groups
 from restalchemy.storage.sql import engines
 from restalchemy.storage.sql import sessions
 
@@ -36,6 +37,7 @@ class TestContext(unittest.TestCase):
         engine_factory_mock.configure_mock(
             **{
                 "get_engine.return_value": self._engine,
+                "has_engine_group.return_value": False,
             }
         )
         self._engine.configure_mock(
@@ -182,6 +184,33 @@ class TestContext(unittest.TestCase):
         readonly_session.commit.assert_not_called()
         self._session.commit.assert_not_called()
 
+    def test_readonly_uses_engine_group_replica(self, engine_factory_mock):
+        self._configure_mocks(engine_factory_mock)
+        replica_engine = mock.Mock(spec=engines.MySQLEngine)
+        replica_session = mock.Mock(spec=sessions.MySQLSession)
+        replica_engine.configure_mock(
+            **{
+                "get_session.return_value": replica_session,
+                "get_session_storage.return_value": self._storage,
+            }
+        )
+        group = engine_groups.EngineGroup(
+            primary=self._engine, replicas={"replica": replica_engine}
+        )
+        engine_factory_mock.has_engine_group.return_value = True
+        engine_factory_mock.get_engine_group.return_value = group
+        context = contexts.Context()
+        context.set_readonly(True)
+
+        with context.session_manager():
+            self.assertIs(replica_engine, context._engine)
+            self.assertEqual(1, group.replicas[0].outstanding)
+
+        self.assertEqual(0, group.replicas[0].outstanding)
+        self.assertEqual(0, group.replicas[0].failures)
+        replica_engine.get_session.assert_called_once()
+        self._engine.get_session.assert_not_called()
+
     def test_readonly_not_set_uses_default_engine(self, engine_factory_mock):
         self._configure_mocks(engine_factory_mock)
         context = contexts.Context(readonly_engine_name="readonly")
@@ -140,3 +140,34 @@ class JSONFieldsFilterTestCase(base.BaseTestCase):
             filters.JSONFields,
             {"kind": filters.OR({"a": filters.EQ(1)})},
         )
+
+
+class BuildKeysetFilterTestCase(base.BaseTestCase):
+    def test_sort_by_id(self):
+        self.assertEqual(
+            {"uuid": filters.GT(1)},
+            filters.build_keyset_filter("uuid", 1),
+        )
+
+    def test_sort_by_id_desc(self):
+        self.assertEqual(
+            {"uuid": filters.LT(1)},
+            filters.build_keyset_filter(
+                "uuid", 1, sort_column="uuid", sort_direction="desc"
+            ),
+        )
+
+    def test_sort_by_non_unique_column(self):
+        self.assertEqual(
+            filters.OR(
+                {"name": filters.LT("b")},
+                filters.AND({"name": filters.EQ("b")}, {"uuid": filters.GT(1)}),
+            ),
+            filters.build_keyset_filter(
+                "uuid",
+                1,
+                sort_column="name",
+                sort_value="b",
+                sort_direction="desc",
+            ),
+        )
@@ -192,6 +192,61 @@ class DirtyModelTestCase(base.BaseTestCase):
         self.assertFalse(self._model.is_dirty())
 
 
+DEFAULT_INT = mock.Mock(return_value=1)
+
+
+class TrustedRestoreModel(models.ModelWithUUID):
+    int_property = properties.property(types.Integer(), default=DEFAULT_INT)
+    dict_property = properties.property(types.Dict(), mutable=True)
+    required_property = properties.property(types.Integer(), required=True)
+
+    def validate(self):
+        raise AssertionError("validate should not be called")
+
+
+class TrustedRestoreTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(TrustedRestoreTestCase, self).setUp()
+        DEFAULT_INT.reset_mock()
+        self.uuid = uuid.uuid4()
+
+    def test_values_are_not_validated(self):
+        model = TrustedRestoreModel.restore_trusted(
+            uuid=self.uuid,
+            int_property="not an integer",
+            dict_property={},
+            required_property=1,
+        )
+
+        self.assertEqual("not an integer", model.int_property)
+        self.assertEqual({"uuid": model.properties["uuid"]}, model.id_properties)
+        self.assertFalse(model.is_dirty())
+        DEFAULT_INT.assert_not_called()
+
+    def test_defaults_of_missing_values(self):
+        model = TrustedRestoreModel.restore_trusted(
+            uuid=self.uuid, int_property=None, required_property=1
+        )
+
+        self.assertEqual(1, model.int_property)
+        self.assertIsNone(model.dict_property)
+        DEFAULT_INT.assert_called_once_with()
+
+    def test_mutable_value_changes_are_dirty(self):
+        value = {"a": 1}
+        model = TrustedRestoreModel.restore_trusted(
+            uuid=self.uuid, int_property=1, dict_property=value, required_property=1
+        )
+
+        model.dict_property["a"] = 2
+
+        self.assertTrue(model.is_dirty())
+
+    def test_required_property(self):
+        with self.assertRaises(exceptions.PropertyRequired):
+            TrustedRestoreModel.restore_trusted(uuid=self.uuid)
+
+
 class FakeModelWithID(BaseModel):
     uuid = properties.property(types.UUID(), id_property=True)
     property3 = relationships.relationship(Model3)
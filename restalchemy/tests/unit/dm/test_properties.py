@@ -224,6 +224,35 @@ class PropertyTestCase(base.BaseTestCase):
         )
         self.assertEqual(property_obj._value, old_value)
 
+    def test_restore_skips_validation(self):
+        property_obj = properties.Property.restore(
+            self.negative_fake_property_type, FAKE_VALUE, read_only=True
+        )
+
+        self.assertEqual(FAKE_VALUE, property_obj.value)
+        self.assertTrue(property_obj.is_read_only())
+        self.assertFalse(property_obj.is_dirty())
+        self.negative_fake_property_type.validate.assert_not_called()
+
+    def test_restore_none_value(self):
+        property_obj = properties.Property.restore(
+            self.positive_fake_property_type, None, default=FAKE_VALUE
+        )
+
+        self.assertEqual(FAKE_VALUE, property_obj.value)
+
+    def test_restore_subclass_with_init(self):
+        class FakeProperty(properties.Property):
+            def __init__(self, *args, **kwargs):
+                super(FakeProperty, self).__init__(*args, **kwargs)
+
+        self.assertRaises(
+            exceptions.TypeError,
+            FakeProperty.restore,
+            self.negative_fake_property_type,
+            FAKE_VALUE,
+        )
+
 
 class PropertyCreatorTestCase(base.BaseTestCase):
     ARGS = [1, 2, 3]
@@ -248,6 +277,15 @@ class PropertyCreatorTestCase(base.BaseTestCase):
     def test_get_property_class(self):
         self.assertEqual(self.test_instance.get_property_class(), self.property_mock)
 
+    def test_restore(self):
+        self.assertEqual(
+            self.property_mock.restore.return_value,
+            self.test_instance.restore(FAKE_VALUE2),
+        )
+        self.property_mock.restore.assert_called_once_with(
+            self.prop_type_mock, FAKE_VALUE2, *self.ARGS, **self.KWARGS
+        )
+
 
 class PropertyCollectionTestCase(base.BaseTestCase):
     def setUp(self):
@@ -389,6 +427,76 @@ class PropertyManagerTestCase(base.BaseTestCase):
         self.assertRaises(TypeError, set_item, property_manager.properties, "fake1", 2)
 
 
+class DeferredPropertyTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(DeferredPropertyTestCase, self).setUp()
+        self.loader = mock.Mock(return_value="loaded")
+        self.collection = properties.PropertyCollection(
+            name=properties.property(types.String(), required=True),
+        )
+        self.manager = properties.PropertyManager(
+            self.collection, name=properties.DeferredValue(self.loader)
+        )
+
+    def test_required_property_is_not_instantiated(self):
+        prop = self.manager.properties["name"]
+
+        self.assertIsInstance(prop, properties.DeferredProperty)
+        self.assertFalse(prop.is_dirty())
+        self.assertTrue(prop.is_required())
+        self.assertFalse(prop.is_id_property())
+        self.loader.assert_not_called()
+
+    def test_value_is_loaded_on_access(self):
+        self.assertEqual("loaded", self.manager.properties["name"].value)
+        self.assertEqual("loaded", self.manager.properties["name"].value)
+
+        self.assertIsInstance(self.manager.properties["name"], properties.Property)
+        self.assertFalse(self.manager.properties["name"].is_dirty())
+        self.loader.assert_called_once_with()
+
+    def test_set_value(self):
+        self.manager.properties["name"].value = "new"
+
+        prop = self.manager.properties["name"]
+        self.assertEqual("new", prop.value)
+        self.assertTrue(prop.is_dirty())
+        self.assertIs(properties.UNKNOWN_VALUE, prop.old_value)
+        self.loader.assert_not_called()
+
+    def test_set_read_only_value(self):
+        collection = properties.PropertyCollection(
+            name=properties.property(types.String(), read_only=True),
+        )
+        manager = properties.PropertyManager(
+            collection, name=properties.DeferredValue(self.loader)
+        )
+
+        self.assertRaises(
+            exceptions.ReadOnlyProperty,
+            setattr,
+            manager.properties["name"],
+            "value",
+            "new",
+        )
+        self.loader.assert_called_once_with()
+
+    def test_deferred_flag(self):
+        self.assertTrue(
+            properties.property(types.String(), deferred=True).is_deferred()
+        )
+        self.assertFalse(properties.property(types.String()).is_deferred())
+
+    def test_id_property_cant_be_deferred(self):
+        self.assertRaises(
+            ValueError,
+            properties.property,
+            types.String(),
+            id_property=True,
+            deferred=True,
+        )
+
+
 @mock.patch("restalchemy.dm.properties.PropertyCreator", return_value=FAKE_VALUE)
 class PropertyFuncTestCase(base.BaseTestCase):
     ARGS = (1, 2, 3)
@@ -14,6 +14,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from restalchemy.dm import models
 from restalchemy.dm import relationships
 from restalchemy.tests.unit import base
@@ -33,3 +35,59 @@ class RelationshipTestCase(base.BaseTestCase):
             relationships.Relationship(property_type=MyModel, value=MyModel()),
             relationships.Relationship,
         )
+
+
+class MyModelWithUUID(models.ModelWithUUID):
+    pass
+
+
+class LazyRelationshipTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(LazyRelationshipTestCase, self).setUp()
+        self.model = MyModelWithUUID()
+        self.loader = mock.Mock(return_value=self.model)
+        self.prop = relationships.LazyRelationship(
+            property_type=MyModelWithUUID,
+            required=True,
+            value=relationships.LazyValue(self.model.uuid, self.loader),
+        )
+
+    def test_relationship_factory(self):
+        prop = relationships.relationship(MyModelWithUUID, lazy=True)
+
+        self.assertIs(relationships.LazyRelationship, prop.get_property_class())
+        self.assertRaises(
+            ValueError,
+            relationships.relationship,
+            MyModelWithUUID,
+            lazy=True,
+            prefetch=True,
+        )
+
+    def test_value_is_loaded_once(self):
+        self.assertFalse(self.prop.is_loaded())
+        self.loader.assert_not_called()
+
+        self.assertIs(self.model, self.prop.value)
+        self.assertIs(self.model, self.prop.value)
+
+        self.assertTrue(self.prop.is_loaded())
+        self.loader.assert_called_once_with(self.model.uuid)
+
+    def test_is_dirty(self):
+        self.assertFalse(self.prop.is_dirty())
+        value = self.prop.value
+        self.assertIs(self.model, value)
+        self.assertFalse(self.prop.is_dirty())
+
+        self.prop.value = MyModelWithUUID()
+
+        self.assertTrue(self.prop.is_dirty())
+
+    def test_set_value_without_loading(self):
+        other = MyModelWithUUID()
+
+        self.prop.value = other
+
+        self.assertIs(other, self.prop.value)
+        self.loader.assert_not_called()
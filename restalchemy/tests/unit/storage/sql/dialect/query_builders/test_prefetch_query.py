@@ -24,6 +24,7 @@ from restalchemy.dm import models
 from restalchemy.dm import properties
 from restalchemy.dm import relationships
 from restalchemy.dm import types
+from restalchemy.storage import base
 from restalchemy.storage.sql import orm
 from restalchemy.storage.sql.dialect.query_builder import q
 from restalchemy.tests import fixtures
@@ -42,6 +43,13 @@ class SimpleModel(models.ModelWithUUID, orm.SQLStorableMixin):
     field_bool = properties.property(types.Boolean(), default=True)
 
 
+class ModelWithDeferredField(models.ModelWithUUID, orm.SQLStorableMixin):
+    __tablename__ = "model_with_deferred_field"
+
+    field_str = properties.property(types.String(), default="FAKE_STR")
+    field_text = properties.property(types.String(), deferred=True)
+
+
 class ModelWithL1Relationships(models.ModelWithUUID, orm.SQLStorableMixin):
     __tablename__ = "model_with_l1_relationships"
 
@@ -58,7 +66,12 @@ class ModelWithL2Relationships(models.ModelWithUUID, orm.SQLStorableMixin):
 
 
 # NOTE(efrolov): Sort model properties for correct ordering in asserts
-for model in [SimpleModel, ModelWithL1Relationships, ModelWithL2Relationships]:
+for model in [
+    SimpleModel,
+    ModelWithDeferredField,
+    ModelWithL1Relationships,
+    ModelWithL2Relationships,
+]:
     model.properties.sort_properties()
 
 
@@ -103,6 +116,129 @@ class MySQLPrefetchQueryBuilderTestCase(unittest.TestCase):
             result,
         )
 
+    def test_table_names(self):
+        query = self.Q.select(
+            model=ModelWithL2Relationships,
+            session=fixtures.SessionFixture(),
+        )
+
+        self.assertEqual(
+            (
+                "model_with_l2_relationships",
+                "model_with_l1_relationships",
+                "simple_table",
+            ),
+            query.table_names,
+        )
+
+    def test_l1_select_fields(self):
+        query = self.Q.select(
+            model=ModelWithL1Relationships,
+            session=fixtures.SessionFixture(),
+            fields={"uuid", "ref_l0_1"},
+        )
+
+        result = query.compile()
+
+        self.assertEqual(
+            "SELECT"
+            " `t1`.`uuid` AS `t1_uuid`,"
+            " `t2`.`field_bool` AS `t2_field_bool`,"
+            " `t2`.`field_int` AS `t2_field_int`,"
+            " `t2`.`field_str` AS `t2_field_str`,"
+            " `t2`.`uuid` AS `t2_uuid`"
+            " FROM"
+            " `model_with_l1_relationships` AS `t1` "
+            "LEFT JOIN"
+            " `simple_table` AS `t2` "
+            "ON"
+            " (`t1`.`ref_l0_1` = `t2`.`uuid`)",
+            result,
+        )
+
+    def test_l1_select_fields_without_prefetch(self):
+        query = self.Q.select(
+            model=ModelWithL1Relationships,
+            session=fixtures.SessionFixture(),
+            fields={"uuid", "ref_l0_2"},
+        )
+
+        result = query.compile()
+
+        self.assertEqual(
+            "SELECT"
+            " `t1`.`ref_l0_2` AS `t1_ref_l0_2`,"
+            " `t1`.`uuid` AS `t1_uuid`"
+            " FROM"
+            " `model_with_l1_relationships` AS `t1`",
+            result,
+        )
+        self.assertEqual(
+            {"ref_l0_2": None, "uuid": FAKE_UUID0},
+            dict(query.parse_row({"t1_ref_l0_2": None, "t1_uuid": FAKE_UUID0})),
+        )
+
+    def test_select_without_deferred_fields(self):
+        query = self.Q.select(
+            model=ModelWithDeferredField,
+            session=fixtures.SessionFixture(),
+        )
+
+        self.assertEqual(
+            "SELECT"
+            " `t1`.`field_str` AS `t1_field_str`,"
+            " `t1`.`uuid` AS `t1_uuid`"
+            " FROM"
+            " `model_with_deferred_field` AS `t1`",
+            query.compile(),
+        )
+
+    def test_select_undeferred_fields(self):
+        query = self.Q.select(
+            model=ModelWithDeferredField,
+            session=fixtures.SessionFixture(),
+            fields={"uuid", "field_text"},
+        )
+
+        self.assertEqual(
+            "SELECT"
+            " `t1`.`field_text` AS `t1_field_text`,"
+            " `t1`.`uuid` AS `t1_uuid`"
+            " FROM"
+            " `model_with_deferred_field` AS `t1`",
+            query.compile(),
+        )
+
+    def test_select_with_total_count(self):
+        query = self.Q.select(
+            model=ModelWithDeferredField,
+            session=fixtures.SessionFixture(),
+        )
+        query.limit(2).with_total_count()
+
+        self.assertEqual(
+            "SELECT"
+            " `t1`.`field_str` AS `t1_field_str`,"
+            " `t1`.`uuid` AS `t1_uuid`,"
+            " COUNT(*) OVER() AS `total_count`"
+            " FROM"
+            " `model_with_deferred_field` AS `t1`"
+            " LIMIT 2",
+            query.compile(),
+        )
+        self.assertEqual(
+            {"field_str": "a", "uuid": FAKE_UUID0, q.TOTAL_COUNT_FIELD: 5},
+            dict(
+                query.parse_row(
+                    {"t1_field_str": "a", "t1_uuid": FAKE_UUID0, "total_count": 5}
+                )
+            ),
+        )
+        self.assertEqual(
+            {"field_str": "a", "uuid": FAKE_UUID0, q.TOTAL_COUNT_FIELD: 5},
+            query.decode_row(("a", FAKE_UUID0, 5)),
+        )
+
     def test_l1_select_with_filters(self):
         query = self.Q.select(
             model=ModelWithL1Relationships,
@@ -332,3 +468,69 @@ class MySQLResultParserTestCase(unittest.TestCase):
             },
             result,
         )
+
+    def test_l1_prefetch_row_decoder(self):
+        select_clause = q.Q.select(
+            ModelWithL1Relationships,
+            fixtures.SessionFixture(),
+        )
+
+        result = select_clause.decode_row(
+            (
+                "FakeRsUUID",
+                "FakeUUID0",
+                "FakeBool",
+                "FakeInt",
+                "FakeStr",
+                "FakeUUID1",
+            )
+        )
+
+        self.assertEqual(
+            {
+                "uuid": "FakeUUID0",
+                "ref_l0_1": {
+                    "field_bool": "FakeBool",
+                    "field_int": "FakeInt",
+                    "field_str": "FakeStr",
+                    "uuid": "FakeUUID1",
+                },
+                "ref_l0_2": "FakeRsUUID",
+            },
+            result,
+        )
+        self.assertIsInstance(result["ref_l0_1"], base.PrefetchResult)
+
+    def test_l2_row_decoder_is_equal_to_parser(self):
+        select_clause = q.Q.select(
+            ModelWithL2Relationships,
+            fixtures.SessionFixture(),
+        )
+        aliases = [
+            "t1_ref_l1_3",
+            "t1_uuid",
+            "t2_ref_l0_2",
+            "t2_uuid",
+            "t3_field_bool",
+            "t3_field_int",
+            "t3_field_str",
+            "t3_uuid",
+            "t4_field_bool",
+            "t4_field_int",
+            "t4_field_str",
+            "t4_uuid",
+        ]
+        row = tuple("value%d" % i for i in range(len(aliases)))
+
+        self.assertEqual(
+            select_clause.parse_results([dict(zip(aliases, row))]),
+            select_clause.decode_results([row]),
+        )
+
+    def test_single_field_row_decoder(self):
+        decoder = q.RowDecoder(["uuid"], [1])
+
+        self.assertEqual({"uuid": "b"}, decoder.decode(("a", "b")))
+
+    def test_unknown_positions(self):
+        self.assertRaises(ValueError, q.RowDecoder, ["uuid"], [None])
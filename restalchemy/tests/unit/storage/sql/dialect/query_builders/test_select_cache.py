@@ -0,0 +1,153 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+from restalchemy.dm import filters
+from restalchemy.storage.sql.dialect.query_builder import q
+from restalchemy.tests import fixtures
+from restalchemy.tests.unit.storage.sql.dialect.query_builders import test_simple_query
+
+SimpleModel = test_simple_query.SimpleModel
+
+
+class SelectQCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        super(SelectQCacheTestCase, self).setUp()
+        self.session = fixtures.SessionFixture()
+        self.cache = q.SelectQCache(max_size=2)
+
+    def _get(
+        self,
+        filters=None,
+        limit=None,
+        order_by=None,
+        cache=None,
+        fields=None,
+        with_total_count=False,
+    ):
+        def build():
+            query = q.Q.select(SimpleModel, self.session, fields=fields).where(filters)
+            for name, sort_type in (order_by or {}).items():
+                query.order_by(name, sort_type)
+            if limit:
+                query.limit(limit)
+            if with_total_count:
+                query.with_total_count()
+            return query
+
+        cache = self.cache if cache is None else cache
+        return cache.get(
+            model=SimpleModel,
+            session=self.session,
+            build=build,
+            filters=filters,
+            limit=limit,
+            order_by=order_by,
+            fields=fields,
+            with_total_count=with_total_count,
+        )
+
+    def test_hit_reuses_statement_and_rebinds_values(self):
+        first = self._get({"field_int": filters.EQ(1)}, limit=2)
+        second = self._get({"field_int": filters.EQ(5)}, limit=2)
+
+        self.assertEqual(first.compile(), second.compile())
+        self.assertEqual([1], first.values())
+        self.assertEqual([5], second.values())
+        self.assertEqual(
+            {"hits": 1, "misses": 1, "size": 1, "max_size": 2},
+            self.cache.get_stats(),
+        )
+
+    def test_values_are_equal_to_built_query(self):
+        flt = filters.OR(
+            filters.AND({"field_int": filters.In([1, 2])}),
+            filters.AND({"field_str": filters.Like("a%"), "field_bool": True}),
+        )
+        self._get(flt)
+
+        result = self._get(flt)
+
+        expected = q.Q.select(SimpleModel, self.session).where(flt)
+        self.assertEqual(expected.compile(), result.compile())
+        self.assertEqual(expected.values(), result.values())
+        self.assertEqual(1, self.cache.hits)
+
+    def test_different_shapes_are_different_entries(self):
+        self._get({"field_int": filters.EQ(1)})
+        self._get({"field_int": filters.GT(1)})
+        self._get({"field_int": filters.EQ(1)}, order_by={"field_int": "desc"})
+
+        self.assertEqual(3, self.cache.misses)
+        self.assertEqual(0, self.cache.hits)
+
+    def test_fields_are_different_entries(self):
+        full = self._get({"field_int": filters.EQ(1)})
+        projected = self._get({"field_int": filters.EQ(1)}, fields={"uuid"})
+
+        self.assertEqual(2, self.cache.misses)
+        self.assertNotEqual(full.compile(), projected.compile())
+
+    def test_total_count_is_different_entry(self):
+        page = self._get({"field_int": filters.EQ(1)})
+        counted = self._get({"field_int": filters.EQ(1)}, with_total_count=True)
+
+        self.assertEqual(2, self.cache.misses)
+        self.assertIn("COUNT(*) OVER()", counted.compile())
+        self.assertNotIn("COUNT(*) OVER()", page.compile())
+
+    def test_lru_eviction(self):
+        self._get({"field_int": filters.EQ(1)})
+        self._get({"field_str": filters.EQ("a")})
+        self._get({"field_int": filters.EQ(2)})
+        self._get({"field_bool": filters.EQ(True)})
+
+        self.assertEqual(2, len(self.cache))
+        # Recently used entry survives eviction
+        self._get({"field_int": filters.EQ(3)})
+        self.assertEqual(2, self.cache.hits)
+        # The least recently used entry has been evicted
+        self._get({"field_str": filters.EQ("b")})
+        self.assertEqual(4, self.cache.misses)
+
+    def test_parse_row(self):
+        self._get({"field_int": filters.EQ(1)})
+        query = self._get({"field_int": filters.EQ(1)})
+
+        row = {
+            "t1_field_bool": True,
+            "t1_field_int": 1,
+            "t1_field_str": "a",
+            "t1_uuid": "uuid",
+        }
+        self.assertEqual(
+            [{"field_bool": True, "field_int": 1, "field_str": "a", "uuid": "uuid"}],
+            query.parse_results([row]),
+        )
+        self.assertEqual(
+            [{"field_bool": True, "field_int": 1, "field_str": "a", "uuid": "uuid"}],
+            query.decode_results([(True, 1, "a", "uuid")]),
+        )
+
+    def test_disabled_cache(self):
+        cache = q.SelectQCache(max_size=0)
+
+        query = self._get({"field_int": filters.EQ(1)}, cache=cache)
+
+        self.assertIsInstance(query, q.SelectQ)
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.misses)
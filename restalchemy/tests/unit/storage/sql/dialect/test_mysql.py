@@ -26,6 +26,7 @@ from restalchemy.dm import types
 from restalchemy.storage.sql import tables
 from restalchemy.storage.sql.dialect import exceptions as dialect_exc
 from restalchemy.storage.sql.dialect import mysql
+from restalchemy.storage.sql.dialect.query_builder import q
 from restalchemy.tests import fixtures
 from restalchemy.tests.unit import base
 
@@ -46,10 +47,18 @@ class MultipleIdModel(BaseModel):
         return {"tenant_id": cls.properties["tenant_id"]}
 
 
+class DeferredModel(BaseModel):
+    field_text = properties.property(types.String(), deferred=True)
+
+
 FAKE_TABLE = tables.SQLTable(
     engine=None, table_name=BaseModel.__tablename__, model=BaseModel
 )
 
+DEFERRED_FAKE_TABLE = tables.SQLTable(
+    engine=None, table_name=DeferredModel.__tablename__, model=DeferredModel
+)
+
 EXTENDED_FAKE_TABLE = tables.SQLTable(
     engine=None,
     table_name=MultipleIdModel.__tablename__,
@@ -111,13 +120,78 @@ class MySQLInsertTestCase(base.BaseTestCase, AbstractDialectCommandTestMixin):
         )
 
 
+class MySQLBatchInsertTestCase(base.BaseTestCase, AbstractDialectCommandTestMixin):
+    def setUp(self):
+        self.target = mysql.MySQLBatchInsert(
+            FAKE_TABLE,
+            [FAKE_VALUES, FAKE_VALUES],
+            session=fixtures.SessionFixture(),
+        )
+
+    def test_statement(self):
+        self.assertEqual(
+            self.target.get_statement(),
+            "INSERT INTO `FAKE_TABLE` (`field_bool`, `field_int`, "
+            "`field_str`, `uuid`) VALUES (%s, %s, %s, %s), (%s, %s, %s, %s)",
+        )
+
+    def test_values(self):
+        self.assertEqual(tuple(FAKE_VALUES * 2), self.target.get_values())
+
+
+class MySQLUpsertTestCase(base.BaseTestCase, AbstractDialectCommandTestMixin):
+    def setUp(self):
+        self.target = mysql.MySQLUpsert(
+            FAKE_TABLE,
+            [FAKE_VALUES],
+            session=fixtures.SessionFixture(),
+            update_columns=["field_int", "field_str"],
+        )
+
+    def test_statement(self):
+        self.assertEqual(
+            self.target.get_statement(),
+            "INSERT INTO `FAKE_TABLE` (`field_bool`, `field_int`, "
+            "`field_str`, `uuid`) VALUES (%s, %s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE `field_int` = VALUES(`field_int`), "
+            "`field_str` = VALUES(`field_str`)",
+        )
+
+    def test_statement_default_update_columns(self):
+        target = mysql.MySQLUpsert(
+            FAKE_TABLE,
+            [FAKE_VALUES],
+            session=fixtures.SessionFixture(),
+        )
+
+        self.assertTrue(
+            target.get_statement().endswith(
+                "ON DUPLICATE KEY UPDATE `field_bool` = VALUES(`field_bool`), "
+                "`field_int` = VALUES(`field_int`), "
+                "`field_str` = VALUES(`field_str`)"
+            )
+        )
+
+    def test_statement_without_update_columns(self):
+        target = mysql.MySQLUpsert(
+            FAKE_TABLE,
+            [FAKE_VALUES],
+            session=fixtures.SessionFixture(),
+            update_columns=[],
+        )
+
+        self.assertTrue(
+            target.get_statement().endswith("ON DUPLICATE KEY UPDATE `uuid` = `uuid`")
+        )
+
+
 class MySQLUpdateTestCase(base.BaseTestCase, AbstractDialectCommandTestMixin):
     def setUp(self):
         TABLE = FAKE_TABLE
         self.target = mysql.MySQLUpdate(
             TABLE,
-            FAKE_PK_VALUES,
-            FAKE_VALUES,
+            {"uuid": "uuid"},
+            {"field_bool": True, "field_int": 111, "field_str": "field2"},
             session=fixtures.SessionFixture(),
         )
 
@@ -128,14 +202,28 @@ class MySQLUpdateTestCase(base.BaseTestCase, AbstractDialectCommandTestMixin):
             "`field_str` = %s WHERE `uuid` = %s",
         )
 
+    def test_statement_with_partial_data(self):
+        target = mysql.MySQLUpdate(
+            FAKE_TABLE,
+            {"uuid": "uuid"},
+            {"field_str": "field2"},
+            session=fixtures.SessionFixture(),
+        )
+
+        self.assertEqual(
+            "UPDATE `FAKE_TABLE` SET `field_str` = %s WHERE `uuid` = %s",
+            target.get_statement(),
+        )
+        self.assertEqual(("field2", "uuid"), target.get_values())
+
 
 class MySQLUpdateMultipleIdTestCase(base.BaseTestCase, AbstractDialectCommandTestMixin):
     def setUp(self):
         TABLE = EXTENDED_FAKE_TABLE
         self.target = mysql.MySQLUpdate(
             TABLE,
-            EXTENDED_FAKE_PK_VALUES,
-            EXTENDED_FAKE_VALUES,
+            {"tenant_id": "tenant_id", "uuid": "uuid"},
+            {"field_bool": True, "field_int": 111, "field_str": "field2"},
             session=fixtures.SessionFixture(),
         )
 
@@ -147,6 +235,32 @@ class MySQLUpdateMultipleIdTestCase(base.BaseTestCase, AbstractDialectCommandTes
         )
 
 
+class MySQLBatchUpdateTestCase(base.BaseTestCase, AbstractDialectCommandTestMixin):
+    def setUp(self):
+        self.target = mysql.MySQLBatchUpdate(
+            FAKE_TABLE,
+            ["field_int", "field_str"],
+            [("uuid1", 1, "a"), ("uuid2", 2, "b")],
+            session=fixtures.SessionFixture(),
+        )
+
+    def test_statement(self):
+        self.assertEqual(
+            self.target.get_statement(),
+            "UPDATE `FAKE_TABLE` JOIN (SELECT %s AS `uuid`, %s AS `field_int`, "
+            "%s AS `field_str` UNION ALL SELECT %s, %s, %s) AS `v` "
+            "ON `FAKE_TABLE`.`uuid` = `v`.`uuid` "
+            "SET `FAKE_TABLE`.`field_int` = `v`.`field_int`, "
+            "`FAKE_TABLE`.`field_str` = `v`.`field_str`",
+        )
+
+    def test_values(self):
+        self.assertEqual(
+            ("uuid1", 1, "a", "uuid2", 2, "b"),
+            self.target.get_values(),
+        )
+
+
 class MySQLDeleteTestCase(base.BaseTestCase, AbstractDialectCommandTestMixin):
     def setUp(self):
         TABLE = FAKE_TABLE
@@ -600,6 +714,32 @@ class MySQLCustomSelectTestCase(base.BaseTestCase):
             result,
         )
 
+    def test_deferred_columns_are_not_selected(self):
+        target = mysql.MySQLCustomSelect(
+            DEFERRED_FAKE_TABLE,
+            "`field_int` = %s",
+            [1],
+            session=fixtures.SessionFixture(),
+        )
+
+        self.assertEqual(
+            "SELECT `field_bool`, `field_int`, `field_str`, `uuid` "
+            "FROM `FAKE_TABLE` WHERE `field_int` = %s",
+            target.get_statement(),
+        )
+
+    def test_deferred_columns_are_inserted(self):
+        session = fixtures.SessionFixture()
+
+        self.assertEqual(
+            ["field_bool", "field_int", "field_str", "field_text", "uuid"],
+            DEFERRED_FAKE_TABLE.get_column_names(session),
+        )
+        self.assertEqual(
+            ["field_bool", "field_int", "field_str", "uuid"],
+            DEFERRED_FAKE_TABLE.get_column_names(session, with_deferred=False),
+        )
+
 
 class MySQLCountTestCase(base.BaseTestCase):
     def setUp(self):
@@ -640,3 +780,83 @@ class MySQLCountTestCase(base.BaseTestCase):
             ),
             target.get_statement(),
         )
+
+
+class MySQLEstimateCountTestCase(base.BaseTestCase):
+    def _target(self, filters=None):
+        return mysql.MySQLEstimateCount(
+            FAKE_TABLE,
+            filters=filters,
+            session=fixtures.SessionFixture(),
+        )
+
+    def test_statement(self):
+        target = self._target()
+
+        self.assertEqual(
+            "SELECT TABLE_ROWS AS count FROM information_schema.TABLES"
+            " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            target.get_statement(),
+        )
+        self.assertEqual(("FAKE_TABLE",), target.get_values())
+        self.assertEqual(42, target.parse_estimate([{"count": 42}]))
+
+    def test_statement_where(self):
+        target = self._target({"field_int": dm_filters.EQ(1)})
+
+        self.assertEqual(
+            "EXPLAIN SELECT 1 FROM `FAKE_TABLE` WHERE `field_int` = %s",
+            target.get_statement(),
+        )
+        self.assertEqual([1], list(target.get_values()))
+        self.assertEqual(25, target.parse_estimate([{"rows": 100, "filtered": 25.0}]))
+
+    def test_impossible_where_has_no_estimate(self):
+        target = self._target({"field_int": dm_filters.EQ(1)})
+
+        self.assertIsNone(target.parse_estimate([{"rows": None, "filtered": None}]))
+
+
+class MySqlOrmDialectCommandTestCase(base.BaseTestCase):
+    def _target(self, tuple_rows):
+        query = q.Q.select(BaseModel, fixtures.SessionFixture()).where(
+            {"field_int": dm_filters.EQ(1)}
+        )
+        session = mock.Mock()
+        session.engine.tuple_rows = tuple_rows
+        return mysql.MySqlOrmDialectCommand(FAKE_TABLE, query, session), session
+
+    def test_dict_rows(self):
+        target, session = self._target(tuple_rows=False)
+        session.execute.return_value = [
+            {
+                "t1_field_bool": True,
+                "t1_field_int": 1,
+                "t1_field_str": "a",
+                "t1_uuid": "uuid",
+            }
+        ]
+
+        result = target.execute()
+
+        self.assertEqual(
+            [{"field_bool": True, "field_int": 1, "field_str": "a", "uuid": "uuid"}],
+            result.rows,
+        )
+        session.execute.assert_called_once_with(
+            target.get_statement(), target.get_values(), prepare=True
+        )
+
+    def test_tuple_rows(self):
+        target, session = self._target(tuple_rows=True)
+        session.execute.return_value.fetchall.return_value = [("uuid", 1, "a", True)]
+
+        result = target.execute()
+
+        self.assertEqual(
+            [{"field_bool": True, "field_int": 1, "field_str": "a", "uuid": "uuid"}],
+            result.rows,
+        )
+        session.execute.assert_called_once_with(
+            target.get_statement(), target.get_values(), tuple_rows=True, prepare=True
+        )
@@ -0,0 +1,249 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+import psycopg
+
+from restalchemy.storage.sql import engine_groups
+from restalchemy.storage.sql import engines
+from restalchemy.tests.unit import base
+
+
+def _make_engine(name):
+    engine = mock.MagicMock(name=name)
+    engine.session_manager.return_value.__enter__.return_value = name
+    return engine
+
+
+class EngineGroupTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(EngineGroupTestCase, self).setUp()
+        self.primary = _make_engine("primary")
+        self.replica1 = _make_engine("replica1")
+        self.replica2 = _make_engine("replica2")
+
+    def _make_group(self, **kwargs):
+        group = engine_groups.EngineGroup(
+            primary=self.primary,
+            replicas={"replica1": self.replica1, "replica2": self.replica2},
+            **kwargs,
+        )
+        self.addCleanup(group.close)
+        return group
+
+    def test_unknown_policy(self):
+        self.assertRaises(ValueError, self._make_group, policy="unknown")
+
+    def test_round_robin(self):
+        group = self._make_group()
+
+        engines_ = [group.get_read_engine() for _ in range(4)]
+
+        self.assertEqual(
+            [self.replica1, self.replica2, self.replica1, self.replica2], engines_
+        )
+
+    def test_least_outstanding(self):
+        group = self._make_group(policy="least_outstanding")
+
+        with group.checkout() as first:
+            with group.checkout() as second:
+                self.assertIs(self.replica1, first)
+                self.assertIs(self.replica2, second)
+            self.assertIs(self.replica2, group.get_read_engine())
+
+    def test_latency_ewma(self):
+        group = self._make_group(policy="latency_ewma", ewma_alpha=0.5)
+        replica1, replica2 = group.replicas
+
+        group._record_latency(replica1, 0.1)
+        group._record_latency(replica2, 0.3)
+        self.assertIs(self.replica1, group.get_read_engine())
+
+        group._record_latency(replica1, 0.9)
+        self.assertEqual(0.5, replica1.latency)
+        self.assertIs(self.replica2, group.get_read_engine())
+
+    def test_failures_eject_replica(self):
+        group = self._make_group(max_failures=2)
+
+        for _ in range(2):
+            with self.assertRaises(psycopg.OperationalError):
+                with group.checkout(exclude=group.replicas[1:]):
+                    raise psycopg.OperationalError()
+
+        self.assertEqual(group.replicas[1:], group.get_healthy_replicas())
+        self.assertIs(self.replica2, group.get_read_engine())
+
+    def test_query_errors_dont_eject_replica(self):
+        group = self._make_group(max_failures=1)
+
+        with self.assertRaises(ValueError):
+            with group.checkout():
+                raise ValueError()
+
+        self.assertEqual(group.replicas, group.get_healthy_replicas())
+
+    def test_caused_failure_ejects_replica(self):
+        group = self._make_group(max_failures=1)
+        error = Exception()
+        error.caused = psycopg.OperationalError()
+
+        self.assertTrue(group.is_failure(error))
+        self.assertFalse(group.is_failure(Exception()))
+
+    def _eject_first(self, group):
+        with self.assertRaises(psycopg.OperationalError):
+            with group.checkout():
+                raise psycopg.OperationalError()
+
+    def test_ejected_replica_returns_after_probe(self):
+        group = self._make_group(max_failures=1, eject_time=0)
+        session = mock.Mock()
+        self.replica1.session_manager.return_value.__enter__.return_value = session
+        self._eject_first(group)
+
+        self.assertEqual(group.replicas[1:], group.get_healthy_replicas())
+        group.replicas[0].probe.result(timeout=5)
+
+        session.execute.assert_called_once_with("SELECT 1")
+        self.assertEqual(group.replicas, group.get_healthy_replicas())
+
+    def test_ejected_replica_stays_if_probe_fails(self):
+        group = self._make_group(max_failures=1, eject_time=0)
+        self.replica1.session_manager.side_effect = psycopg.OperationalError()
+        self._eject_first(group)
+
+        group.get_healthy_replicas()
+        group.replicas[0].probe.result(timeout=5)
+
+        self.assertTrue(group.replicas[0].ejected)
+
+    def test_ejected_replica_isnt_probed_before_time(self):
+        group = self._make_group(max_failures=1, eject_time=60)
+        self._eject_first(group)
+
+        self.assertEqual(group.replicas[1:], group.get_healthy_replicas())
+        self.assertIsNone(group.replicas[0].probe)
+
+    def test_primary_without_healthy_replicas(self):
+        group = self._make_group(max_failures=1)
+        for replica in group.replicas:
+            group._report_failure(replica)
+
+        self.assertIs(self.primary, group.get_read_engine())
+        with group.checkout() as engine:
+            self.assertIs(self.primary, engine)
+        self.assertEqual("primary", group.read(lambda session: session, hedge=True))
+
+    def test_hedge_delay(self):
+        group = self._make_group(hedge_delay=0.5, hedge_percentile=90)
+        self.assertEqual(0.5, group.get_hedge_delay())
+
+        for i in range(engine_groups.MIN_HEDGE_SAMPLES * 5):
+            group._record_latency(group.replicas[0], i / 100.0)
+
+        self.assertEqual(0.9, group.get_hedge_delay())
+
+    def test_read(self):
+        group = self._make_group()
+
+        self.assertEqual("replica1", group.read(lambda session: session))
+
+    def test_statement_latency(self):
+        group = self._make_group()
+        stats = self.replica1.statement_stats
+        (listener,) = stats.add_listener.call_args[0]
+
+        listener(0.2)
+
+        self.assertEqual(0.2, group.replicas[0].latency)
+        self.assertIsNone(group.replicas[1].latency)
+        group.close()
+        stats.remove_listener.assert_called_once_with(listener)
+
+    def test_hedged_read_uses_second_replica(self):
+        group = self._make_group(hedge=True, hedge_delay=0.01)
+        released = threading.Event()
+        self.addCleanup(released.set)
+
+        def func(session):
+            if session == "replica1":
+                released.wait(5)
+            return session
+
+        self.assertEqual("replica2", group.read(func))
+
+    def test_hedged_read_returns_first_result(self):
+        group = self._make_group(hedge=True, hedge_delay=1)
+
+        self.assertEqual("replica1", group.read(lambda session: session))
+        self.replica2.session_manager.assert_not_called()
+
+    def test_hedged_read_ignores_failed_replica(self):
+        group = self._make_group(hedge=True, hedge_delay=0.01)
+        released = threading.Event()
+        self.addCleanup(released.set)
+
+        def func(session):
+            if session == "replica1":
+                released.wait(5)
+                raise psycopg.OperationalError()
+            released.set()
+            return session
+
+        self.assertEqual("replica2", group.read(func))
+
+
+class EngineFactoryGroupTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(EngineFactoryGroupTestCase, self).setUp()
+        self.factory = engines.EngineFactory()
+        self.factory._engines = {
+            "primary": _make_engine("primary"),
+            "replica": _make_engine("replica"),
+        }
+        self.addCleanup(self.factory.destroy_all_engines)
+
+    def test_configure_engine_group(self):
+        group = self.factory.configure_engine_group(
+            primary="primary", replicas=["replica"], policy="least_outstanding"
+        )
+
+        self.assertIs(group, self.factory.get_engine_group())
+        self.assertTrue(self.factory.has_engine_group())
+        self.assertIs(self.factory.get_engine("primary"), group.primary)
+        self.assertIs(self.factory.get_engine("replica"), group.get_read_engine())
+
+    def test_configure_engine_group_unknown_engine(self):
+        self.assertRaises(
+            ValueError,
+            self.factory.configure_engine_group,
+            primary="primary",
+            replicas=["unknown"],
+        )
+
+    def test_get_unknown_engine_group(self):
+        self.assertRaises(ValueError, self.factory.get_engine_group)
+
+    def test_destroy_all_engines_destroys_groups(self):
+        self.factory.configure_engine_group(primary="primary", replicas=["replica"])
+
+        self.factory.destroy_all_engines()
+
+        self.assertFalse(self.factory.has_engine_group())
@@ -357,6 +357,51 @@ class PostgreSqlNotInConvertFiltersTestCase(base.BaseTestCase):
         self.assertEqual([["pending", "cancelled"]], processed.value)
 
 
+class PgOrderFilterModel(models.Model):
+    name = properties.property(types.String())
+    status = properties.property(types.String())
+
+
+class FiltersOrderTestCase(base.BaseTestCase):
+    def _convert(self, filters_root):
+        return filters.convert_filters(
+            PgOrderFilterModel,
+            filters_root,
+            session=_PostgreSqlSessionFixture(),
+        )
+
+    def test_same_filters_give_same_statement(self):
+        first = self._convert(
+            {"status": dm_filters.EQ("active"), "name": dm_filters.EQ("a")}
+        )
+        second = self._convert(
+            {"name": dm_filters.EQ("a"), "status": dm_filters.EQ("active")}
+        )
+
+        self.assertEqual(
+            '("name" = %s AND "status" = %s)', first.construct_expression()
+        )
+        self.assertEqual(first.construct_expression(), second.construct_expression())
+        self.assertEqual(["a", "active"], first.value)
+        self.assertEqual(first.value, second.value)
+
+    def test_values_and_shape_follow_statement_order(self):
+        filters_root = {"status": dm_filters.EQ("active"), "name": dm_filters.EQ("a")}
+
+        self.assertEqual(
+            self._convert(filters_root).value,
+            filters.iterate_filters_values(
+                PgOrderFilterModel,
+                filters_root,
+                session=_PostgreSqlSessionFixture(),
+            ),
+        )
+        self.assertEqual(
+            filters.get_filters_shape(filters_root),
+            filters.get_filters_shape(dict(reversed(list(filters_root.items())))),
+        )
+
+
 class InEmptyListTestCase(base.BaseTestCase):
     def setUp(self):
         self._expr = filters.MySqlIn(
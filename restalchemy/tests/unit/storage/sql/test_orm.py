@@ -14,20 +14,30 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import asyncio
+import uuid
+
 import mock
 import orjson
 
+from restalchemy.dm import filters as dm_filters
 from restalchemy.dm import models
 from restalchemy.dm import properties
+from restalchemy.dm import relationships
 from restalchemy.dm import types
 from restalchemy.storage import exceptions
+from restalchemy.storage.sql import engines
 from restalchemy.storage.sql import orm
+from restalchemy.storage.sql import sessions
+from restalchemy.storage.sql import tables
 from restalchemy.storage.sql.dialect import exceptions as dialect_exc
+from restalchemy.storage.sql.dialect.query_builder import q
 from restalchemy.tests.unit import base
 
 FAKE_VALUE_A = "FAKE_A"
 FAKE_VALUE_B = "FAKE_B"
 FAKE_UUID = "89d423c5-4365-4be2-bde9-2730909a9af8"
+FAKE_UUID2 = "2c4b5c4e-6a3f-4c1e-9a0e-7d8f3b2a1c5d"
 
 FAKE_DICT = {"key": "value", "list": [1, 2, 3], "dict": {"a": "A"}}
 FAKE_DICT_JSON = orjson.dumps(FAKE_DICT).decode()
@@ -62,6 +72,11 @@ class TestRestoreModelTestCase(base.BaseTestCase):
         self.assertEqual(model.a, FAKE_VALUE_A)
         self.assertEqual(model.b, FAKE_VALUE_B)
 
+    def test_empty_properties(self):
+        model = FakeRestoreWithJSONModel(a=FAKE_DICT, b=FAKE_LIST)
+
+        self.assertEqual({}, model._get_prepared_data({}))
+
     def test_tablename_should_be_defined(self):
         model = type(
             "TestIncompleteRestoreModel",
@@ -188,6 +203,35 @@ class TestModelErrorHandlingCase(base.BaseTestCase):
         )
         self.assertRaises(exceptions.ConflictRecords, model.update)
 
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.upsert")
+    def test_upsert_model_when_conflict_error_raises(
+        self, model_upsert_mock, engine_factory_mock
+    ):
+        model_upsert_mock.side_effect = dialect_exc.Conflict(
+            code=1062, message="Conflict is found"
+        )
+        model = FakeDirtyRestoreModelWithUUID.restore_from_storage(
+            a=FAKE_VALUE_A, b=FAKE_VALUE_B
+        )
+        self.assertRaises(exceptions.ConflictRecords, model.upsert)
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.upsert")
+    def test_upsert_model_marks_saved(self, model_upsert_mock, engine_factory_mock):
+        model = FakeDirtyRestoreModelWithUUID.restore_from_storage(
+            a=FAKE_VALUE_A, b=FAKE_VALUE_B, uuid=FAKE_UUID
+        )
+        model._saved = False
+
+        model.upsert(conflict_columns=["a"], update_columns=["b"])
+
+        self.assertTrue(model._saved)
+        self.assertEqual(
+            [(FAKE_VALUE_A, FAKE_VALUE_B, FAKE_UUID)],
+            model_upsert_mock.call_args.kwargs["rows"],
+        )
+        self.assertEqual(["a"], model_upsert_mock.call_args.kwargs["conflict_columns"])
+        self.assertEqual(["b"], model_upsert_mock.call_args.kwargs["update_columns"])
+
     @mock.patch("restalchemy.storage.sql.tables.SQLTable.insert")
     def test_insert_model_when_deadlock_error_raises(
         self, model_insert_mock, engine_factory_mock
@@ -223,3 +267,844 @@ class TestModelErrorHandlingCase(base.BaseTestCase):
             a=FAKE_VALUE_A, b=FAKE_VALUE_B
         )
         self.assertRaises(exceptions.DeadLock, model.delete)
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+class TestIterAllTestCase(base.BaseTestCase):
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select_stream")
+    def test_iter_all_restores_models_lazily(self, select_stream_mock, engine_mock):
+        rows = [{"a": "1", "b": "2"}, {"a": "3", "b": "4"}]
+        select_stream_mock.return_value = iter(rows)
+
+        result = FakeRestoreModel.objects.iter_all(batch_size=5)
+
+        select_stream_mock.assert_not_called()
+        models_list = list(result)
+        self.assertEqual(["1", "3"], [m.a for m in models_list])
+        self.assertEqual(5, select_stream_mock.call_args.kwargs["batch_size"])
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select_stream")
+    def test_iter_all_unknown_error(self, select_stream_mock, engine_mock):
+        select_stream_mock.side_effect = ValueError("error")
+
+        with self.assertRaises(exceptions.UnknownStorageException):
+            list(FakeRestoreModel.objects.iter_all())
+
+
+class FakeGrandparentModel(models.ModelWithUUID, orm.SQLStorableMixin):
+    __tablename__ = "fake_grandparents"
+
+    name = properties.property(types.String())
+
+
+class FakeParentModel(models.ModelWithUUID, orm.SQLStorableMixin):
+    __tablename__ = "fake_parents"
+
+    name = properties.property(types.String())
+    parent = relationships.relationship(FakeGrandparentModel)
+
+
+class FakeChildModel(models.ModelWithUUID, orm.SQLStorableMixin):
+    __tablename__ = "fake_children"
+
+    name = properties.property(types.String())
+    parent = relationships.relationship(FakeParentModel)
+
+
+class FakeLazyChildModel(models.ModelWithUUID, orm.SQLStorableMixin):
+    __tablename__ = "fake_children"
+
+    name = properties.property(types.String())
+    parent = relationships.relationship(FakeParentModel, lazy=True)
+
+
+PARENT_UUID = "00000000-0000-0000-0000-000000000001"
+GRANDPARENT_UUID = "00000000-0000-0000-0000-000000000002"
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+class TestIterAllRelationshipsTestCase(base.BaseTestCase):
+    def _sessions(self, engine_mock, stream_blocks_connection):
+        engine = engine_mock.get_engine.return_value
+        session = mock.Mock(
+            identity_map=sessions.SessionIdentityMap(),
+            stream_blocks_connection=stream_blocks_connection,
+        )
+        engine.session_manager.return_value.__enter__.return_value = session
+        return session, engine.get_session.return_value
+
+    def _iter_children(self, select_mock, select_stream_mock):
+        select_stream_mock.return_value = iter(
+            [
+                {"uuid": FAKE_UUID, "name": "child%d" % i, "parent": PARENT_UUID}
+                for i in range(3)
+            ]
+        )
+        select_mock.return_value.rows = [
+            {"uuid": PARENT_UUID, "name": "parent", "parent": None}
+        ]
+        return list(FakeChildModel.objects.iter_all(batch_size=2))
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select_stream")
+    def test_relationships_are_selected_by_batches(
+        self, select_stream_mock, select_mock, engine_mock
+    ):
+        session, stream_session = self._sessions(engine_mock, True)
+
+        children = self._iter_children(select_mock, select_stream_mock)
+
+        self.assertIs(stream_session, select_stream_mock.call_args.kwargs["session"])
+        stream_session.commit.assert_called_once_with()
+        self.assertEqual(2, select_mock.call_count)
+        for call in select_mock.call_args_list:
+            self.assertIs(session, call.kwargs["session"])
+        self.assertEqual(["parent"] * 3, [c.parent.name for c in children])
+        self.assertIs(children[0].parent, children[1].parent)
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select_stream")
+    def test_stream_in_session(self, select_stream_mock, select_mock, engine_mock):
+        session, stream_session = self._sessions(engine_mock, False)
+
+        children = self._iter_children(select_mock, select_stream_mock)
+
+        self.assertIs(session, select_stream_mock.call_args.kwargs["session"])
+        stream_session.commit.assert_not_called()
+        self.assertEqual(3, len(children))
+
+    def test_eager_relationships(self, engine_mock):
+        self.assertEqual(("parent",), orm.get_eager_relationships(FakeChildModel))
+        self.assertEqual((), orm.get_eager_relationships(FakeLazyChildModel))
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+class TestLoadRelationshipsTestCase(base.BaseTestCase):
+    ROWS = {
+        "fake_parents": {
+            "uuid": PARENT_UUID,
+            "name": "parent",
+            "parent": GRANDPARENT_UUID,
+        },
+        "fake_grandparents": {"uuid": GRANDPARENT_UUID, "name": "root"},
+    }
+
+    def setUp(self):
+        super(TestLoadRelationshipsTestCase, self).setUp()
+        self.selects = []
+        patcher = mock.patch.object(
+            tables.SQLTable, "select", autospec=True, side_effect=self._select
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _select(self, table, filters=None, **kwargs):
+        self.selects.append(filters)
+        result = mock.Mock()
+        if "uuid" in filters:
+            result.rows = [self.ROWS[table.name]]
+        else:
+            result.rows = [
+                {"uuid": FAKE_UUID, "name": "child%d" % i, "parent": PARENT_UUID}
+                for i in range(3)
+            ] + [{"uuid": FAKE_UUID, "name": "orphan", "parent": None}]
+        return result
+
+    def test_load_selects_distinct_parents_once(self, engine_mock):
+        children = FakeChildModel.objects.get_all(
+            filters={"name": dm_filters.NE("")}, load=["parent"]
+        )
+
+        # NOTE(efrolov): The parent of the parent is not loaded, it's
+        #                selected while restoring the parent.
+        self.assertEqual(3, len(self.selects))
+        self.assertEqual([PARENT_UUID], [str(v) for v in self.selects[1]["uuid"].value])
+        self.assertEqual(["parent"] * 3, [c.parent.name for c in children[:3]])
+        self.assertIs(children[0].parent, children[1].parent)
+        self.assertIsNone(children[3].parent)
+
+    def test_load_depth(self, engine_mock):
+        children = FakeChildModel.objects.get_all(
+            filters={"name": dm_filters.NE("")}, load=["parent"], load_depth=2
+        )
+
+        self.assertEqual(3, len(self.selects))
+        self.assertEqual("root", children[0].parent.parent.name)
+
+    def test_load_unknown_relationship(self, engine_mock):
+        self.assertRaises(
+            exceptions.UnknownStorageException,
+            FakeChildModel.objects.get_all,
+            load=["name"],
+        )
+        self.assertEqual([], self.selects)
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+@mock.patch.object(orm.ObjectCollection, "get_one")
+class TestLazyRelationshipTestCase(base.BaseTestCase):
+    def _restore(self):
+        return FakeLazyChildModel.restore_from_storage(
+            uuid=FAKE_UUID, name="child", parent=PARENT_UUID
+        )
+
+    def test_restore_doesnt_select(self, get_one_mock, engine_mock):
+        model = self._restore()
+
+        self.assertFalse(model.properties["parent"].is_loaded())
+        self.assertEqual(PARENT_UUID, model._get_prepared_data()["parent"])
+        get_one_mock.assert_not_called()
+
+    def test_select_on_first_access(self, get_one_mock, engine_mock):
+        parent = FakeParentModel.restore_from_storage(
+            uuid=PARENT_UUID, name="parent", parent=None
+        )
+        get_one_mock.return_value = parent
+        model = self._restore()
+
+        self.assertIs(parent, model.parent)
+        self.assertIs(parent, model.parent)
+
+        get_one_mock.assert_called_once()
+        filters = get_one_mock.call_args[1]["filters"]
+        self.assertEqual(PARENT_UUID, str(filters["uuid"].value))
+
+    def test_restore_null(self, get_one_mock, engine_mock):
+        model = FakeLazyChildModel.restore_from_storage(
+            uuid=FAKE_UUID, name="child", parent=None
+        )
+
+        self.assertIsNone(model.parent)
+        get_one_mock.assert_not_called()
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+@mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+class TestSelectFieldsTestCase(base.BaseTestCase):
+    def _get_model(self, select_mock):
+        select_mock.return_value.rows = [{"uuid": FAKE_UUID, "a": FAKE_VALUE_A}]
+        return FakeDirtyRestoreModelWithUUID.objects.get_all(fields=["a"])[0]
+
+    def test_select_fields(self, select_mock, engine_mock):
+        model = self._get_model(select_mock)
+
+        self.assertEqual({"uuid", "a"}, select_mock.call_args[1]["fields"])
+        self.assertEqual(FAKE_VALUE_A, model.a)
+        self.assertIsInstance(model.properties["b"], properties.DeferredProperty)
+
+    def test_all_fields_are_not_projected(self, select_mock, engine_mock):
+        select_mock.return_value.rows = []
+
+        FakeDirtyRestoreModelWithUUID.objects.get_all(fields=["a", "b"])
+
+        self.assertIsNone(select_mock.call_args[1]["fields"])
+
+    def test_unknown_fields(self, select_mock, engine_mock):
+        self.assertRaises(
+            exceptions.UnknownStorageException,
+            FakeDirtyRestoreModelWithUUID.objects.get_all,
+            fields=["unknown"],
+        )
+        select_mock.assert_not_called()
+
+    def test_field_is_loaded_on_access(self, select_mock, engine_mock):
+        model = self._get_model(select_mock)
+        select_mock.return_value.rows = [{"uuid": FAKE_UUID, "b": FAKE_VALUE_B}]
+
+        self.assertEqual(FAKE_VALUE_B, model.b)
+        self.assertEqual(FAKE_VALUE_B, model.b)
+
+        self.assertEqual(2, select_mock.call_count)
+        kwargs = select_mock.call_args[1]
+        self.assertEqual({"uuid", "b"}, kwargs["fields"])
+        self.assertEqual([FAKE_UUID], [str(v) for v in kwargs["filters"]["uuid"].value])
+
+    def test_field_is_loaded_for_result_set(self, select_mock, engine_mock):
+        select_mock.return_value.rows = [
+            {"uuid": FAKE_UUID, "a": FAKE_VALUE_A},
+            {"uuid": FAKE_UUID2, "a": FAKE_VALUE_A},
+        ]
+        models_ = FakeDirtyRestoreModelWithUUID.objects.get_all(fields=["a"])
+        select_mock.return_value.rows = [
+            {"uuid": FAKE_UUID, "b": FAKE_VALUE_A},
+            {"uuid": FAKE_UUID2, "b": FAKE_VALUE_B},
+        ]
+
+        self.assertEqual([FAKE_VALUE_A, FAKE_VALUE_B], [m.b for m in models_])
+
+        self.assertEqual(2, select_mock.call_count)
+        self.assertEqual(
+            [FAKE_UUID, FAKE_UUID2],
+            [str(v) for v in select_mock.call_args[1]["filters"]["uuid"].value],
+        )
+
+    def test_field_of_deleted_row(self, select_mock, engine_mock):
+        model = self._get_model(select_mock)
+        select_mock.return_value.rows = []
+
+        self.assertRaises(exceptions.RecordNotFound, getattr, model, "b")
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.update")
+    def test_update_writes_loaded_fields(self, update_mock, select_mock, engine_mock):
+        model = self._get_model(select_mock)
+        update_mock.return_value.get_count.return_value = 1
+
+        model.a = FAKE_VALUE_B
+        model.update()
+
+        self.assertEqual({"a": FAKE_VALUE_B}, update_mock.call_args[1]["data"])
+        select_mock.assert_called_once()
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.update")
+    def test_update_writes_set_field(self, update_mock, select_mock, engine_mock):
+        model = self._get_model(select_mock)
+        update_mock.return_value.get_count.return_value = 1
+
+        model.b = FAKE_VALUE_A
+        model.update()
+
+        self.assertEqual(
+            {"a": FAKE_VALUE_A, "b": FAKE_VALUE_A}, update_mock.call_args[1]["data"]
+        )
+        select_mock.assert_called_once()
+
+
+class FakeDeferredModel(models.ModelWithUUID, orm.SQLStorableMixin):
+    __tablename__ = "fake_deferred_table"
+
+    a = properties.property(types.String())
+    b = properties.property(types.String(), deferred=True)
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+@mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+class TestDeferredPropertiesTestCase(base.BaseTestCase):
+    def test_deferred_property_is_not_selected(self, select_mock, engine_mock):
+        select_mock.return_value.rows = [{"uuid": FAKE_UUID, "a": FAKE_VALUE_A}]
+
+        model = FakeDeferredModel.objects.get_all()[0]
+
+        self.assertIsNone(select_mock.call_args[1]["fields"])
+        self.assertEqual(FAKE_VALUE_A, model.a)
+        self.assertIsInstance(model.properties["b"], properties.DeferredProperty)
+
+    def test_deferred_property_is_loaded_on_access(self, select_mock, engine_mock):
+        select_mock.return_value.rows = [{"uuid": FAKE_UUID, "a": FAKE_VALUE_A}]
+        model = FakeDeferredModel.objects.get_all()[0]
+        select_mock.return_value.rows = [{"uuid": FAKE_UUID, "b": FAKE_VALUE_B}]
+
+        self.assertEqual(FAKE_VALUE_B, model.b)
+
+        self.assertEqual(2, select_mock.call_count)
+        self.assertEqual({"uuid", "b"}, select_mock.call_args[1]["fields"])
+
+    def test_undefer(self, select_mock, engine_mock):
+        select_mock.return_value.rows = [
+            {"uuid": FAKE_UUID, "a": FAKE_VALUE_A, "b": FAKE_VALUE_B}
+        ]
+
+        model = FakeDeferredModel.objects.get_all(undefer=["b"])[0]
+
+        self.assertEqual({"uuid", "a", "b"}, select_mock.call_args[1]["fields"])
+        self.assertEqual(FAKE_VALUE_B, model.b)
+        select_mock.assert_called_once()
+
+    def test_undefer_with_fields(self, select_mock, engine_mock):
+        select_mock.return_value.rows = []
+
+        FakeDeferredModel.objects.get_all(fields=["a"], undefer=["b"])
+
+        self.assertEqual({"uuid", "a", "b"}, select_mock.call_args[1]["fields"])
+
+    def test_undefer_unknown(self, select_mock, engine_mock):
+        self.assertRaises(
+            exceptions.UnknownStorageException,
+            FakeDeferredModel.objects.get_all,
+            undefer=["unknown"],
+        )
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select_stream")
+    def test_iter_all_loads_deferred_property_per_batch(
+        self, select_stream_mock, select_mock, engine_mock
+    ):
+        uuids = [str(uuid.uuid4()) for _ in range(3)]
+        select_stream_mock.return_value = iter(
+            [{"uuid": value, "a": FAKE_VALUE_A} for value in uuids]
+        )
+        select_mock.return_value.rows = [{"uuid": value, "b": value} for value in uuids]
+
+        models_list = list(FakeDeferredModel.objects.iter_all(batch_size=2))
+
+        self.assertEqual(uuids, [m.b for m in models_list])
+        self.assertEqual(2, select_mock.call_count)
+        self.assertEqual({"uuid", "b"}, select_mock.call_args[1]["fields"])
+
+    def test_restore_without_ids_keeps_defaults(self, select_mock, engine_mock):
+        model = FakeDeferredModel.restore_from_storage(a=FAKE_VALUE_A)
+
+        self.assertIsNone(model.b)
+        select_mock.assert_not_called()
+
+
+class FakeTrustedModel(models.ModelWithUUID, orm.SQLStorableMixin):
+    __tablename__ = "fake_trusted_table"
+
+    a = properties.property(types.String())
+
+
+class FakeValidatedModel(FakeTrustedModel):
+    def validate(self):
+        self.validated = True
+
+
+class FakeTrustedOptOutObjectCollection(orm.ObjectCollection):
+    trusted_restore = False
+
+
+class FakeOptOutModel(FakeTrustedModel):
+    _ObjectCollection = FakeTrustedOptOutObjectCollection
+
+
+class FakePourModel(FakeTrustedModel):
+    def pour(self, **kwargs):
+        super(FakePourModel, self).pour(**kwargs)
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+@mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+class TestTrustedRestoreTestCase(base.BaseTestCase):
+    def _get_all(self, model_cls, select_mock):
+        select_mock.return_value.rows = [{"uuid": FAKE_UUID, "a": FAKE_VALUE_A}]
+        return model_cls.objects.get_all()[0]
+
+    def test_restore_from_storage_trusted(self, select_mock, engine_mock):
+        model = FakeRestoreWithJSONModel.restore_from_storage_trusted(
+            a=FAKE_DICT_JSON, b=FAKE_LIST_JSON
+        )
+
+        self.assertEqual(FAKE_DICT, model.a)
+        self.assertEqual(FAKE_LIST, model.b)
+        self.assertTrue(model._saved)
+        self.assertFalse(model.is_dirty())
+
+    @mock.patch.object(models.Model, "validate")
+    def test_get_all_is_trusted(self, validate_mock, select_mock, engine_mock):
+        model = self._get_all(FakeTrustedModel, select_mock)
+
+        self.assertTrue(orm.supports_trusted_restore(FakeTrustedModel))
+        self.assertEqual(FAKE_VALUE_A, model.a)
+        self.assertEqual(FAKE_UUID, str(model.uuid))
+        validate_mock.assert_not_called()
+
+    @mock.patch.object(models.Model, "validate")
+    def test_opt_out(self, validate_mock, select_mock, engine_mock):
+        self._get_all(FakeOptOutModel, select_mock)
+
+        validate_mock.assert_called_once_with()
+
+    @mock.patch.object(models.Model, "validate")
+    def test_overridden_pour(self, validate_mock, select_mock, engine_mock):
+        self._get_all(FakePourModel, select_mock)
+
+        self.assertFalse(orm.supports_trusted_restore(FakePourModel))
+        validate_mock.assert_called_once_with()
+
+    def test_overridden_validate(self, select_mock, engine_mock):
+        model = self._get_all(FakeValidatedModel, select_mock)
+
+        self.assertFalse(orm.supports_trusted_restore(FakeValidatedModel))
+        self.assertTrue(model.validated)
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+class TestIdentityMapTestCase(base.BaseTestCase):
+    def _session(self, engine_mock):
+        session = mock.Mock(identity_map=sessions.SessionIdentityMap())
+        engine = engine_mock.get_engine.return_value
+        engine.session_manager.return_value.__enter__.return_value = session
+        return session
+
+    def _filters(self):
+        return {"uuid": dm_filters.EQ(FAKE_UUID)}
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+    def test_select_by_pk_uses_identity_map(self, select_mock, engine_mock):
+        self._session(engine_mock)
+        select_mock.return_value.rows = [
+            {"uuid": FAKE_UUID, "a": FAKE_VALUE_A, "b": FAKE_VALUE_B}
+        ]
+
+        first = FakeRestoreModelWithUUID.objects.get_one(filters=self._filters())
+        second = FakeRestoreModelWithUUID.objects.get_one(filters=self._filters())
+
+        self.assertIs(first, second)
+        select_mock.assert_called_once()
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+    def test_restored_rows_are_merged(self, select_mock, engine_mock):
+        session = self._session(engine_mock)
+        model = FakeRestoreModelWithUUID.restore_from_storage(
+            uuid=FAKE_UUID, a=FAKE_VALUE_A, b=FAKE_VALUE_B
+        )
+        session.identity_map.add(model)
+        select_mock.return_value.rows = [
+            {"uuid": FAKE_UUID, "a": FAKE_VALUE_A, "b": FAKE_VALUE_B}
+        ]
+
+        result = FakeRestoreModelWithUUID.objects.get_all(
+            filters={"a": dm_filters.EQ(FAKE_VALUE_A)}
+        )
+
+        self.assertIs(model, result[0])
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+    def test_locked_select_bypasses_identity_map(self, select_mock, engine_mock):
+        session = self._session(engine_mock)
+        session.identity_map.add(
+            FakeRestoreModelWithUUID.restore_from_storage(
+                uuid=FAKE_UUID, a=FAKE_VALUE_A, b=FAKE_VALUE_B
+            )
+        )
+        select_mock.return_value.rows = []
+
+        result = FakeRestoreModelWithUUID.objects.get_all(
+            filters=self._filters(), locked=True
+        )
+
+        self.assertEqual([], result)
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+    def test_locked_select_refreshes_mapped_model(self, select_mock, engine_mock):
+        self._session(engine_mock)
+        select_mock.return_value.rows = [
+            {"uuid": FAKE_UUID, "a": FAKE_VALUE_A, "b": FAKE_VALUE_B}
+        ]
+        model = FakeRestoreModelWithUUID.objects.get_one(filters=self._filters())
+        select_mock.return_value.rows = [
+            {"uuid": FAKE_UUID, "a": FAKE_VALUE_B, "b": FAKE_VALUE_B}
+        ]
+
+        locked = FakeRestoreModelWithUUID.objects.get_one(
+            filters=self._filters(), locked=True
+        )
+
+        self.assertIs(model, locked)
+        self.assertEqual(FAKE_VALUE_B, locked.a)
+        self.assertFalse(locked.is_dirty())
+        self.assertEqual(2, select_mock.call_count)
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.update")
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.delete")
+    def test_update_and_delete(self, delete_mock, update_mock, engine_mock):
+        session = self._session(engine_mock)
+        update_mock.return_value.get_count.return_value = 1
+        model = FakeDirtyRestoreModelWithUUID.restore_from_storage(
+            uuid=FAKE_UUID, a=FAKE_VALUE_A, b=FAKE_VALUE_B
+        )
+
+        model.update()
+        self.assertIs(
+            model,
+            session.identity_map.get_by_filters(
+                FakeDirtyRestoreModelWithUUID, self._filters()
+            ),
+        )
+
+        model.delete()
+        self.assertIsNone(
+            session.identity_map.get_by_filters(
+                FakeDirtyRestoreModelWithUUID, self._filters()
+            )
+        )
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.update")
+    def test_update_of_missing_row_checks_database(
+        self, update_mock, select_mock, engine_mock
+    ):
+        session = self._session(engine_mock)
+        update_mock.return_value.get_count.return_value = 0
+        select_mock.return_value.rows = []
+        model = FakeDirtyRestoreModelWithUUID.restore_from_storage(
+            uuid=FAKE_UUID, a=FAKE_VALUE_A, b=FAKE_VALUE_B
+        )
+        session.identity_map.add(model)
+
+        self.assertRaises(exceptions.RecordNotFound, model.update)
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+class TestSharedCacheTestCase(base.BaseTestCase):
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+    def test_get_all_uses_shared_cache(self, select_mock, engine_mock):
+        select_mock.return_value.rows = [{"a": "1", "b": "2"}]
+
+        result = FakeRestoreModel.objects.get_all(shared_cache=True)
+
+        self.assertEqual(["1"], [m.a for m in result])
+        self.assertTrue(select_mock.call_args.kwargs["shared_cache"])
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+    def test_locked_select_is_not_cached(self, select_mock, engine_mock):
+        select_mock.return_value.rows = []
+
+        FakeRestoreModel.objects.get_all(shared_cache=True, locked=True)
+
+        self.assertFalse(select_mock.call_args.kwargs["shared_cache"])
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.count")
+    def test_count_uses_shared_cache(self, count_mock, engine_mock):
+        count_mock.return_value.fetchall.return_value = [{"count": 3}]
+
+        self.assertEqual(3, FakeRestoreModel.objects.count(shared_cache=True))
+        self.assertTrue(count_mock.call_args.kwargs["shared_cache"])
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+@mock.patch("restalchemy.storage.sql.tables.SQLTable.select")
+class TestGetAllWithCountTestCase(base.BaseTestCase):
+    def test_get_all_with_count(self, select_mock, engine_mock):
+        select_mock.return_value.rows = [
+            {
+                "uuid": FAKE_UUID,
+                "a": FAKE_VALUE_A,
+                "b": FAKE_VALUE_B,
+                q.TOTAL_COUNT_FIELD: 10,
+            }
+        ]
+
+        models_, total = FakeRestoreModelWithUUID.objects.get_all_with_count(limit=1)
+
+        self.assertEqual(10, total)
+        self.assertEqual([FAKE_VALUE_A], [m.a for m in models_])
+        kwargs = select_mock.call_args[1]
+        self.assertTrue(kwargs["with_total_count"])
+        self.assertEqual(1, kwargs["limit"])
+
+    def test_nothing_matches(self, select_mock, engine_mock):
+        select_mock.return_value.rows = []
+
+        self.assertEqual(
+            ([], 0), FakeRestoreModelWithUUID.objects.get_all_with_count(limit=1)
+        )
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+@mock.patch("restalchemy.storage.sql.tables.SQLTable.count")
+@mock.patch("restalchemy.storage.sql.tables.SQLTable.estimate_count")
+class TestEstimateCountTestCase(base.BaseTestCase):
+    def test_estimate(self, estimate_mock, count_mock, engine_mock):
+        estimate_mock.return_value = 1000
+
+        self.assertEqual(1000, FakeRestoreModel.objects.count(mode="estimate"))
+        count_mock.assert_not_called()
+
+    def test_exact_below(self, estimate_mock, count_mock, engine_mock):
+        estimate_mock.return_value = 10
+        count_mock.return_value.fetchall.return_value = [{"count": 3}]
+
+        self.assertEqual(
+            3, FakeRestoreModel.objects.count(mode="estimate", exact_below=100)
+        )
+
+    def test_unknown_estimate(self, estimate_mock, count_mock, engine_mock):
+        estimate_mock.return_value = None
+        count_mock.return_value.fetchall.return_value = [{"count": 3}]
+
+        self.assertEqual(3, FakeRestoreModel.objects.count(mode="estimate"))
+
+    def test_exact_mode(self, estimate_mock, count_mock, engine_mock):
+        count_mock.return_value.fetchall.return_value = [{"count": 3}]
+
+        self.assertEqual(3, FakeRestoreModel.objects.count())
+        estimate_mock.assert_not_called()
+
+    def test_unknown_mode(self, estimate_mock, count_mock, engine_mock):
+        self.assertRaises(
+            exceptions.UnknownStorageException,
+            FakeRestoreModel.objects.count,
+            mode="unknown",
+        )
+
+
+@mock.patch("restalchemy.storage.sql.sessions.session_manager")
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+class TestIterBatchesTestCase(base.BaseTestCase):
+    def _models(self, *uuids):
+        return [
+            FakeRestoreModelWithUUID.restore_from_storage(a=u, b="b", uuid=u)
+            for u in uuids
+        ]
+
+    def test_iter_batches_uses_keyset_and_new_sessions(
+        self, engine_mock, session_manager_mock
+    ):
+        uuids = ["00000000-0000-0000-0000-00000000000%d" % i for i in range(1, 6)]
+        batches = [self._models(*uuids[:2]), self._models(*uuids[2:4]), []]
+        filters = {"a": dm_filters.NE("x")}
+
+        with mock.patch.object(
+            orm.ObjectCollection, "_get_all", side_effect=batches
+        ) as get_all_mock:
+            result = list(
+                FakeRestoreModelWithUUID.objects.iter_batches(
+                    filters=filters, batch_size=2
+                )
+            )
+
+        self.assertEqual(batches[:2], result)
+        self.assertEqual(3, session_manager_mock.call_count)
+        calls = get_all_mock.call_args_list
+        self.assertEqual(filters, calls[0].kwargs["filters"])
+        self.assertEqual({"uuid": "asc"}, calls[0].kwargs["order_by"])
+        self.assertEqual(
+            dm_filters.AND({"uuid": dm_filters.GT(batches[1][-1].uuid)}, filters),
+            calls[2].kwargs["filters"],
+        )
+
+    def test_iter_batches_stops_on_short_batch(self, engine_mock, session_manager_mock):
+        batches = [self._models("00000000-0000-0000-0000-000000000001")]
+
+        with mock.patch.object(
+            orm.ObjectCollection, "_get_all", side_effect=batches
+        ) as get_all_mock:
+            result = list(
+                FakeRestoreModelWithUUID.objects.iter_batches(
+                    batch_size=2, order_by={"a": "DESC"}
+                )
+            )
+
+        self.assertEqual(batches, result)
+        self.assertEqual(1, get_all_mock.call_count)
+        self.assertEqual(
+            {"a": "desc", "uuid": "asc"},
+            get_all_mock.call_args.kwargs["order_by"],
+        )
+
+    def test_iter_batches_many_sort_columns(self, engine_mock, session_manager_mock):
+        with self.assertRaises(exceptions.UnknownStorageException):
+            list(
+                FakeRestoreModelWithUUID.objects.iter_batches(
+                    order_by={"a": "asc", "b": "asc"}
+                )
+            )
+
+
+class TestAsyncObjectCollectionTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(TestAsyncObjectCollectionTestCase, self).setUp()
+        self.session = mock.Mock()
+        engine = mock.Mock()
+        engine.session_manager.return_value.__aenter__ = mock.AsyncMock(
+            return_value=self.session
+        )
+        engine.session_manager.return_value.__aexit__ = mock.AsyncMock(
+            return_value=False
+        )
+        patcher = mock.patch("restalchemy.storage.sql.engines.engine_factory")
+        self.addCleanup(patcher.stop)
+        patcher.start().get_engine.return_value = engine
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.aselect")
+    def test_aget_all(self, aselect_mock):
+        aselect_mock.return_value = mock.Mock(rows=[{"a": "1", "b": "2"}])
+
+        result = asyncio.run(FakeRestoreModel.objects.aget_all(limit=5))
+
+        self.assertEqual(["1"], [m.a for m in result])
+        self.assertEqual(5, aselect_mock.call_args.kwargs["limit"])
+        self.assertIs(self.session, aselect_mock.call_args.kwargs["session"])
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.aselect")
+    def test_aget_one_not_found(self, aselect_mock):
+        aselect_mock.return_value = mock.Mock(rows=[])
+
+        self.assertRaises(
+            exceptions.RecordNotFound,
+            asyncio.run,
+            FakeRestoreModel.objects.aget_one(),
+        )
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.aselect")
+    def test_aget_all_unknown_error(self, aselect_mock):
+        aselect_mock.side_effect = ValueError("error")
+
+        self.assertRaises(
+            exceptions.UnknownStorageException,
+            asyncio.run,
+            FakeRestoreModel.objects.aget_all(),
+        )
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.aselect")
+    def test_aget_all_loads_relationships(self, aselect_mock):
+        aselect_mock.side_effect = [
+            mock.Mock(
+                rows=[
+                    {"uuid": FAKE_UUID, "name": "child%d" % i, "parent": PARENT_UUID}
+                    for i in range(2)
+                ]
+                + [{"uuid": FAKE_UUID, "name": "orphan", "parent": None}]
+            ),
+            mock.Mock(
+                rows=[
+                    {"uuid": PARENT_UUID, "name": "parent", "parent": GRANDPARENT_UUID}
+                ]
+            ),
+            mock.Mock(rows=[{"uuid": GRANDPARENT_UUID, "name": "root"}]),
+        ]
+
+        children = asyncio.run(FakeChildModel.objects.aget_all())
+
+        self.assertEqual(3, aselect_mock.call_count)
+        self.assertEqual(
+            [PARENT_UUID],
+            [
+                str(v)
+                for v in aselect_mock.call_args_list[1].kwargs["filters"]["uuid"].value
+            ],
+        )
+        self.assertIs(children[0].parent, children[1].parent)
+        self.assertEqual("root", children[0].parent.parent.name)
+        self.assertIsNone(children[2].parent)
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.aselect")
+    def test_aget_all_related_not_found(self, aselect_mock):
+        aselect_mock.side_effect = [
+            mock.Mock(rows=[{"uuid": FAKE_UUID, "name": "a", "parent": PARENT_UUID}]),
+            mock.Mock(rows=[]),
+        ]
+
+        self.assertRaises(
+            exceptions.RecordNotFound,
+            asyncio.run,
+            FakeChildModel.objects.aget_all(),
+        )
+
+    def test_sync_load_is_rejected(self):
+        engine = mock.Mock(spec=engines.AsyncPgSQLEngine)
+        engines.engine_factory.get_engine.return_value = engine
+
+        self.assertRaises(
+            exceptions.SyncLoadNotSupported,
+            FakeChildModel.restore_from_storage,
+            uuid=FAKE_UUID,
+            name="child",
+            parent=PARENT_UUID,
+        )
+        model = FakeLazyChildModel.restore_from_storage(
+            uuid=FAKE_UUID, name="child", parent=PARENT_UUID
+        )
+        self.assertRaises(exceptions.SyncLoadNotSupported, lambda: model.parent)
+        self.assertRaises(
+            exceptions.SyncLoadNotSupported,
+            FakeDeferredModel.load_field,
+            {"uuid": FAKE_UUID},
+            "b",
+        )
+        engine.session_manager.assert_not_called()
+
+    @mock.patch("restalchemy.storage.sql.tables.SQLTable.acount")
+    def test_acount(self, acount_mock):
+        acount_mock.return_value = mock.Mock(fetchall=lambda: [{"count": 3}])
+
+        self.assertEqual(3, asyncio.run(FakeRestoreModel.objects.acount()))
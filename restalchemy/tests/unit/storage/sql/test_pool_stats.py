@@ -0,0 +1,75 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from restalchemy.storage.sql import pool_stats
+from restalchemy.tests.unit import base
+
+
+class PoolStatsTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(PoolStatsTestCase, self).setUp()
+        self.stats = pool_stats.PoolStats(wait_buckets=(0.1, 1.0))
+
+    def test_checkout_wait_histogram(self):
+        for wait_time in (0.05, 0.1, 0.5, 2.0):
+            self.stats.record_checkout(wait_time)
+
+        stats = self.stats.get_stats()
+
+        self.assertEqual(
+            {"0.1": 2, "1.0": 1, "inf": 1}, stats["checkout_wait_histogram"]
+        )
+        self.assertEqual(4, stats["checkouts"])
+        self.assertEqual(2.0, stats["checkout_wait_max"])
+        self.assertAlmostEqual(2.65, stats["checkout_wait_total"])
+
+    def test_in_use(self):
+        self.stats.record_checkout(0)
+        self.stats.record_checkout(0)
+        self.stats.record_checkin()
+
+        self.assertEqual(1, self.stats.get_stats()["in_use"])
+
+    def test_track_connection(self):
+        self.stats.track_connection("cnx", 1)
+        self.stats.track_connection("cnx", 1)
+        self.stats.track_connection("other", 5)
+        self.stats.track_connection("cnx", 2)
+
+        stats = self.stats.get_stats()
+        self.assertEqual(1, stats["reconnects"])
+        self.assertEqual(1, stats["connection_lifetime_count"])
+
+    def test_reset(self):
+        self.stats.record_checkout(0)
+        self.stats.record_exhausted()
+
+        self.stats.reset()
+
+        stats = self.stats.get_stats()
+        self.assertEqual(0, stats["checkouts"])
+        self.assertEqual(0, stats["pool_exhausted"])
+
+    def test_send_stats(self):
+        sender = mock.Mock()
+
+        pool_stats.send_stats(sender, "db", {"idle": 1, "hist": {"inf": 2}})
+
+        sender.send_metric.assert_has_calls(
+            [mock.call("db.idle", 1), mock.call("db.hist.inf", 2)]
+        )
@@ -0,0 +1,200 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+
+from restalchemy.storage.sql import pools
+from restalchemy.tests.unit import base
+
+
+class BlockingMySQLPoolTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(BlockingMySQLPoolTestCase, self).setUp()
+        patcher = mock.patch("mysql.connector.connect", side_effect=self._connect)
+        self.connect = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.connections = []
+
+    def _connect(self, **kwargs):
+        conn = mock.Mock(in_transaction=False)
+        conn.is_connected.return_value = True
+        self.connections.append(conn)
+        return conn
+
+    def _make_pool(self, **kwargs):
+        pool = pools.BlockingMySQLPool(connect_kwargs={"host": "test"}, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_min_size_connections_are_opened(self):
+        pool = self._make_pool(min_size=2)
+
+        self.assertEqual(2, pool.pool_size)
+        self.connect.assert_called_with(host="test")
+        self.assertEqual(2, pool.get_stats()["pool_available"])
+
+    def test_invalid_sizes(self):
+        self.assertRaises(ValueError, self._make_pool, min_size=2, max_size=1)
+        self.assertRaises(ValueError, self._make_pool, min_size=0, max_size=0)
+
+    def test_checkout_reuses_connection(self):
+        pool = self._make_pool()
+
+        conn = pool.getconn()
+        pool.putconn(conn)
+
+        self.assertIs(conn, pool.getconn())
+        self.assertEqual(1, len(self.connections))
+
+    def test_pool_grows_up_to_max_size(self):
+        pool = self._make_pool(min_size=1, max_size=2, timeout=0)
+
+        pool.getconn()
+        pool.getconn()
+
+        self.assertEqual(2, pool.pool_size)
+        self.assertRaises(pools.PoolTimeout, pool.getconn)
+        self.assertEqual(1, pool.get_stats()["requests_errors"])
+
+    def test_waiter_gets_returned_connection(self):
+        pool = self._make_pool(timeout=5)
+        conn = pool.getconn()
+        result = []
+
+        thread = threading.Thread(target=lambda: result.append(pool.getconn()))
+        thread.start()
+        while not pool.get_stats()["requests_waiting"]:
+            thread.join(0.001)
+        pool.putconn(conn)
+        thread.join()
+
+        self.assertEqual([conn], result)
+        self.assertEqual(1, pool.get_stats()["requests_queued"])
+
+    def test_max_waiting(self):
+        pool = self._make_pool(max_waiting=1, timeout=0)
+        pool.getconn()
+        pool._waiting = 1
+
+        self.assertRaises(pools.TooManyRequests, pool.getconn)
+
+    def test_broken_connection_is_replaced(self):
+        on_close = mock.Mock()
+        pool = self._make_pool(on_close=on_close)
+        self.connections[0].is_connected.return_value = False
+
+        conn = pool.getconn()
+
+        self.assertIs(self.connections[1], conn)
+        self.connections[0].close.assert_called_once_with()
+        on_close.assert_called_once_with(mock.ANY)
+        self.assertEqual(1, pool.get_stats()["connections_lost"])
+
+    def test_check_disabled(self):
+        pool = self._make_pool(check=False)
+
+        pool.getconn()
+
+        self.connections[0].is_connected.assert_not_called()
+
+    def test_expired_connection_is_replaced(self):
+        pool = self._make_pool(max_lifetime=0)
+
+        conn = pool.getconn()
+
+        self.assertIs(self.connections[1], conn)
+        pool.putconn(conn)
+        conn.close.assert_called_once_with()
+        self.assertEqual(0, pool.pool_size)
+
+    def test_idle_connections_above_min_size_are_closed(self):
+        pool = self._make_pool(min_size=1, max_size=2, max_idle=0)
+        conn1 = pool.getconn()
+        conn2 = pool.getconn()
+        pool.putconn(conn1)
+        pool.putconn(conn2)
+
+        conn = pool.getconn()
+
+        self.assertIs(conn2, conn)
+        conn1.close.assert_called_once_with()
+        self.assertEqual(1, pool.pool_size)
+
+    def test_putconn_rolls_back_transaction(self):
+        pool = self._make_pool()
+        conn = pool.getconn()
+        conn.in_transaction = True
+
+        pool.putconn(conn)
+
+        conn.rollback.assert_called_once_with()
+        self.assertEqual(1, pool.get_stats()["pool_available"])
+
+    def test_putconn_resets_session(self):
+        pool = self._make_pool()
+        conn = pool.getconn()
+
+        pool.putconn(conn)
+
+        conn.reset_session.assert_called_once_with()
+        conn.rollback.assert_not_called()
+        self.assertEqual(1, pool.get_stats()["pool_available"])
+
+    def test_putconn_discards_connection_failed_to_reset(self):
+        pool = self._make_pool()
+        conn = pool.getconn()
+        conn.reset_session.side_effect = Exception()
+
+        pool.putconn(conn)
+
+        conn.close.assert_called_once_with()
+        self.assertEqual(0, pool.pool_size)
+
+    def test_putconn_discards_broken_connection(self):
+        pool = self._make_pool()
+        conn = pool.getconn()
+        conn.in_transaction = True
+        conn.rollback.side_effect = Exception()
+
+        pool.putconn(conn)
+
+        conn.close.assert_called_once_with()
+        self.assertEqual(0, pool.pool_size)
+
+    def test_putconn_unknown_connection(self):
+        pool = self._make_pool()
+
+        self.assertRaises(ValueError, pool.putconn, mock.Mock())
+
+    def test_connect_error_releases_slot(self):
+        pool = self._make_pool(min_size=0, max_size=1)
+        self.connect.side_effect = OSError()
+
+        self.assertRaises(OSError, pool.getconn)
+
+        self.assertEqual(0, pool.pool_size)
+
+    def test_closed_pool(self):
+        pool = self._make_pool()
+        conn = pool.getconn()
+
+        pool.close()
+
+        self.assertRaises(pools.PoolClosed, pool.getconn)
+        pool.putconn(conn)
+        conn.close.assert_called_once_with()
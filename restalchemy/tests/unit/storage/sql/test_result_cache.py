@@ -0,0 +1,221 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from restalchemy.dm import models
+from restalchemy.dm import properties
+from restalchemy.dm import relationships
+from restalchemy.dm import types
+from restalchemy.storage.sql import orm
+from restalchemy.storage.sql import result_cache
+from restalchemy.storage.sql import sessions
+from restalchemy.storage.sql import tables
+from restalchemy.storage.sql.dialect import mysql
+from restalchemy.storage.sql.dialect.query_builder import q
+from restalchemy.tests import fixtures
+from restalchemy.tests.unit import base
+
+
+class ResultCacheTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ResultCacheTestCase, self).setUp()
+        self.cache = result_cache.ResultCache(max_size=2, ttl=60)
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get("a"))
+
+        self.cache.set("a", ["t1"], [1])
+
+        self.assertEqual([1], self.cache.get("a"))
+        stats = self.cache.get_stats()
+        self.assertEqual(1, stats["hits"])
+        self.assertEqual(1, stats["misses"])
+        self.assertEqual(1, stats["size"])
+
+    def test_lru_eviction(self):
+        self.cache.set("a", ["t1"], 1)
+        self.cache.set("b", ["t1"], 2)
+        self.cache.get("a")
+
+        self.cache.set("c", ["t1"], 3)
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(1, self.cache.get("a"))
+        self.assertEqual(1, self.cache.get_stats()["evictions"])
+
+    def test_ttl(self):
+        self.cache.configure(max_size=2, ttl=0)
+        self.cache.set("a", ["t1"], 1)
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(1, self.cache.get_stats()["expirations"])
+        self.assertEqual(0, self.cache.get_stats()["size"])
+
+    def test_invalidate_tables(self):
+        self.cache.set("a", ["t1"], 1)
+        self.cache.set("b", ["t2"], 2)
+
+        self.cache.invalidate_tables(["t1"])
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(2, self.cache.get("b"))
+        self.assertEqual(1, self.cache.get_stats()["invalidations"])
+
+    def test_invalidation_starts_epoch(self):
+        self.cache.invalidate_tables(["t1", "t2"])
+        self.cache.invalidate_tables(["t1"])
+
+        self.assertEqual(2, self.cache.get_epoch())
+        self.assertEqual(2, self.cache.get_generation(["t1"]))
+        self.assertEqual(1, self.cache.get_generation(["t2"]))
+        self.assertEqual(0, self.cache.get_generation(["t3"]))
+
+    def test_invalidate_joined_table(self):
+        self.cache.set("a", ["t1", "t2"], 1)
+
+        self.cache.invalidate_tables(["t2"])
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(0, self.cache.get_stats()["size"])
+
+    def test_stale_generation_is_not_stored(self):
+        generation = self.cache.get_generation(["t1"])
+        self.cache.invalidate_tables(["t1"])
+
+        self.cache.set("a", ["t1"], 1, generation)
+
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_disabled(self):
+        self.cache.configure(max_size=0)
+
+        self.cache.set("a", ["t1"], 1)
+
+        self.assertIsNone(self.cache.get("a"))
+
+
+class ResultCacheExecuteTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ResultCacheExecuteTestCase, self).setUp()
+        self.cache = result_cache.ResultCache()
+        self.engine = mock.Mock(db_host="host", db_port=1, db_name="db")
+        self.session = mock.Mock(changed_tables=frozenset(), cache_epoch=0)
+        self.command = mock.Mock()
+        self.command.get_statement.return_value = "SELECT"
+        self.command.get_values.return_value = [[1, 2]]
+        self.command.execute.return_value.rows = [{"a": [1]}]
+
+    def _execute(self):
+        return self.cache.execute(
+            engine=self.engine,
+            session=self.session,
+            table_names=("t1",),
+            command=self.command,
+        )
+
+    def test_execute_caches_rows(self):
+        first = self._execute()
+        first.rows[0]["a"].append(2)
+        second = self._execute()
+
+        self.command.execute.assert_called_once_with()
+        self.assertEqual([{"a": [1]}], second.rows)
+        self.assertEqual([{"a": [1]}], list(second.fetchall()))
+
+    def test_execute_bypassed_for_changed_table(self):
+        self.session.changed_tables = frozenset(["t1"])
+
+        result = self._execute()
+
+        self.assertIs(self.command.execute.return_value, result)
+        self.assertEqual(0, self.cache.get_stats()["size"])
+
+    def test_execute_older_snapshot_is_not_stored(self):
+        self.session.cache_epoch = self.cache.get_epoch()
+        # Another session commits after the transaction has started.
+        self.cache.invalidate_tables(["t1"])
+
+        self._execute()
+        self._execute()
+
+        self.assertEqual(2, self.command.execute.call_count)
+        self.assertEqual(0, self.cache.get_stats()["size"])
+
+        self.session.cache_epoch = self.cache.get_epoch()
+        self._execute()
+        self._execute()
+
+        self.assertEqual(3, self.command.execute.call_count)
+        self.assertEqual(1, self.cache.get_stats()["size"])
+
+
+class FakeChildModel(models.ModelWithUUID, orm.SQLStorableMixin):
+    __tablename__ = "fake_children"
+
+    name = properties.property(types.String())
+
+
+class FakeParentModel(models.ModelWithUUID, orm.SQLStorableMixin):
+    __tablename__ = "fake_parents"
+
+    child = relationships.relationship(FakeChildModel, prefetch=True)
+
+
+class ResultCachePrefetchTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(ResultCachePrefetchTestCase, self).setUp()
+        self.cache = result_cache.ResultCache()
+        self.engine = mock.Mock(
+            db_host="host",
+            db_port=1,
+            db_name="db",
+            dialect=mysql.MySQLDialect(),
+            statement_cache=q.SelectQCache(max_size=10),
+        )
+        self.session = fixtures.SessionFixture(
+            changed_tables=frozenset(), cache_epoch=0
+        )
+        self.table = tables.SQLTable(
+            engine=None, table_name="fake_parents", model=FakeParentModel
+        )
+        cache_patcher = mock.patch.object(result_cache, "shared_cache", self.cache)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def _select(self):
+        return self.table.select(
+            engine=self.engine,
+            filters=None,
+            session=self.session,
+            shared_cache=True,
+        ).rows
+
+    @mock.patch.object(mysql.MySqlOrmDialectCommand, "execute")
+    def test_update_of_prefetched_child(self, execute_mock):
+        execute_mock.return_value.rows = [{"child": {"name": "old"}}]
+        self.assertEqual([{"child": {"name": "old"}}], self._select())
+        self.assertEqual([{"child": {"name": "old"}}], self._select())
+        execute_mock.assert_called_once_with()
+
+        writer = sessions.MySQLSession(mock.Mock(prepared_statements=False))
+        writer.track_table_change("fake_children")
+        writer.commit()
+        self.session.cache_epoch = self.cache.get_epoch()
+        execute_mock.return_value.rows = [{"child": {"name": "new"}}]
+
+        self.assertEqual([{"child": {"name": "new"}}], self._select())
+        self.assertEqual(2, execute_mock.call_count)
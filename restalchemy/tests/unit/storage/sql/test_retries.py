@@ -0,0 +1,224 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+
+import mock
+from mysql.connector import errors as mysql_errors
+from psycopg import errors as pg_errors
+
+from restalchemy.storage import exceptions
+from restalchemy.storage.sql import retries
+from restalchemy.storage.sql import sessions
+from restalchemy.storage.sql.dialect import exceptions as dialect_exc
+from restalchemy.tests.unit import base
+
+
+class IsRetryableTestCase(base.BaseTestCase):
+    def test_dead_locks(self):
+        self.assertTrue(retries.is_retryable(exceptions.DeadLock(msg="dead")))
+        self.assertTrue(
+            retries.is_retryable(dialect_exc.DeadLock(code="40P01", message="dead"))
+        )
+
+    def test_driver_errors(self):
+        self.assertTrue(
+            retries.is_retryable(mysql_errors.DatabaseError(msg="dead", errno=1213))
+        )
+        self.assertTrue(retries.is_retryable(pg_errors.SerializationFailure()))
+        self.assertTrue(retries.is_retryable(pg_errors.DeadlockDetected()))
+        self.assertFalse(
+            retries.is_retryable(mysql_errors.DatabaseError(msg="dup", errno=1062))
+        )
+        self.assertFalse(retries.is_retryable(pg_errors.UniqueViolation()))
+
+    def test_wrapped_errors(self):
+        error = exceptions.UnknownStorageException(
+            caused=pg_errors.SerializationFailure()
+        )
+        self.assertTrue(retries.is_retryable(error))
+
+        try:
+            try:
+                raise pg_errors.DeadlockDetected()
+            except pg_errors.DeadlockDetected:
+                raise ValueError("wrapped")
+        except ValueError as e:
+            self.assertTrue(retries.is_retryable(e))
+
+        self.assertFalse(retries.is_retryable(ValueError("error")))
+
+
+class RetryableTransactionTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(RetryableTransactionTestCase, self).setUp()
+        self.sessions = []
+        self.engine = mock.Mock()
+        self.engine.session_manager.side_effect = self._session_manager
+        self.engine.get_session_storage.return_value = sessions.SessionThreadStorage()
+        self.stats = retries.RetryStats()
+        sleep_patcher = mock.patch("time.sleep")
+        self.sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    @contextlib.contextmanager
+    def _session_manager(self):
+        session = mock.Mock()
+        self.sessions.append(session)
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+    def _transaction(self, **kwargs):
+        return retries.RetryableTransaction(
+            engine=self.engine, stats=self.stats, **kwargs
+        )
+
+    def test_retries_only_the_block(self):
+        func = mock.Mock(side_effect=[exceptions.DeadLock(msg="dead"), "result"])
+
+        result = self._transaction().run(func, 1, a=2)
+
+        self.assertEqual("result", result)
+        self.assertEqual(
+            [
+                mock.call(1, a=2, session=self.sessions[0]),
+                mock.call(1, a=2, session=self.sessions[1]),
+            ],
+            func.call_args_list,
+        )
+        self.sessions[0].rollback.assert_called_once_with()
+        self.sessions[1].commit.assert_called_once_with()
+        self.assertEqual(1, self.sleep.call_count)
+        self.assertEqual(
+            {
+                "transactions": 1,
+                "retries": 1,
+                "retried_transactions": 1,
+                "exhausted": 0,
+            },
+            self.stats.get_stats(),
+        )
+
+    def test_decorator(self):
+        calls = []
+
+        @self._transaction()
+        def update(value, session):
+            calls.append(session)
+            if len(calls) == 1:
+                raise pg_errors.SerializationFailure()
+            return value
+
+        self.assertEqual(42, update(42))
+        self.assertEqual(self.sessions, calls)
+
+    def test_attempts_loop(self):
+        calls = 0
+        for attempt in self._transaction():
+            with attempt as session:
+                calls += 1
+                if calls < 3:
+                    raise mysql_errors.DatabaseError(msg="dead", errno=1213)
+
+        self.assertEqual(3, calls)
+        self.assertIs(self.sessions[-1], session)
+        session.commit.assert_called_once_with()
+
+    def test_failed_commit_is_retried(self):
+        cm = mock.MagicMock()
+        self.engine.session_manager.side_effect = None
+        self.engine.session_manager.return_value = cm
+        cm.__exit__.side_effect = [pg_errors.DeadlockDetected(), False]
+
+        self.assertEqual("ok", self._transaction().run(lambda session: "ok"))
+        self.assertEqual(2, cm.__enter__.call_count)
+        self.assertEqual(1, self.stats.get_stats()["retries"])
+
+    def test_exhausted(self):
+        func = mock.Mock(side_effect=exceptions.DeadLock(msg="dead"))
+
+        self.assertRaises(
+            exceptions.DeadLock, self._transaction(max_attempts=3).run, func
+        )
+
+        self.assertEqual(3, func.call_count)
+        self.assertEqual(2, self.sleep.call_count)
+        self.assertEqual(
+            {
+                "transactions": 1,
+                "retries": 2,
+                "retried_transactions": 1,
+                "exhausted": 1,
+            },
+            self.stats.get_stats(),
+        )
+
+    def test_other_errors_are_not_retried(self):
+        func = mock.Mock(side_effect=ValueError("error"))
+
+        self.assertRaises(ValueError, self._transaction().run, func)
+
+        func.assert_called_once()
+        self.sleep.assert_not_called()
+
+    def test_outer_session_is_not_retried(self):
+        self.engine.get_session_storage.return_value = mock.Mock()
+        func = mock.Mock(side_effect=exceptions.DeadLock(msg="dead"))
+
+        self.assertRaises(exceptions.DeadLock, self._transaction().run, func)
+
+        func.assert_called_once()
+        self.assertEqual(1, self.stats.get_stats()["exhausted"])
+
+    def test_context_session_manager(self):
+        context = mock.Mock()
+        context.session_manager.side_effect = self._session_manager
+        func = mock.Mock(side_effect=[exceptions.DeadLock(msg="dead"), None])
+
+        retries.RetryableTransaction(context=context, stats=self.stats).run(func)
+
+        self.assertEqual(2, context.session_manager.call_count)
+        self.engine.session_manager.assert_not_called()
+
+    @mock.patch("random.uniform", side_effect=lambda low, high: high)
+    def test_backoff(self, uniform):
+        transaction = self._transaction(backoff=0.1, max_backoff=0.3)
+
+        self.assertEqual(
+            [0.1, 0.2, 0.3, 0.3],
+            [transaction.get_delay(attempt) for attempt in range(1, 5)],
+        )
+
+    def test_invalid_max_attempts(self):
+        self.assertRaises(ValueError, retries.RetryableTransaction, max_attempts=0)
+
+    def test_metrics(self):
+        sender = mock.Mock()
+        self.stats.set_metric_sender(sender, prefix="tx")
+        func = mock.Mock(side_effect=exceptions.DeadLock(msg="dead"))
+
+        self.assertRaises(
+            exceptions.DeadLock, self._transaction(max_attempts=2).run, func
+        )
+
+        self.assertEqual(
+            [mock.call("tx.retries", 1), mock.call("tx.exhausted", 1)],
+            sender.send_metric.call_args_list,
+        )
@@ -14,12 +14,26 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import asyncio
+import uuid
+
 import mock
 from mock import patch
 from mysql.connector import errors
+from psycopg import errors as pg_errors
+from psycopg import rows as pg_rows
 
+from restalchemy.dm import filters as dm_filters
+from restalchemy.dm import models
+from restalchemy.dm import properties
+from restalchemy.dm import types
 from restalchemy.storage import exceptions as exc
+from restalchemy.storage.sql import orm
+from restalchemy.storage.sql import result_cache
 from restalchemy.storage.sql import sessions
+from restalchemy.storage.sql import statement_stats
+from restalchemy.storage.sql.dialect import exceptions as dialect_exc
+from restalchemy.storage.sql.dialect import pgsql
 from restalchemy.tests.unit import base
 
 
@@ -84,7 +98,7 @@ class TestLocalThreadStorage(base.BaseTestCase):
         )
         mock_cursor = mock.Mock()
         mock_cursor.cursor.return_value = mock_execute
-        mock_engine = mock.Mock()
+        mock_engine = mock.Mock(prepared_statements=False)
         mock_engine.get_connection.return_value = mock_cursor
         session = sessions.MySQLSession(mock_engine)
         with self.assertRaises(exc.DeadLock) as ctx:
@@ -101,9 +115,952 @@ class TestLocalThreadStorage(base.BaseTestCase):
         )
         mock_cursor = mock.Mock()
         mock_cursor.cursor.return_value = mock_execute
-        mock_engine = mock.Mock()
+        mock_engine = mock.Mock(prepared_statements=False)
         mock_engine.get_connection.return_value = mock_cursor
         session = sessions.MySQLSession(mock_engine)
         with self.assertRaises(errors.DatabaseError) as ctx:
             session.execute("update foo set bar = 'baz'")
         self.assertEqual("1062 (1062): error", str(ctx.exception))
+
+
+class TestExecuteStream(base.BaseTestCase):
+    def _mysql_session(self, batches):
+        cursor = mock.Mock()
+        cursor.fetchmany.side_effect = batches
+        conn = mock.Mock()
+        conn.unread_result = False
+        conn.cursor.return_value = cursor
+        engine = mock.Mock(prepared_statements=False)
+        engine.get_connection.return_value = conn
+        return sessions.MySQLSession(engine), conn, cursor
+
+    def test_mysql_stream_uses_unbuffered_cursor(self):
+        session, conn, cursor = self._mysql_session(
+            [[{"a": 1}, {"a": 2}], [{"a": 3}], []]
+        )
+
+        rows = list(session.execute_stream("select 1", (), batch_size=2))
+
+        self.assertEqual([{"a": 1}, {"a": 2}, {"a": 3}], rows)
+        conn.cursor.assert_called_with(dictionary=True, buffered=False)
+        cursor.fetchmany.assert_called_with(2)
+        cursor.close.assert_called_once_with()
+
+    def test_mysql_stream_drains_result_on_close(self):
+        session, conn, cursor = self._mysql_session(
+            [[{"a": 1}, {"a": 2}], [{"a": 3}], []]
+        )
+        conn.unread_result = True
+
+        stream = session.execute_stream("select 1", (), batch_size=2)
+        self.assertEqual({"a": 1}, next(stream))
+        stream.close()
+
+        self.assertEqual(3, cursor.fetchmany.call_count)
+        cursor.close.assert_called_once_with()
+
+    def test_mysql_stream_when_deadlock_raises(self):
+        session, conn, cursor = self._mysql_session([])
+        cursor.execute.side_effect = errors.DatabaseError(
+            "deadlock", errno=1213, sqlstate=1213
+        )
+
+        with self.assertRaises(exc.DeadLock):
+            list(session.execute_stream("select 1"))
+        cursor.close.assert_called_once_with()
+
+    def test_pgsql_stream_uses_named_cursor(self):
+        cursor = mock.MagicMock()
+        cursor.__enter__.return_value = cursor
+        cursor.fetchmany.side_effect = [[{"a": 1}], []]
+        conn = mock.Mock()
+        conn.cursor.return_value = cursor
+        engine = mock.Mock(prepared_statements=False)
+        engine.get_connection.return_value = conn
+        session = sessions.PgSQLSession(engine)
+
+        rows = list(session.execute_stream("select 1", (), batch_size=10))
+
+        self.assertEqual([{"a": 1}], rows)
+        self.assertEqual("ra_stream_1", conn.cursor.call_args.kwargs["name"])
+        self.assertEqual(10, cursor.itersize)
+        cursor.__exit__.assert_called_once()
+
+
+class TestSessionQueryCache(base.BaseTestCase):
+    def test_order_by_is_part_of_the_key(self):
+        engine = mock.Mock(prepared_statements=False)
+        engine.dialect.select.side_effect = lambda **kwargs: mock.Mock(
+            **{
+                "get_statement.return_value": "SELECT %s" % kwargs["order_by"],
+                "get_values.return_value": [],
+            }
+        )
+        session = mock.Mock()
+        cache = sessions.SessionQueryCache(session=session)
+        fallback = mock.Mock(side_effect=[["asc"], ["desc"]])
+
+        for direction in ("asc", "desc"):
+            result = cache.get_all(
+                engine=engine,
+                table="table",
+                filters={},
+                fallback=fallback,
+                order_by={"a": direction},
+            )
+            self.assertEqual([direction], result)
+
+        self.assertEqual(2, fallback.call_count)
+        self.assertEqual(
+            [
+                mock.call(
+                    table="table",
+                    filters={},
+                    limit=None,
+                    order_by={"a": direction},
+                    session=session,
+                    locked=False,
+                )
+                for direction in ("asc", "desc")
+            ],
+            engine.dialect.select.call_args_list,
+        )
+
+
+class TestSessionIdentityMap(base.BaseTestCase):
+    UUID = "00000000-0000-0000-0000-000000000001"
+
+    def setUp(self):
+        super(TestSessionIdentityMap, self).setUp()
+        self.identity_map = sessions.SessionIdentityMap()
+        self.model = FakeBatchModel.restore_from_storage(uuid=self.UUID, a="a", b="b")
+        self.identity_map.add(self.model)
+
+    def _get(self, filters):
+        return self.identity_map.get_by_filters(FakeBatchModel, filters)
+
+    def test_get_by_pk(self):
+        self.assertIs(self.model, self._get({"uuid": dm_filters.EQ(self.UUID)}))
+        self.assertIs(
+            self.model, self._get({"uuid": dm_filters.EQ(uuid.UUID(self.UUID))})
+        )
+
+    def test_get_by_other_filters(self):
+        self.assertIsNone(self._get({"uuid": dm_filters.NE(self.UUID)}))
+        self.assertIsNone(
+            self._get({"uuid": dm_filters.EQ(self.UUID), "a": dm_filters.EQ("a")})
+        )
+        self.assertIsNone(self._get({"a": dm_filters.EQ("a")}))
+        self.assertIsNone(self._get(dm_filters.AND({"uuid": dm_filters.EQ(self.UUID)})))
+        self.assertIsNone(self._get(None))
+
+    def test_merge(self):
+        other = FakeBatchModel.restore_from_storage(uuid=self.UUID, a="x", b="x")
+
+        self.assertIs(self.model, self.identity_map.merge(other))
+
+    def test_merge_refresh(self):
+        self.model.a = "y"
+        other = FakeBatchModel.restore_from_storage(uuid=self.UUID, a="x", b="x")
+
+        self.assertIs(self.model, self.identity_map.merge(other, refresh=True))
+        self.assertEqual("x", self.model.a)
+        self.assertFalse(self.model.is_dirty())
+
+    def test_add_replaces(self):
+        other = FakeBatchModel.restore_from_storage(uuid=self.UUID, a="x", b="x")
+
+        self.identity_map.add(other)
+
+        self.assertIs(other, self._get({"uuid": dm_filters.EQ(self.UUID)}))
+
+    def test_remove(self):
+        self.identity_map.remove(self.model)
+
+        self.assertIsNone(self._get({"uuid": dm_filters.EQ(self.UUID)}))
+
+    def test_rollback_clears_identity_map(self):
+        engine = mock.Mock(prepared_statements=False)
+        session = sessions.MySQLSession(engine)
+        session.identity_map.add(self.model)
+
+        session.rollback()
+
+        self.assertIsNone(
+            session.identity_map.get_by_filters(
+                FakeBatchModel, {"uuid": dm_filters.EQ(self.UUID)}
+            )
+        )
+
+
+class TestTableChanges(base.BaseTestCase):
+    def setUp(self):
+        super(TestTableChanges, self).setUp()
+        self.conn = mock.Mock()
+        engine = mock.Mock(prepared_statements=False)
+        engine.get_connection.return_value = self.conn
+        self.session = sessions.PgSQLSession(engine)
+        patcher = mock.patch.object(result_cache.shared_cache, "invalidate_tables")
+        self.invalidate = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_commit_invalidates_changed_tables(self):
+        self.session.track_table_change("foo")
+
+        self.session.commit()
+
+        self.invalidate.assert_called_once_with(frozenset(["foo"]))
+        self.assertEqual(frozenset(), self.session.changed_tables)
+
+    def test_commit_without_changes(self):
+        self.session.commit()
+
+        self.invalidate.assert_not_called()
+
+    def test_rollback_discards_changes(self):
+        self.session.track_table_change("foo")
+
+        self.session.rollback()
+        self.session.commit()
+
+        self.invalidate.assert_not_called()
+
+    def test_failed_commit_keeps_cache(self):
+        self.session.track_table_change("foo")
+        self.conn.commit.side_effect = ValueError()
+
+        self.assertRaises(ValueError, self.session.commit)
+
+        self.invalidate.assert_not_called()
+
+    @mock.patch.object(result_cache.shared_cache, "get_epoch", return_value=5)
+    def test_transaction_starts_cache_epoch(self, get_epoch):
+        self.session.commit()
+        self.assertEqual(5, self.session.cache_epoch)
+
+        get_epoch.return_value = 6
+        self.session.rollback()
+        self.assertEqual(6, self.session.cache_epoch)
+
+
+class TestStatementStats(base.BaseTestCase):
+    def setUp(self):
+        super(TestStatementStats, self).setUp()
+        self.conn = mock.MagicMock()
+        self.engine = mock.Mock(prepared_statements=False)
+        self.engine.get_connection.return_value = self.conn
+        self.engine.statement_stats = statement_stats.StatementStats(
+            enabled=True, slow_threshold=0, explain=True
+        )
+
+    def test_pgsql_execute_records_statement(self):
+        session = sessions.PgSQLSession(self.engine)
+        cursor = session._cursor
+        cursor.rowcount = 3
+        explain_cursor = self.conn.cursor.return_value.__enter__.return_value
+        explain_cursor.fetchone.return_value = {"QUERY PLAN": [{"Plan": {}}]}
+
+        session.execute("SELECT 1 FROM t WHERE a = %s", (1,))
+
+        (top,) = self.engine.statement_stats.get_top()
+        self.assertEqual(1, top["calls"])
+        self.assertEqual(3, top["rows"])
+        self.assertEqual([{"Plan": {}}], top["plan"])
+        explain_cursor.execute.assert_has_calls(
+            [
+                mock.call("SAVEPOINT ra_explain"),
+                mock.call("EXPLAIN (FORMAT JSON) SELECT 1 FROM t WHERE a = %s", (1,)),
+                mock.call("RELEASE SAVEPOINT ra_explain"),
+            ]
+        )
+
+    def test_pgsql_failed_explain_rolls_back_savepoint(self):
+        session = sessions.PgSQLSession(self.engine)
+        session._cursor.rowcount = -1
+        explain_cursor = self.conn.cursor.return_value.__enter__.return_value
+        explain_cursor.fetchone.side_effect = pg_errors.SyntaxError()
+
+        session.execute("SELECT 1 FROM t", None)
+
+        explain_cursor.execute.assert_any_call("ROLLBACK TO SAVEPOINT ra_explain")
+        self.assertIsNone(self.engine.statement_stats.get_top()[0]["plan"])
+
+    def test_mysql_execute_many_isnt_explained(self):
+        session = sessions.MySQLSession(self.engine)
+        session._cursor.rowcount = 2
+
+        session.execute_many("INSERT INTO t (a) VALUES (%s)", [(1,), (2,)])
+
+        (top,) = self.engine.statement_stats.get_top()
+        self.assertEqual(2, top["rows"])
+        self.assertIsNone(top["plan"])
+        self.assertEqual(1, self.conn.cursor.call_count)
+
+
+class TestPgSQLBatchInsert(base.BaseTestCase):
+    def setUp(self):
+        super(TestPgSQLBatchInsert, self).setUp()
+        self.cursor = mock.MagicMock()
+        conn = mock.MagicMock()
+        conn.cursor.return_value = self.cursor
+        engine = mock.Mock(prepared_statements=False)
+        engine.get_connection.return_value = conn
+        engine.escape.side_effect = lambda value: '"%s"' % value
+        self.session = sessions.PgSQLSession(engine)
+        self.table = mock.Mock()
+        self.table.name = "foo"
+        self.table.get_column_names.return_value = ["a", "uuid"]
+        self.table.get_escaped_column_names.return_value = ['"a"', '"uuid"']
+
+    def _models(self, count):
+        table = self.table
+
+        class FakeModel(object):
+            def __init__(self, i):
+                self._i = i
+
+            def get_table(self):
+                return table
+
+            def get_storable_snapshot(self):
+                return {"uuid": self._i, "a": "a%d" % self._i}
+
+        return [FakeModel(i) for i in range(count)]
+
+    def test_batch_insert_uses_copy_above_threshold(self):
+        copy = self.cursor.copy.return_value.__enter__.return_value
+
+        self.session.batch_insert(self._models(3), copy_threshold=3)
+
+        self.cursor.copy.assert_called_once_with('COPY "foo" ("a", "uuid") FROM STDIN')
+        self.assertEqual(frozenset(["foo"]), self.session.changed_tables)
+        self.assertEqual(
+            [mock.call(("a0", 0)), mock.call(("a1", 1)), mock.call(("a2", 2))],
+            copy.write_row.call_args_list,
+        )
+        self.cursor.executemany.assert_not_called()
+
+    def test_batch_insert_uses_executemany_below_threshold(self):
+        self.session.batch_insert(self._models(2), copy_threshold=3)
+
+        self.cursor.copy.assert_not_called()
+        self.cursor.executemany.assert_called_once_with(
+            'INSERT INTO "foo" ("a", "uuid") VALUES (%s, %s)',
+            [("a0", 0), ("a1", 1)],
+        )
+
+    def test_batch_insert_uses_executemany_in_pipeline(self):
+        with self.session.pipeline():
+            self.session.batch_insert(self._models(3), copy_threshold=3)
+
+        self.cursor.copy.assert_not_called()
+        self.cursor.executemany.assert_called_once_with(
+            'INSERT INTO "foo" ("a", "uuid") VALUES (%s, %s)',
+            [("a0", 0), ("a1", 1), ("a2", 2)],
+        )
+
+
+class TestMySQLBatchInsert(base.BaseTestCase):
+    def setUp(self):
+        super(TestMySQLBatchInsert, self).setUp()
+        self.cursor = mock.Mock()
+        self.cursor.fetchone.return_value = {"value": 120}
+        conn = mock.Mock()
+        conn.cursor.return_value = self.cursor
+        engine = mock.Mock(prepared_statements=False)
+        engine.get_connection.return_value = conn
+        self.session = sessions.MySQLSession(engine)
+        self.table = mock.Mock()
+        self.table.name = "foo"
+        self.table.get_column_names.return_value = ["a", "uuid"]
+        self.table.get_escaped_column_names.return_value = ["`a`", "`uuid`"]
+
+    def _models(self, count, value="a%d"):
+        table = self.table
+
+        class FakeModel(object):
+            def __init__(self, i):
+                self._i = i
+
+            def get_table(self):
+                return table
+
+            def get_storable_snapshot(self):
+                return {"uuid": "u%d" % self._i, "a": value % self._i}
+
+        return [FakeModel(i) for i in range(count)]
+
+    def test_batch_insert_single_statement(self):
+        self.session.batch_insert(self._models(2))
+
+        self.assertEqual(
+            mock.call(
+                "INSERT INTO `foo` (`a`, `uuid`) VALUES (%s, %s), (%s, %s)",
+                ("a0", "u0", "a1", "u1"),
+            ),
+            self.cursor.execute.call_args,
+        )
+        self.cursor.executemany.assert_not_called()
+
+    def test_batch_insert_splits_by_max_allowed_packet(self):
+        self.session.batch_insert(self._models(5))
+
+        inserts = [
+            c
+            for c in self.cursor.execute.call_args_list
+            if c.args[0].startswith("INSERT")
+        ]
+        self.assertEqual(3, len(inserts))
+        self.assertEqual(
+            ("a0", "u0", "a1", "u1", "a2", "u2", "a3", "u3", "a4", "u4"),
+            sum((c.args[1] for c in inserts), ()),
+        )
+
+    def test_batch_insert_splits_multibyte_values_by_bytes(self):
+        # Two rows fit into the packet by characters but not by bytes.
+        self.cursor.fetchone.return_value = {"value": 240}
+
+        self.session.batch_insert(self._models(2, value="я" * 20 + "%d"))
+
+        inserts = [
+            c
+            for c in self.cursor.execute.call_args_list
+            if c.args[0].startswith("INSERT")
+        ]
+        self.assertEqual(2, len(inserts))
+        for insert in inserts:
+            self.assertLessEqual(
+                len(insert.args[0].encode("utf-8"))
+                + sum(2 * len(v.encode("utf-8")) + 2 for v in insert.args[1]),
+                240,
+            )
+
+    def test_estimate_row_size_counts_bytes(self):
+        self.assertEqual(
+            self.session._estimate_row_size(("aa",), 0) + 4,
+            self.session._estimate_row_size(("яя",), 0),
+        )
+        self.assertEqual(
+            self.session._estimate_row_size(("яя",), 0),
+            self.session._estimate_row_size((b"\x00" * 4,), 0),
+        )
+
+    def test_batch_insert_when_duplicate_raises_conflict(self):
+        self.cursor.execute.side_effect = [
+            None,
+            errors.IntegrityError("dup", errno=1062, sqlstate="23000"),
+        ]
+
+        self.assertRaises(
+            exc.ConflictRecords, self.session.batch_insert, self._models(1)
+        )
+
+
+class FakeBatchModel(models.ModelWithUUID, orm.SQLStorableMixin):
+    __tablename__ = "fake_batch"
+
+    a = properties.property(types.String())
+    b = properties.property(types.String())
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+class TestBatchUpdate(base.BaseTestCase):
+    UUIDS = ["00000000-0000-0000-0000-00000000000%d" % i for i in range(1, 4)]
+
+    def _session(self, session_cls, escape):
+        cursor = mock.MagicMock()
+        conn = mock.Mock()
+        conn.cursor.return_value = cursor
+        engine = mock.Mock(prepared_statements=False)
+        engine.get_connection.return_value = conn
+        engine.escape.side_effect = lambda value: escape % value
+        return session_cls(engine), cursor
+
+    def _models(self):
+        return [
+            FakeBatchModel.restore_from_storage(uuid=uuid, a="a", b="b")
+            for uuid in self.UUIDS
+        ]
+
+    def test_pgsql_batch_update_dirty_columns_only(self, engine_mock):
+        session, cursor = self._session(sessions.PgSQLSession, '"%s"')
+        cursor.rowcount = 2
+        batch = self._models()
+        batch[0].a = "x"
+        batch[2].a = "y"
+
+        session.batch_update(batch)
+
+        cursor.execute.assert_called_once_with(
+            'UPDATE "fake_batch" SET "a" = "v"."a" FROM (SELECT "uuid", "a" '
+            'FROM "fake_batch" WHERE false UNION ALL VALUES (%s, %s), (%s, %s)) '
+            'AS "v" WHERE "fake_batch"."uuid" = "v"."uuid"',
+            (self.UUIDS[0], "x", self.UUIDS[2], "y"),
+            prepare=None,
+        )
+
+    def test_pgsql_batch_update_skips_deferred_properties(self, engine_mock):
+        session, cursor = self._session(sessions.PgSQLSession, '"%s"')
+        cursor.rowcount = 1
+        loader = mock.Mock(return_value="b")
+        batch = [
+            FakeBatchModel.restore_from_storage(
+                uuid=uuid, a="a", b=properties.DeferredValue(loader)
+            )
+            for uuid in self.UUIDS
+        ]
+        batch[0].a = "x"
+
+        session.batch_update(batch)
+        cursor.rowcount = 3
+        session.batch_update(batch, force=True)
+
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        self.assertEqual(2, len(statements))
+        for statement in statements:
+            self.assertIn('SET "a" = "v"."a" FROM (SELECT "uuid", "a" FROM', statement)
+        loader.assert_not_called()
+
+    def test_pgsql_batch_update_splits_by_batch_size(self, engine_mock):
+        session, cursor = self._session(sessions.PgSQLSession, '"%s"')
+        cursor.rowcount = 1
+        batch = self._models()
+        for model in batch:
+            model.b = "z"
+
+        session.batch_update(batch, batch_size=1)
+
+        self.assertEqual(3, cursor.execute.call_count)
+
+    def test_pgsql_batch_update_without_changes(self, engine_mock):
+        session, cursor = self._session(sessions.PgSQLSession, '"%s"')
+
+        session.batch_update(self._models())
+
+        cursor.execute.assert_not_called()
+
+    def test_pgsql_batch_update_not_found(self, engine_mock):
+        session, cursor = self._session(sessions.PgSQLSession, '"%s"')
+        cursor.rowcount = 0
+        batch = self._models()
+        batch[1].a = "x"
+
+        with mock.patch.object(
+            orm.ObjectCollection,
+            "get_one",
+            side_effect=exc.RecordNotFound(model=FakeBatchModel, filters={}),
+        ) as get_one_mock:
+            self.assertRaises(exc.RecordNotFound, session.batch_update, batch)
+        self.assertEqual(
+            self.UUIDS[1], str(get_one_mock.call_args.kwargs["filters"]["uuid"])
+        )
+
+    def test_mysql_batch_update_multiple_updates(self, engine_mock):
+        session, cursor = self._session(sessions.MySQLSession, "`%s`")
+        cursor.fetchone.return_value = {"value": 1024 * 1024}
+        cursor.rowcount = 2
+        batch = self._models()
+        batch[0].b = "x"
+
+        self.assertRaises(exc.MultipleUpdatesDetected, session.batch_update, batch)
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+class TestBatchUpsert(base.BaseTestCase):
+    UUIDS = ["00000000-0000-0000-0000-00000000000%d" % i for i in range(1, 3)]
+
+    def _session(self):
+        cursor = mock.MagicMock()
+        conn = mock.Mock()
+        conn.cursor.return_value = cursor
+        engine = mock.Mock(prepared_statements=False)
+        engine.get_connection.return_value = conn
+        engine.escape.side_effect = lambda value: '"%s"' % value
+        engine.dialect = pgsql.PgSQLDialect()
+        return sessions.PgSQLSession(engine), cursor
+
+    def _models(self):
+        return [
+            FakeBatchModel(uuid=uuid.UUID(value), a="a", b="b") for value in self.UUIDS
+        ]
+
+    def test_pgsql_batch_upsert(self, engine_mock):
+        session, cursor = self._session()
+        batch = self._models()
+
+        session.batch_upsert(batch, update_columns=["a"])
+
+        cursor.execute.assert_called_once_with(
+            'INSERT INTO "fake_batch" ("a", "b", "uuid") VALUES (%s, %s, %s), '
+            '(%s, %s, %s) ON CONFLICT ("uuid") DO UPDATE SET "a" = EXCLUDED."a"',
+            ("a", "b", self.UUIDS[0], "a", "b", self.UUIDS[1]),
+            prepare=None,
+        )
+        self.assertTrue(all(model._saved for model in batch))
+
+    def test_pgsql_batch_upsert_do_nothing(self, engine_mock):
+        session, cursor = self._session()
+
+        session.batch_upsert(self._models(), conflict_columns=["a"], update_columns=[])
+
+        self.assertTrue(
+            cursor.execute.call_args.args[0].endswith('ON CONFLICT ("a") DO NOTHING')
+        )
+
+    def test_pgsql_batch_upsert_splits_by_batch_size(self, engine_mock):
+        session, cursor = self._session()
+
+        session.batch_upsert(self._models(), batch_size=1)
+
+        self.assertEqual(2, cursor.execute.call_count)
+
+    def test_pgsql_batch_upsert_conflict(self, engine_mock):
+        session, cursor = self._session()
+        cursor.execute.side_effect = pg_errors.UniqueViolation("conflict")
+        batch = self._models()
+
+        self.assertRaises(exc.ConflictRecords, session.batch_upsert, batch)
+        self.assertFalse(any(model._saved for model in batch))
+
+
+class TestSessionContextStorage(base.BaseTestCase):
+    def test_sessions_are_isolated_between_tasks(self):
+        storage = sessions.SessionContextStorage()
+
+        async def task(session):
+            storage.store_session(session)
+            await asyncio.sleep(0)
+            return storage.get_session()
+
+        async def run():
+            return await asyncio.gather(task("s1"), task("s2"))
+
+        self.assertEqual(["s1", "s2"], asyncio.run(run()))
+        self.assertRaises(sessions.SessionNotFound, storage.get_session)
+
+    def test_store_session_conflict(self):
+        storage = sessions.SessionContextStorage()
+
+        async def run():
+            storage.store_session("s1")
+            storage.store_session("s2")
+
+        self.assertRaises(sessions.SessionConflict, asyncio.run, run())
+
+
+@mock.patch("restalchemy.storage.sql.engines.engine_factory")
+class TestAsyncPgSQLSession(base.BaseTestCase):
+    UUID = "00000000-0000-0000-0000-000000000001"
+
+    def setUp(self):
+        super(TestAsyncPgSQLSession, self).setUp()
+        self.cursor = mock.MagicMock()
+        self.cursor.__aenter__.return_value = self.cursor
+        self.cursor.execute = mock.AsyncMock()
+        self.cursor.executemany = mock.AsyncMock()
+        self.cursor.fetchall = mock.AsyncMock(return_value=[])
+        self.cursor.description = None
+        self.cursor.rowcount = 1
+        conn = mock.Mock()
+        conn.cursor.return_value = self.cursor
+        engine = mock.Mock(prepared_statements=False)
+        engine.escape.side_effect = lambda value: '"%s"' % value
+        engine.dialect = pgsql.PgSQLDialect()
+        self.session = sessions.AsyncPgSQLSession(engine=engine, conn=conn)
+
+    def test_execute_fetches_rows(self, engine_mock):
+        self.cursor.description = [mock.Mock()]
+        self.cursor.fetchall.return_value = [{"a": 1}]
+
+        result = asyncio.run(self.session.execute("select 1", ()))
+
+        self.assertEqual([{"a": 1}], result.fetchall())
+        self.assertEqual(1, result.rowcount)
+
+    def test_ainsert(self, engine_mock):
+        model = FakeBatchModel(uuid=uuid.UUID(self.UUID), a="a", b="b")
+
+        asyncio.run(self.session.ainsert(model))
+
+        self.cursor.execute.assert_awaited_once_with(
+            'INSERT INTO "fake_batch" ("a", "b", "uuid") VALUES (%s, %s, %s)',
+            ("a", "b", self.UUID),
+            prepare=None,
+        )
+        self.assertTrue(model._saved)
+
+    def test_ainsert_conflict(self, engine_mock):
+        self.cursor.execute.side_effect = pg_errors.UniqueViolation("conflict")
+        model = FakeBatchModel(uuid=uuid.UUID(self.UUID), a="a", b="b")
+
+        self.assertRaises(exc.ConflictRecords, asyncio.run, self.session.ainsert(model))
+        self.assertFalse(model._saved)
+
+    def test_aupdate_not_found(self, engine_mock):
+        self.cursor.rowcount = 0
+        model = FakeBatchModel.restore_from_storage(uuid=self.UUID, a="a", b="b")
+        model.a = "x"
+
+        with mock.patch.object(
+            orm.ObjectCollection,
+            "aget_one",
+            side_effect=exc.RecordNotFound(model=FakeBatchModel, filters={}),
+        ):
+            self.assertRaises(
+                exc.RecordNotFound, asyncio.run, self.session.aupdate(model)
+            )
+
+    def test_aupdate_skips_deferred_properties(self, engine_mock):
+        loader = mock.Mock(side_effect=exc.SyncLoadNotSupported(model="FakeBatchModel"))
+        model = FakeBatchModel.restore_from_storage(
+            uuid=self.UUID, a="a", b=properties.DeferredValue(loader)
+        )
+        model.a = "x"
+
+        asyncio.run(self.session.aupdate(model))
+
+        self.cursor.execute.assert_awaited_once_with(
+            'UPDATE "fake_batch" SET "a" = %s WHERE "uuid" = %s',
+            ("x", self.UUID),
+            prepare=None,
+        )
+        loader.assert_not_called()
+
+    def test_adelete(self, engine_mock):
+        model = FakeBatchModel.restore_from_storage(uuid=self.UUID, a="a", b="b")
+
+        asyncio.run(self.session.adelete(model))
+
+        self.cursor.execute.assert_awaited_once_with(
+            'DELETE FROM "fake_batch" WHERE "uuid" = %s', (self.UUID,), prepare=None
+        )
+
+    def test_batch_insert_uses_executemany(self, engine_mock):
+        models = [FakeBatchModel(uuid=uuid.UUID(self.UUID), a="a", b="b")]
+
+        asyncio.run(self.session.batch_insert(models))
+
+        self.cursor.executemany.assert_awaited_once_with(
+            'INSERT INTO "fake_batch" ("a", "b", "uuid") VALUES (%s, %s, %s)',
+            [("a", "b", self.UUID)],
+        )
+
+    def test_execute_many_errors_are_converted(self, engine_mock):
+        self.cursor.executemany.side_effect = pg_errors.DeadlockDetected("dead")
+
+        self.assertRaises(
+            dialect_exc.DeadLock,
+            asyncio.run,
+            self.session.execute_many("UPDATE a SET b = %s", [(1,)]),
+        )
+
+    def test_batch_insert_conflict(self, engine_mock):
+        self.cursor.executemany.side_effect = pg_errors.UniqueViolation("conflict")
+        models = [FakeBatchModel(uuid=uuid.UUID(self.UUID), a="a", b="b")]
+
+        self.assertRaises(
+            exc.ConflictRecords, asyncio.run, self.session.batch_insert(models)
+        )
+
+
+class TestPgSQLPipeline(base.BaseTestCase):
+    def setUp(self):
+        super(TestPgSQLPipeline, self).setUp()
+        self.conn = mock.MagicMock()
+        self.engine = mock.Mock(prepared_statements=False)
+        self.engine.get_connection.return_value = self.conn
+        self.engine.statement_stats = statement_stats.StatementStats()
+        self.session = sessions.PgSQLSession(self.engine)
+        self.pipeline = self.conn.pipeline.return_value.__enter__.return_value
+
+    def test_statements_are_sent_without_results(self):
+        cursors = [mock.Mock(pgresult=None), mock.Mock(pgresult=None)]
+        self.conn.cursor.side_effect = cursors
+
+        with self.session.pipeline() as pipeline:
+            first = self.session.execute("INSERT INTO a VALUES (%s)", (1,))
+            second = self.session.execute("INSERT INTO b VALUES (%s)", (2,))
+
+        self.assertIs(self.pipeline, pipeline)
+        self.assertIsInstance(first, sessions.PipelineResult)
+        self.assertIsInstance(second, sessions.PipelineResult)
+        cursors[0].execute.assert_called_once_with(
+            "INSERT INTO a VALUES (%s)", (1,), prepare=None
+        )
+        cursors[1].execute.assert_called_once_with(
+            "INSERT INTO b VALUES (%s)", (2,), prepare=None
+        )
+        self.session._cursor.execute.assert_not_called()
+        self.pipeline.sync.assert_not_called()
+        self.assertIsNone(self.session._pipeline)
+
+    def test_result_access_syncs_pipeline(self):
+        cursor = mock.Mock(pgresult=None, rowcount=1)
+        self.conn.cursor.side_effect = [cursor]
+
+        with self.session.pipeline():
+            result = self.session.execute("UPDATE a SET b = 1", None)
+            self.assertEqual(1, result.rowcount)
+
+        self.pipeline.sync.assert_called_once_with()
+
+    def test_received_result_doesnt_sync(self):
+        cursor = mock.Mock(pgresult=mock.Mock())
+        cursor.fetchall.return_value = [{"a": 1}]
+        self.conn.cursor.side_effect = [cursor]
+
+        with self.session.pipeline():
+            result = self.session.execute("SELECT a FROM t", None)
+            self.assertEqual([{"a": 1}], result.fetchall())
+
+        self.pipeline.sync.assert_not_called()
+
+    def test_sync_errors_are_converted(self):
+        self.conn.cursor.side_effect = [mock.Mock(pgresult=None)]
+        self.pipeline.sync.side_effect = pg_errors.UniqueViolation()
+
+        with self.session.pipeline():
+            result = self.session.execute("INSERT INTO a VALUES (1)", None)
+            self.assertRaises(dialect_exc.Conflict, lambda: result.rowcount)
+
+    def test_exit_errors_are_converted(self):
+        self.conn.pipeline.return_value.__exit__.side_effect = (
+            pg_errors.DeadlockDetected()
+        )
+
+        def run():
+            with self.session.pipeline():
+                self.session.execute("UPDATE a SET b = 1", None)
+
+        self.assertRaises(dialect_exc.DeadLock, run)
+        self.assertIsNone(self.session._pipeline)
+
+    def test_nested_pipeline(self):
+        inner_pipeline = mock.Mock()
+        self.conn.pipeline.return_value.__enter__.side_effect = [
+            self.pipeline,
+            inner_pipeline,
+        ]
+
+        with self.session.pipeline():
+            with self.session.pipeline():
+                self.assertIs(inner_pipeline, self.session._pipeline)
+            self.assertIs(self.pipeline, self.session._pipeline)
+
+
+class TestPreparedStatements(base.BaseTestCase):
+    def setUp(self):
+        super(TestPreparedStatements, self).setUp()
+        self.conn = mock.MagicMock()
+        self.engine = mock.Mock(prepared_statements=True)
+        self.engine.get_connection.return_value = self.conn
+        self.engine.statement_stats = statement_stats.StatementStats()
+
+    def test_pgsql_execute_prepares_statement(self):
+        session = sessions.PgSQLSession(self.engine)
+
+        session.execute("SELECT 1 FROM t WHERE a = %s", (1,), prepare=True)
+        session.execute("SAVEPOINT sp;", ())
+
+        self.assertEqual(
+            [
+                mock.call("SELECT 1 FROM t WHERE a = %s", (1,), prepare=True),
+                mock.call("SAVEPOINT sp;", (), prepare=None),
+            ],
+            session._cursor.execute.call_args_list,
+        )
+
+    def test_pgsql_tuple_rows(self):
+        session = sessions.PgSQLSession(self.engine)
+        self.conn.cursor.reset_mock()
+
+        cursor = session.execute("SELECT a FROM t", None, tuple_rows=True)
+        session.execute("SELECT b FROM t", None, tuple_rows=True)
+
+        self.conn.cursor.assert_called_once_with(row_factory=pg_rows.tuple_row)
+        self.assertIs(session._tuple_cursor, cursor)
+        self.assertEqual(2, cursor.execute.call_count)
+
+    def _mysql_session(self):
+        session = sessions.MySQLSession(self.engine)
+        self.conn.cursor.reset_mock()
+        self.conn.cursor.side_effect = lambda **kwargs: mock.Mock(
+            with_rows=True, rowcount=1, **{"fetchall.return_value": [{"a": 1}]}
+        )
+        return session
+
+    def test_mysql_cursor_is_prepared_once_per_statement(self):
+        session = self._mysql_session()
+
+        first = session.execute("SELECT a FROM t WHERE a = %s", (1,), prepare=True)
+        session.execute("SELECT b FROM t WHERE a = %s", (1,), prepare=True)
+        session.execute("SELECT a FROM t WHERE a = %s", (2,), prepare=True)
+
+        self.assertEqual([{"a": 1}], first.fetchall())
+        self.assertEqual(1, first.rowcount)
+        self.assertEqual(
+            [
+                mock.call(prepared=True, dictionary=True),
+                mock.call(prepared=True, dictionary=True),
+            ],
+            self.conn.cursor.call_args_list,
+        )
+        cursor = session._prepared_cursors[("SELECT a FROM t WHERE a = %s", False)]
+        self.assertEqual(2, cursor.execute.call_count)
+        session._cursor.execute.assert_not_called()
+
+    def test_mysql_lists_are_not_prepared(self):
+        session = self._mysql_session()
+
+        session.execute("SELECT a FROM t WHERE a IN %s", ([1, 2],), prepare=True)
+
+        session._cursor.execute.assert_called_once_with(
+            "SELECT a FROM t WHERE a IN %s", ([1, 2],)
+        )
+        self.conn.cursor.assert_not_called()
+
+    def test_mysql_tuple_rows(self):
+        session = self._mysql_session()
+
+        session.execute(
+            "SELECT a FROM t WHERE a = %s", (1,), tuple_rows=True, prepare=True
+        )
+        session.execute(
+            "SELECT a FROM t WHERE a IN %s", ([1, 2],), tuple_rows=True, prepare=True
+        )
+
+        self.assertEqual(
+            [
+                mock.call(prepared=True, dictionary=False),
+                mock.call(buffered=True),
+            ],
+            self.conn.cursor.call_args_list,
+        )
+        self.assertIn(("SELECT a FROM t WHERE a = %s", True), session._prepared_cursors)
+        session._cursor.execute.assert_not_called()
+
+    def test_mysql_only_dialect_statements_are_prepared(self):
+        session = self._mysql_session()
+
+        session.execute("SAVEPOINT sp;", ())
+        session.execute("CREATE TABLE t (a INT)", None)
+
+        self.conn.cursor.assert_not_called()
+        self.assertEqual(
+            [mock.call("SAVEPOINT sp;", ()), mock.call("CREATE TABLE t (a INT)", None)],
+            session._cursor.execute.call_args_list,
+        )
+
+    @mock.patch.object(sessions, "DEFAULT_PREPARED_MAX", 1)
+    def test_mysql_prepared_cursors_are_evicted_and_closed(self):
+        session = self._mysql_session()
+
+        session.execute("SELECT a FROM t", None, prepare=True)
+        first = session._prepared_cursors[("SELECT a FROM t", False)]
+        session.execute("SELECT b FROM t", None, prepare=True)
+        second = session._prepared_cursors[("SELECT b FROM t", False)]
+
+        first.close.assert_called_once_with()
+        session.close()
+        second.close.assert_called_once_with()
+        self.engine.close_connection.assert_called_once_with(self.conn)
@@ -0,0 +1,159 @@
+# Copyright 2026 Eugene Frolov.
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from restalchemy.storage.sql import statement_stats
+from restalchemy.tests.unit import base
+
+SELECT = "SELECT `a` FROM `t` WHERE `a` = %s"
+
+
+class FingerprintTestCase(base.BaseTestCase):
+    def test_literals(self):
+        self.assertEqual(
+            "SELECT `a` FROM `t` WHERE `b` = ? AND `c` = ? LIMIT ?",
+            statement_stats.fingerprint(
+                "SELECT `a`  FROM `t`\n WHERE `b` = 'x''y' AND `c` = 1.5 LIMIT 10"
+            ),
+        )
+
+    def test_placeholder_lists(self):
+        self.assertEqual(
+            statement_stats.fingerprint("SELECT 1 FROM `t` WHERE `a` IN (%s, %s)"),
+            statement_stats.fingerprint("SELECT 1 FROM `t` WHERE `a` IN (%s,%s,%s)"),
+        )
+        self.assertEqual(
+            "INSERT INTO `t` (`a`, `b`) VALUES (...)",
+            statement_stats.fingerprint(
+                "INSERT INTO `t` (`a`, `b`) VALUES (%s, %s), (%s, %s)"
+            ),
+        )
+
+    def test_identifiers_with_digits(self):
+        self.assertEqual(
+            "SELECT `t1`.`a` AS `t1_a` FROM `t` AS `t1`",
+            statement_stats.fingerprint("SELECT `t1`.`a` AS `t1_a` FROM `t` AS `t1`"),
+        )
+
+    def test_values_shape(self):
+        self.assertEqual(
+            "(int, str, list[3])",
+            statement_stats.get_values_shape((1, "secret", [1, 2, 3])),
+        )
+        self.assertEqual("{a: int}", statement_stats.get_values_shape({"a": 1}))
+        self.assertEqual("()", statement_stats.get_values_shape(None))
+
+
+class StatementStatsTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(StatementStatsTestCase, self).setUp()
+        self.stats = statement_stats.StatementStats(enabled=True)
+
+    def test_disabled(self):
+        self.stats.configure(enabled=False)
+
+        self.stats.record(SELECT, (1,), 0.1, 1)
+
+        self.assertEqual([], self.stats.get_top())
+
+    def test_listeners(self):
+        listener = mock.Mock()
+        self.stats.configure(enabled=False)
+        self.stats.add_listener(listener)
+
+        self.stats.record(SELECT, (1,), 0.1, 1)
+        self.stats.remove_listener(listener)
+        self.stats.record(SELECT, (1,), 0.2, 1)
+
+        listener.assert_called_once_with(0.1)
+
+    def test_record(self):
+        for duration in (0.1, 0.3):
+            self.stats.record(SELECT, (1,), duration, 2)
+
+        (top,) = self.stats.get_top()
+
+        self.assertEqual(statement_stats.fingerprint(SELECT), top["fingerprint"])
+        self.assertEqual(2, top["calls"])
+        self.assertAlmostEqual(0.4, top["total_time"])
+        self.assertAlmostEqual(0.2, top["mean_time"])
+        self.assertEqual(0.3, top["p99_time"])
+        self.assertEqual(4, top["rows"])
+
+    def test_top_order(self):
+        self.stats.record(SELECT, (1,), 0.5, 1)
+        for _ in range(3):
+            self.stats.record("DELETE FROM `t`", (), 0.1, 1)
+
+        self.assertEqual([0.5, 0.1], [top["max_time"] for top in self.stats.get_top()])
+        self.assertEqual(
+            [3], [top["calls"] for top in self.stats.get_top(1, order_by="calls")]
+        )
+        self.assertRaises(ValueError, self.stats.get_top, order_by="unknown")
+
+    def test_max_shapes(self):
+        self.stats.configure(max_shapes=1)
+
+        self.stats.record(SELECT, (1,), 0.1, 1)
+        self.stats.record("DELETE FROM `t`", (), 0.1, 1)
+
+        self.assertEqual(1, len(self.stats.get_top()))
+        self.assertEqual(1, self.stats.get_dropped())
+
+    @mock.patch.object(statement_stats, "LOG")
+    def test_slow_statement_is_logged_without_values(self, log_mock):
+        self.stats.configure(slow_threshold=0.2)
+
+        self.stats.record(SELECT, ("secret",), 0.1, 1)
+        log_mock.warning.assert_not_called()
+
+        self.stats.record(SELECT, ("secret",), 0.3, 1)
+        args = log_mock.warning.call_args[0]
+        self.assertIn("(str)", args)
+        self.assertNotIn("secret", repr(args))
+        self.assertEqual(1, self.stats.get_top()[0]["slow_calls"])
+
+    @mock.patch.object(statement_stats, "LOG")
+    def test_explain_is_rate_limited(self, log_mock):
+        self.stats.configure(slow_threshold=0.1, explain=True, explain_interval=60)
+        explain = mock.Mock(return_value=[{"Plan": {}}])
+
+        self.stats.record(SELECT, (1,), 0.3, 1, explain=explain)
+        self.stats.record(SELECT, (1,), 0.3, 1, explain=explain)
+
+        explain.assert_called_once_with()
+        self.assertEqual([{"Plan": {}}], self.stats.get_top()[0]["plan"])
+
+    @mock.patch.object(statement_stats, "LOG")
+    def test_only_selects_are_explained(self, log_mock):
+        self.stats.configure(slow_threshold=0.1, explain=True)
+        explain = mock.Mock()
+
+        self.stats.record("DELETE FROM `t`", (), 0.3, 1, explain=explain)
+
+        explain.assert_not_called()
+
+    @mock.patch.object(statement_stats, "LOG")
+    def test_failed_explain(self, log_mock):
+        self.stats.configure(slow_threshold=0.1, explain=True)
+
+        self.stats.record(
+            SELECT, (1,), 0.3, 1, explain=mock.Mock(side_effect=ValueError())
+        )
+
+        self.assertIsNone(self.stats.get_top()[0]["plan"])
+        self.assertEqual(2, log_mock.warning.call_count)
@@ -16,6 +16,7 @@
 
 import mock
 
+from restalchemy.storage.sql import sessions
 from restalchemy.storage.sql import utils
 from restalchemy.tests.unit import base
 
@@ -85,3 +86,24 @@ class SavepointCtxTestCase(base.BaseTestCase):
         session.execute.assert_any_call("SAVEPOINT sp;", tuple())
         session.execute.assert_any_call("ROLLBACK TO sp;", tuple())
         session.execute.assert_any_call("RELEASE SAVEPOINT sp;", tuple())
+
+    @mock.patch("restalchemy.storage.sql.utils.contexts.Context")
+    def test_savepoint_mysql_prepared_statements(self, mock_ctx_cls):
+        ctx = self._make_ctx("mysql")
+        mock_ctx_cls.return_value = ctx
+        engine = mock.Mock(prepared_statements=True)
+        session = sessions.MySQLSession(engine)
+        ctx.get_session.return_value = session
+        conn = engine.get_connection.return_value
+
+        with utils.savepoint("sp"):
+            pass
+
+        conn.cursor.assert_called_once_with(dictionary=True, buffered=True)
+        self.assertEqual(
+            [
+                mock.call("SAVEPOINT sp;", tuple()),
+                mock.call("RELEASE SAVEPOINT sp;", tuple()),
+            ],
+            session._cursor.execute.call_args_list,
+        )